@@ -3,16 +3,22 @@ import logging
 import os
 
 import redis
-import requests
 
 from data.service.helpers import MODEL_APP_ENDPOINTS, EXECUTION_APP_ENDPOINTS
 from shared.utils.settings import settings
 from shared.utils.decorators import retry_failed_connection, json_error_handler
 from shared.utils.helpers import get_item_from_cache
+from shared.utils.http_client import get_session
 
 
 cache = redis.from_url(settings.redis_url)
 
+model_app = get_session("model")
+execution_app = get_session("execution")
+
+# last strategies response of the model app, revalidated with its ETag
+_strategies = {"etag": None, "response": None}
+
 
 def prepare_payload(**kwargs):
     return {key: value for key, value in kwargs.items()}
@@ -23,7 +29,7 @@ def prepare_payload(**kwargs):
 def check_job_status(job_id):
     url = MODEL_APP_ENDPOINTS["CHECK_JOB"](os.getenv("MODEL_APP_URL"), job_id)
 
-    r = requests.get(url, headers={"Authorization": cache.get("service_bearer_token")}, timeout=(5, 30))
+    r = model_app.get("CHECK_JOB", url, headers={"Authorization": cache.get("service_bearer_token")}, timeout=(5, 30))
     logging.debug(r.text)
 
     response = r.json()
@@ -44,7 +50,28 @@ def generate_signal(pipeline_id, header=''):
 
     logging.info(header + "Triggering signal generation.")
 
-    r = requests.post(url, json=payload, headers={"Authorization": cache.get("service_bearer_token")}, timeout=(5, 30))
+    r = model_app.post("GENERATE_SIGNAL", url, json=payload, headers={"Authorization": cache.get("service_bearer_token")}, timeout=(5, 30))
+    logging.debug(r.text)
+
+    response = r.json()
+    logging.debug(response["message"])
+
+    return response
+
+
+@retry_failed_connection(num_times=2)
+@json_error_handler
+def generate_signals(pipeline_ids, header=''):
+
+    url = MODEL_APP_ENDPOINTS["GENERATE_SIGNALS"](os.getenv("MODEL_APP_URL"))
+
+    payload = prepare_payload(
+        pipeline_ids=pipeline_ids
+    )
+
+    logging.info(header + f"Triggering signal generation for pipelines {pipeline_ids}.")
+
+    r = model_app.post("GENERATE_SIGNALS", url, json=payload, headers={"Authorization": cache.get("service_bearer_token")}, timeout=(5, 30))
     logging.debug(r.text)
 
     response = r.json()
@@ -66,7 +93,7 @@ def start_stop_symbol_trading(payload, start_or_stop):
 
     url = EXECUTION_APP_ENDPOINTS[endpoint](os.getenv("EXECUTION_APP_URL"))
 
-    r = requests.post(url, json=payload, headers=headers, timeout=(5, 60))
+    r = execution_app.post(endpoint, url, json=payload, headers=headers, timeout=(5, 60))
     logging.debug(r.text)
 
     response = r.json()
@@ -83,12 +110,25 @@ def get_strategies():
 
     url = MODEL_APP_ENDPOINTS[endpoint](os.getenv("MODEL_APP_URL"))
 
-    r = requests.get(url, headers={"Authorization": cache.get("service_bearer_token")}, timeout=(5, 30))
+    headers = {"Authorization": cache.get("service_bearer_token")}
+
+    if _strategies["etag"] is not None:
+        headers["If-None-Match"] = _strategies["etag"]
+
+    r = model_app.get(endpoint, url, headers=headers, timeout=(5, 30))
+
+    if r.status_code == 304:
+        logging.debug("get_strategies: not modified")
+        return _strategies["response"]
+
     logging.debug("get_strategies: " + r.text)
 
     response = r.json()
     logging.debug(f"get_strategies: {response}")
 
+    if r.ok and r.headers.get("ETag"):
+        _strategies.update(etag=r.headers["ETag"], response=response)
+
     return response
 
 
@@ -100,7 +140,7 @@ def get_price(symbol):
 
     url = EXECUTION_APP_ENDPOINTS[endpoint](os.getenv("EXECUTION_APP_URL"), symbol)
 
-    r = requests.get(url, headers={"Authorization": cache.get("service_bearer_token")}, timeout=(5, 30))
+    r = execution_app.get(endpoint, url, headers={"Authorization": cache.get("service_bearer_token")}, timeout=(5, 30))
     logging.debug("get_price: " + r.text)
 
     response = r.json()
@@ -117,7 +157,7 @@ def get_balance():
 
     url = EXECUTION_APP_ENDPOINTS[endpoint](os.getenv("EXECUTION_APP_URL"))
 
-    r = requests.get(url, headers={"Authorization": cache.get("service_bearer_token")}, timeout=(5, 30))
+    r = execution_app.get(endpoint, url, headers={"Authorization": cache.get("service_bearer_token")}, timeout=(5, 30))
     logging.debug("get_balance: " + r.text)
 
     response = r.json()
@@ -134,7 +174,7 @@ def get_open_positions():
 
     url = EXECUTION_APP_ENDPOINTS[endpoint](os.getenv("EXECUTION_APP_URL"))
 
-    r = requests.get(url, headers={"Authorization": cache.get("service_bearer_token")}, timeout=(5, 30))
+    r = execution_app.get(endpoint, url, headers={"Authorization": cache.get("service_bearer_token")}, timeout=(5, 30))
     logging.debug("get_open_positions: " + r.text)
 
     response = r.json()
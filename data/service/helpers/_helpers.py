@@ -16,12 +16,14 @@ from shared.utils.exceptions.leverage_invalid import LeverageInvalid
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "database.settings")
 django.setup()
 
-from database.model.models import Exchange, Pipeline, Symbol, PortfolioTimeSeries, Strategy, Trade, \
+from database.model.models import Exchange, Pipeline, Symbol, PortfolioTimeSeriesRollup, Strategy, Trade, \
     strategy_combination_methods
 import shared.exchanges.binance.constants as const
+from shared.utils.equity_rollups import RESOLUTIONS, bucket_start
 
 MODEL_APP_ENDPOINTS = {
     "GENERATE_SIGNAL": lambda host_url: f"{host_url}/generate_signal",
+    "GENERATE_SIGNALS": lambda host_url: f"{host_url}/generate_signals",
     "CHECK_JOB": lambda host_url, job_id: f"{host_url}/check_job/{job_id}",
     "GET_STRATEGIES": lambda host_url: f"{host_url}/strategies",
 }
@@ -239,41 +241,60 @@ def extract_request_params(request):
     )
 
 
-def resample_equity_data(df, timeframes, max_size):
-
-    now = pd.Timestamp(datetime.datetime.now(tz=pytz.utc))
+def get_pipeline_equity_timeseries(pipeline_id=None, account_type=None, max_items=500):
+    """
+    Equity of a pipeline (or of an account type) over time, at the finest
+    rollup resolution that fits in `max_items` points (the coarsest one if
+    none does). Each point is the mean of the snapshots in its bucket, empty
+    buckets up to now repeat the last snapshot before them, and the last
+    point is the latest snapshot.
+    """
+    if pipeline_id is not None:
+        rollups = PortfolioTimeSeriesRollup.objects.filter(pipeline_id=pipeline_id)
+    else:
+        rollups = PortfolioTimeSeriesRollup.objects.filter(pipeline__isnull=True, type=account_type)
 
-    df_now = pd.DataFrame(data={df.columns[0]: [None], "time": [now]}).set_index('time')
+    finest, coarsest = list(RESOLUTIONS)[0], list(RESOLUTIONS)[-1]
 
-    df = pd.concat([df, df_now], axis=0).ffill().round(1)
+    first_time = rollups.filter(resolution=finest).order_by('time').values_list('time', flat=True).first()
 
-    for timeframe in timeframes:
+    if first_time is None:
+        return []
 
-        df = df.resample(timeframe).mean().ffill()
+    now = datetime.datetime.now(tz=pytz.utc)
 
-        if df.shape[0] > max_size:
-            continue
-        else:
-            break
+    resolution = next(
+        (
+            resolution for resolution in RESOLUTIONS
+            if (bucket_start(now, resolution) - bucket_start(first_time, resolution)).total_seconds()
+            // RESOLUTIONS[resolution] + 1 <= max_items
+        ),
+        coarsest
+    )
 
-    return df
+    buckets = rollups.filter(resolution=resolution).order_by('time').values_list('time', 'total', 'count', 'last')
 
+    df = pd.DataFrame(list(buckets), columns=["time", "total", "count", "last"]).set_index("time")
 
-def get_pipeline_equity_timeseries(pipeline_id=None, account_type=None, max_items=500):
+    df["$"] = df["total"] / df["count"]
 
-    if pipeline_id is not None:
-        timeseries = PortfolioTimeSeries.objects.filter(pipeline__id=pipeline_id).values('time', 'value')
-    else:
-        timeseries = PortfolioTimeSeries.objects.filter(type=account_type).values('time', 'value')
+    index = pd.date_range(
+        bucket_start(first_time, resolution),
+        bucket_start(now, resolution),
+        freq=pd.Timedelta(seconds=RESOLUTIONS[resolution]),
+        name="time",
+    )
 
-    if len(timeseries) == 0:
-        return []
+    latest = df["last"].iloc[-1]
 
-    df = pd.DataFrame(timeseries).set_index('time').rename(columns={"value": "$"})
+    df = df[["$", "last"]].reindex(index)
 
-    df = resample_equity_data(df, const.CANDLE_SIZES_MAPPER.values(), max_items)
+    # an empty bucket repeats the last reading before it, and the series ends
+    # on the latest reading
+    df["$"] = df["$"].fillna(df["last"].ffill())
+    df.iloc[-1, df.columns.get_loc("$")] = latest
 
-    df = df.reset_index()
+    df = df[["$"]].round(1).reset_index()
 
     return json.loads(df.to_json(orient='records'))
 
@@ -1,2 +1,4 @@
-from data.sources._signal_triggerer import trigger_signal
+from data.sources._signal_triggerer import trigger_signal, trigger_signals, SignalBatcher
+from data.sources._signal_dispatcher import SignalDispatcher
+from data.sources._local_signals import LocalSignalGenerator, local_signal_generator
 # from data.sources.binance.extract import get_binance_data
@@ -0,0 +1,168 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+
+import django
+import pytz
+import redis
+from django.db import close_old_connections
+
+from data.sources._signal_triggerer import RESPONSES
+from shared.utils.settings import settings
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "database.settings")
+django.setup()
+
+from database.model.models import Pipeline
+
+
+cache = redis.from_url(settings.redis_url)
+
+# the model's in-job delivery budget (MAX_DELIVERY_SECONDS) plus headroom for
+# reading the candles and evaluating the strategies
+LOCAL_SIGNAL_TIMEOUT = 60
+
+
+def _init_worker():
+    # import the signal generation stack once per process, not per signal
+    from model.service.cloud_storage import cloud_storage_startup
+    import model.signal_generation  # noqa: F401
+
+    cloud_storage_startup()
+
+
+def run_signal_generator(pipeline_id, enqueued_at, bearer_token, header=''):
+    """
+    Runs model.signal_generation.signal_generator for a pipeline, in a worker
+    process of the local pool.
+
+    Returns
+    -------
+    tuple
+        (result, error): the signal_generator result and None, or False and the
+        description of the exception it raised. Exceptions are not propagated
+        as such, since the model's exceptions are not guaranteed to unpickle.
+    """
+    from model.signal_generation import signal_generator
+    from model.signal_generation._signal_generation import alert_signal_failure
+    from shared.utils.helpers import get_pipeline_data
+
+    # the pool processes are long-lived: drop the connections past
+    # CONN_MAX_AGE or left unusable before and after every signal
+    close_old_connections()
+
+    try:
+        pipeline = get_pipeline_data(pipeline_id)
+
+        pipeline_dict = dict(
+            id=pipeline.id,
+            strategies=pipeline.strategy,
+            strategy_combination=pipeline.strategy_combination,
+            symbol=pipeline.symbol,
+            exchange=pipeline.exchange,
+            interval=pipeline.candle_size,
+            enqueued_at=enqueued_at,
+        )
+
+        return signal_generator(pipeline_dict, bearer_token, header=header), None
+
+    except Exception as e:
+        logging.exception(header + f"Signal generation failed: {e!r}")
+        # same alerting as a failed RQ signal job
+        alert_signal_failure(pipeline_id, type(e), e)
+        return False, f"{type(e).__name__}: {e}"
+
+    finally:
+        close_old_connections()
+
+
+class LocalSignalGenerator:
+    """
+    Generates the signals of the pipelines in a pool of local processes that
+    import the model's signal generation directly, for deployments where the
+    data and model services share a host (SIGNAL_MODE=local).
+
+    This skips the HTTP request to the model service, the RQ queue and the
+    job status round trips. The orders are still sent to the execution
+    service, which owns the trading state. The worker processes are
+    long-lived, so the model's candle and strategy caches stay warm between
+    candles.
+
+    The staleness semantics are those of the queued jobs: the pipeline is
+    stamped with the moment its candle closed, and `compute_delivery_deadline`
+    discards the signal if the candle period elapses before it is evaluated.
+    """
+
+    def __init__(self, max_workers):
+        self.max_workers = max_workers
+
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def trigger(self, pipeline_id, header=''):
+        """
+        Local equivalent of `trigger_signal(pipeline_id, header)`.
+
+        Returns
+        -------
+        tuple
+            (success, message), as in `RESPONSES`.
+        """
+        if not Pipeline.objects.filter(id=pipeline_id, active=True).exists():
+            return RESPONSES["PIPELINE_NOT_ACTIVE"]
+
+        enqueued_at = datetime.now(tz=pytz.utc).isoformat()
+
+        bearer_token = cache.get("service_bearer_token")
+
+        try:
+            future = self._get_executor().submit(
+                run_signal_generator, pipeline_id, enqueued_at, bearer_token, header
+            )
+            result, error = future.result(timeout=LOCAL_SIGNAL_TIMEOUT)
+
+        except TimeoutError:
+            return RESPONSES["TOO_MANY_RETRIES"]
+
+        except BrokenProcessPool:
+            logging.warning(header + "Local signal worker died. Restarting the pool.")
+            self.shutdown(wait=False)
+            return RESPONSES["JOB_FAILED"]
+
+        if error is not None:
+            logging.debug(header + error)
+
+        return RESPONSES["SUCCESS"] if result else RESPONSES["JOB_FAILED"]
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # the models trained by the pool's jobs are synced with the bucket from here
+                from model.service.cloud_storage import start_model_sync
+                from model.service.helpers import LOCAL_MODELS_LOCATION
+
+                start_model_sync(LOCAL_MODELS_LOCATION, settings.model_sync_interval)
+
+                # the data service runs threads (websockets, signal dispatch):
+                # spawn fresh interpreters instead of forking them
+                self._executor = ProcessPoolExecutor(
+                    self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+
+            return self._executor
+
+
+local_signal_generator = LocalSignalGenerator(settings.local_signal_workers)
@@ -0,0 +1,135 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from shared.utils.notifier import send_alert
+
+
+class _Task:
+
+    __slots__ = ("fn", "args", "kwargs", "submitted_at")
+
+    def __init__(self, fn, args, kwargs):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.submitted_at = time.monotonic()
+
+
+class SignalDispatcher:
+    """
+    Runs the signal requests of the pipelines off the websocket thread, on a
+    bounded pool of worker threads.
+
+    The websocket thread only enqueues and returns, so a slow signal job never
+    delays the ingestion of the next candle. Requests are serialized per
+    pipeline: while a pipeline's signal is in flight, the next one waits, and
+    if yet another candle closes in the meantime it supersedes the waiting
+    request (only the most recent candle's signal is worth sending). Once
+    `max_pending` pipelines have requests in flight, new requests are rejected
+    and alerted on instead of queueing up unboundedly.
+
+    Parameters
+    ----------
+    max_workers : int
+        Number of signal requests that can be in flight at the same time.
+    max_pending : int
+        Maximum number of pipelines with a request either in flight or waiting
+        for a worker.
+    """
+
+    def __init__(self, max_workers, max_pending):
+        self.max_pending = max_pending
+
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="signal")
+        self._lock = threading.Lock()
+
+        # pipelines with a request submitted to the executor, and the
+        # request each of them runs next
+        self._active = set()
+        self._next = {}
+
+        self._counters = dict.fromkeys(["submitted", "completed", "failed", "superseded", "rejected"], 0)
+        self._max_wait = 0
+
+    def submit(self, pipeline_id, fn, *args, **kwargs):
+        """
+        Schedules fn(*args, **kwargs) as the pipeline's next signal request.
+
+        Returns
+        -------
+        bool
+            False if the request was rejected because the dispatcher is full.
+        """
+        task = _Task(fn, args, kwargs)
+
+        with self._lock:
+            self._counters["submitted"] += 1
+
+            if pipeline_id in self._active:
+                if pipeline_id in self._next:
+                    self._counters["superseded"] += 1
+
+                self._next[pipeline_id] = task
+                return True
+
+            if len(self._active) >= self.max_pending:
+                self._counters["rejected"] += 1
+                rejected = True
+            else:
+                self._active.add(pipeline_id)
+                rejected = False
+
+        if rejected:
+            logging.warning(f"Signal dispatcher full: dropping the signal request of pipeline {pipeline_id}.")
+            send_alert(
+                title="Signal requests dropped",
+                body=(
+                    f"{self.max_pending} pipelines have signal requests in flight - the signal "
+                    f"request of pipeline {pipeline_id} was dropped. Stats: {self.stats()}"
+                ),
+                severity="warning",
+                dedup_key="signal-dispatch-backlog",
+                throttle_seconds=900,
+            )
+            return False
+
+        self._executor.submit(self._run, pipeline_id, task)
+
+        return True
+
+    def stats(self):
+        """Back-pressure metrics of the dispatcher."""
+        with self._lock:
+            return {
+                **self._counters,
+                "in_flight": len(self._active),
+                "waiting": len(self._next),
+                "max_wait_seconds": round(self._max_wait, 3),
+            }
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, pipeline_id, task):
+        while task is not None:
+            wait = time.monotonic() - task.submitted_at
+
+            try:
+                task.fn(*task.args, **task.kwargs)
+                failed = False
+            except Exception as e:
+                logging.exception(f"Signal request of pipeline {pipeline_id} failed: {e!r}")
+                failed = True
+
+            with self._lock:
+                self._counters["failed" if failed else "completed"] += 1
+                self._max_wait = max(self._max_wait, wait)
+
+                # keep the worker on the pipeline while it has requests
+                # waiting, so they run in order
+                task = self._next.pop(pipeline_id, None)
+
+                if task is None:
+                    self._active.discard(pipeline_id)
@@ -1,11 +1,14 @@
 import logging
 import os
-import time
+import threading
+from collections import defaultdict
+from concurrent.futures import Future
 
 import django
 from requests import ReadTimeout, ConnectionError
 
-from data.service.external_requests import generate_signal, check_job_status
+from data.service.external_requests import generate_signal, generate_signals, check_job_status
+from shared.utils.job_results import wait_for_job_result
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "database.settings")
 django.setup()
@@ -22,9 +25,30 @@ RESPONSES = {
     "SUCCESS": (True, ""),
 }
 
+# longest wait for a job's completion notification before polling /check_job
+JOB_POLL_INTERVAL = 5
+
+
+def get_job_status(job_id):
+    """
+    Returns the status of a job, as responded by /check_job.
+
+    The completion notification pushed by the model worker is awaited first,
+    so a concluded job is known within milliseconds. /check_job is only polled
+    when no notification arrives within JOB_POLL_INTERVAL seconds (job still
+    queued or running, lost job, or notifications unavailable).
+    """
+    response = wait_for_job_result(job_id, timeout=JOB_POLL_INTERVAL)
+
+    if response is not None:
+        return response
+
+    try:
+        return check_job_status(job_id)
+    except (ConnectionError, ReadTimeout):
+        return None
+
 
-# TODO: Implement logic to send this request
-#  only if all data sources have updated the new row.
 def trigger_signal(pipeline_id, header='', retry=0):
     try:
         pipeline = Pipeline.objects.get(id=pipeline_id)
@@ -52,15 +76,12 @@ def trigger_signal(pipeline_id, header='', retry=0):
 
 def wait_for_job_conclusion(job_id, pipeline_id, retry, header=''):
 
-    # retries counts every poll, so the loop is guaranteed to terminate even
-    # when responses are malformed or the job is stuck in an unknown state
+    # retries counts every status check, so the loop is guaranteed to terminate
+    # even when responses are malformed or the job is stuck in an unknown state
     retries = 0
     while retries <= 10:
 
-        try:
-            response = check_job_status(job_id)
-        except (ConnectionError, ReadTimeout):
-            response = None
+        response = get_job_status(job_id)
 
         if response and "status" in response:
             if response["code"] == "JOB_NOT_FOUND":
@@ -80,6 +101,168 @@ def wait_for_job_conclusion(job_id, pipeline_id, retry, header=''):
                 logging.debug(header + f"{job_id}: Waiting for job conclusion.")
 
         retries += 1
-        time.sleep(5)
 
     return RESPONSES["TOO_MANY_RETRIES"]
+
+
+def trigger_signals(pipeline_ids, headers=None):
+    """
+    Batch version of `trigger_signal`: requests the signals of several pipelines
+    at once, so that the model service evaluates the pipelines that share a
+    symbol and interval in a single job.
+
+    Parameters
+    ----------
+    pipeline_ids : list of int
+    headers : dict, optional
+        Logging prefix of each pipeline.
+
+    Returns
+    -------
+    dict
+        The (success, message) outcome of each pipeline, keyed by pipeline id.
+    """
+    headers = headers or {}
+
+    active = set(
+        Pipeline.objects.filter(id__in=pipeline_ids, active=True).values_list("id", flat=True)
+    )
+
+    results = {
+        pipeline_id: RESPONSES["PIPELINE_NOT_ACTIVE"] for pipeline_id in pipeline_ids if pipeline_id not in active
+    }
+
+    pipeline_ids = [pipeline_id for pipeline_id in pipeline_ids if pipeline_id in active]
+
+    if len(pipeline_ids) == 0:
+        return results
+
+    try:
+        response = generate_signals(pipeline_ids)
+    except (ConnectionError, ReadTimeout):
+        return {**results, **{pipeline_id: RESPONSES["MODEL_APP_UNREACHABLE"] for pipeline_id in pipeline_ids}}
+
+    if not ("success" in response and response["success"]):
+        logging.info(response)
+        message = response["message"] if "message" in response else response
+        return {**results, **{pipeline_id: (False, message) for pipeline_id in pipeline_ids}}
+
+    jobs = {}
+    for pipeline_id in pipeline_ids:
+        jobs.setdefault(response["job_ids"][str(pipeline_id)], []).append(pipeline_id)
+
+    for job_id, job_pipeline_ids in jobs.items():
+        results.update(wait_for_batch_conclusion(job_id, job_pipeline_ids, headers=headers))
+
+    return results
+
+
+def wait_for_batch_conclusion(job_id, pipeline_ids, headers=None):
+
+    headers = headers or {}
+
+    retries = 0
+    while retries <= 10:
+
+        response = get_job_status(job_id)
+
+        if response and "status" in response:
+            if response["code"] == "JOB_NOT_FOUND":
+                # fall back to one job per pipeline
+                return {
+                    pipeline_id: trigger_signal(pipeline_id, header=headers.get(pipeline_id, ''), retry=1)
+                    for pipeline_id in pipeline_ids
+                }
+            elif response["code"] == "FINISHED":
+                logging.debug(f"Job {job_id} finished successfully.")
+
+                job_results = response["success"] if isinstance(response["success"], dict) else {}
+
+                return {
+                    pipeline_id: RESPONSES["SUCCESS"] if job_results.get(str(pipeline_id)) else RESPONSES["JOB_FAILED"]
+                    for pipeline_id in pipeline_ids
+                }
+
+            elif response["code"] == "FAILED":
+                logging.debug(f"{job_id}: Job failed.")
+                return {pipeline_id: RESPONSES["JOB_FAILED"] for pipeline_id in pipeline_ids}
+            else:
+                logging.debug(f"{job_id}: Waiting for job conclusion.")
+
+        retries += 1
+
+    return {pipeline_id: RESPONSES["TOO_MANY_RETRIES"] for pipeline_id in pipeline_ids}
+
+
+class SignalBatcher:
+    """
+    Groups the signal requests that pipelines make for the same candle into a
+    single batch request.
+
+    Pipelines that share a (symbol, interval) close their candles at the same
+    moment. The first request of a group opens a batch, which is sent with
+    `trigger_signals` as soon as every pipeline registered on the key has
+    made its request (right away for a single pipeline), or after `window`
+    seconds at the latest. Each caller receives the outcome of its own
+    pipeline.
+    """
+
+    def __init__(self, window=1):
+        self.window = window
+
+        self._lock = threading.Lock()
+        self._batches = {}
+        self._pipelines = defaultdict(set)
+
+    def register(self, key, pipeline_id):
+        """Adds a pipeline to the ones whose requests a batch of `key` waits for."""
+        with self._lock:
+            self._pipelines[key].add(pipeline_id)
+
+    def unregister(self, key, pipeline_id):
+        with self._lock:
+            self._pipelines[key].discard(pipeline_id)
+
+            if not self._pipelines[key]:
+                del self._pipelines[key]
+
+    def trigger(self, key, pipeline_id, header=''):
+        """
+        Blocking equivalent of `trigger_signal(pipeline_id, header)`, batched
+        with the requests of the other pipelines of the same key.
+        """
+        with self._lock:
+            batch = self._batches.get(key)
+
+            if batch is None:
+                batch = self._batches[key] = ({}, Future())
+
+                timer = threading.Timer(self.window, self._flush, args=(key, batch))
+                timer.daemon = True
+                timer.start()
+
+            headers, future = batch
+            headers[pipeline_id] = header
+
+            complete = self._pipelines.get(key, set()) <= headers.keys()
+
+        if complete:
+            self._flush(key, batch)
+
+        return future.result()[pipeline_id]
+
+    def _flush(self, key, batch):
+        with self._lock:
+            # sent already, by the last pipeline to report or by the timer
+            if self._batches.get(key) is not batch:
+                return
+
+            del self._batches[key]
+
+        headers, future = batch
+
+        try:
+            future.set_result(trigger_signals(list(headers), headers=headers))
+        except Exception as e:
+            logging.exception(e)
+            future.set_exception(e)
@@ -1,2 +1,3 @@
 from data.sources.binance._binance import BinanceDataHandler
+from data.sources.binance._candle_buffer import CandleBuffer
 from data.sources.binance.extract import get_historical_data
@@ -1,29 +1,26 @@
-import asyncio
 import logging
 import os
-import threading
 from datetime import datetime
 
-import pandas as pd
 import pytz
 import django
 import redis
-from binance import ThreadedWebsocketManager
-import progressbar
 
 from data.service.external_requests import start_stop_symbol_trading
 from data.service.helpers.exceptions import CandleSizeInvalid, DataPipelineCouldNotBeStopped
 from data.service.blueprints.bots_api import stop_pipeline
-from data.sources import trigger_signal
+from data.sources import trigger_signal, SignalBatcher, SignalDispatcher, local_signal_generator
 from data.sources.binance.extract import (
     extract_data,
     extract_data_db,
-    get_earliest_missing_date,
-    get_number_of_batches,
-    get_end_date
+    fetch_klines_ranges,
+    get_missing_ranges,
+    get_used_weight
 )
 from data.sources.binance.load import load_data
-from data.sources.binance.transform import resample_data, transform_data
+from data.sources.binance.transform import transform_data
+from data.sources.binance._candle_buffer import CandleBuffer
+from data.sources.binance._stream_hub import get_stream_hub
 from shared.utils.helpers import get_minimum_lookback_date, get_pipeline_max_window, remove_pipeline_loading
 from shared.utils.events import publish_pipeline_event, EVENT_DEACTIVATED
 from shared.utils.notifier import send_alert
@@ -41,8 +38,14 @@ os.environ["DJANGO_ALLOW_ASYNC_UNSAFE"] = "true"
 
 cache = redis.from_url(settings.redis_url)
 
+# websocket messages of every pipeline are dispatched on the stream hub's
+# single thread, so the (blocking) signal requests must run elsewhere
+signal_dispatcher = SignalDispatcher(settings.signal_workers, settings.signal_max_pending)
 
-class BinanceDataHandler(BinanceHandler, ThreadedWebsocketManager):
+signal_batcher = SignalBatcher()
+
+
+class BinanceDataHandler(BinanceHandler):
     """
     Class that handles realtime / incoming data from the Binance API, and
     triggers signal generation whenever a new step has been surpassed (currently
@@ -52,17 +55,6 @@ class BinanceDataHandler(BinanceHandler, ThreadedWebsocketManager):
     def __init__(self, symbol, candle_size, pipeline_id=None, start_date=None):
 
         BinanceHandler.__init__(self, base_candle_size=settings.base_candle_size)
-        ThreadedWebsocketManager.__init__(self, self.binance_api_key, self.binance_api_secret)
-
-        # python-binance binds self._loop via get_loop() (asyncio.get_event_loop)
-        # in __init__. Under gunicorn on Python 3.12 that can return a loop that
-        # is already running, so the websocket thread dies in run() with "This
-        # event loop is already running" and no live candles ever arrive. Replace
-        # it with a fresh, dedicated loop and make it this thread's current loop
-        # so the socket (created here) and the listener (run in the websocket
-        # thread) agree on a single, not-yet-running loop.
-        self._loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(self._loop)
 
         self._validate_input(symbol, candle_size)
 
@@ -71,29 +63,14 @@ class BinanceDataHandler(BinanceHandler, ThreadedWebsocketManager):
         self.exchange = 'binance'
         self.header = ''
 
-        self.conn_key = ''
+        self.stream_hub = None
         self.streams = []
 
         self.start_date = start_date
         self.batch_size = 1000
 
-        self.raw_data = pd.DataFrame()
-        self.data = pd.DataFrame()
-        self.raw_data_length = 1
-        self.data_length = 1
-
-        self.start()
-        self.started = True
-
-    def _delete(self):
-        # BinanceDataHandler multiply-inherits Client (REST) and Thread; both
-        # define _delete with different signatures. Python 3.12's thread teardown
-        # calls self._delete(), which the MRO resolves to Client._delete (an HTTP
-        # verb requiring `path`) and raises TypeError. Force the Thread cleanup.
-        try:
-            threading.Thread._delete(self)
-        except AttributeError:
-            pass
+        self.raw_data = CandleBuffer(self.base_candle_size)
+        self.data = CandleBuffer(candle_size)
 
     def _validate_input(self, symbol, candle_size):
         """
@@ -130,41 +107,32 @@ class BinanceDataHandler(BinanceHandler, ThreadedWebsocketManager):
 
         self.header = header
 
-        data = pd.DataFrame()
-
         self.delete_last_entry()
 
-        start_date = self.get_start_date()
-
-        if start_date is None:
-            nr_batches = 0
-        else:
-            nr_batches = get_number_of_batches(start_date, self.base_candle_size, self.batch_size) + 1
-
-        # Get raw data
-        with progressbar.ProgressBar(max_value=nr_batches, redirect_stdout=True) as bar:
-            for i in range(nr_batches):
-                logging.info(f"Extracting historical data. Starting from {start_date}")
-
-                old_data = data
+        missing_ranges = self.get_missing_ranges()
+
+        # Get raw data - only the ranges that are missing from the db
+        if len(missing_ranges) > 0:
+            data = fetch_klines_ranges(
+                self.get_historical_klines,
+                self.symbol,
+                self.base_candle_size,
+                missing_ranges,
+                batch_size=self.batch_size,
+                get_weight=lambda: get_used_weight(self),
+                header=header
+            )
 
-                batch_data, new_entries = self._etl_pipeline(
+            # load in batches to keep the duplicate lookups on the db bounded
+            for i in range(0, len(data), self.batch_size):
+                self._etl_pipeline(
                     ExchangeData,
                     self.base_candle_size,
+                    data=data.iloc[i:i + self.batch_size],
                     update_duplicate=False,
-                    start_date=start_date,
                     header=header
                 )
 
-                data = pd.concat([data, batch_data], axis=0).drop_duplicates(["open_time"])
-
-                start_date = get_end_date(start_date, self.base_candle_size, self.batch_size)
-
-                bar.update(i)
-
-                if old_data.equals(data):
-                    break
-
         # Get structured data
         self._etl_pipeline(
             StructuredData,
@@ -277,18 +245,34 @@ class BinanceDataHandler(BinanceHandler, ThreadedWebsocketManager):
 
         self.streams = streams
 
-        self.conn_key = self.start_multiplex_socket(lambda row: callback(row, header), streams)
+        self.stream_hub = get_stream_hub()
+        self.stream_hub.subscribe(id(self), streams, lambda row: callback(row, header))
+
+        # the batch of the candle waits for this pipeline's request
+        signal_batcher.register((symbol, self.candle_size), self.pipeline_id)
 
     def _stop_websocket(self):
-        self.stop_socket(self.conn_key)
+        if self.stream_hub is not None:
+            self.stream_hub.unsubscribe(id(self))
+
+            signal_batcher.unregister((self.symbol, self.candle_size), self.pipeline_id)
 
     # number of consecutive failed signal generations after which the
     # pipeline is stopped and its position closed
     MAX_CONSECUTIVE_FAILURES = 3
 
-    def generate_new_signal(self, header):
+    def generate_new_signal(self, header, batched=False):
 
-        success, message = trigger_signal(self.pipeline_id, header=header)
+        if settings.signal_mode == "local":
+            # co-located deployment: evaluate the signal in a local process
+            success, message = local_signal_generator.trigger(self.pipeline_id, header=header)
+        elif batched:
+            # pipelines on the same symbol and interval share one signal job
+            success, message = signal_batcher.trigger(
+                (self.symbol, self.candle_size), self.pipeline_id, header=header
+            )
+        else:
+            success, message = trigger_signal(self.pipeline_id, header=header)
 
         failures_key = f"signal_failures {self.pipeline_id}"
 
@@ -351,96 +335,79 @@ class BinanceDataHandler(BinanceHandler, ThreadedWebsocketManager):
 
     def _websocket_callback(self, row, header=''):
 
-        kline_size = row["stream"].split('_')[-1]
+        stream = row["stream"]
+        kline_size = stream.split('_')[-1]
 
         if kline_size == self.base_candle_size:
-            self.raw_data, self.raw_data_length, _ = self._process_stream(
+            self._process_stream(
                 ExchangeData,
+                stream,
                 row["data"]["k"],
                 self.raw_data,
-                self.raw_data_length,
                 self.base_candle_size
             )
 
         if kline_size == self.candle_size:
-            self.data, self.data_length, new_entry = self._process_stream(
+            new_entry = self._process_stream(
                 StructuredData,
+                stream,
                 row["data"]["k"],
                 self.data,
-                self.data_length,
                 self.candle_size,
                 remove_zeros=True,
                 remove_rows=True,
             )
 
             if new_entry:
-                self.generate_new_signal(header)
+                signal_dispatcher.submit(self.pipeline_id, self.generate_new_signal, header, batched=True)
 
     def _process_stream(
         self,
         model_class,
+        stream,
         row,
-        data,
-        data_length,
+        candle_buffer,
         candle_size,
         remove_zeros=False,
         remove_rows=False,
     ):
+        # the buffer updates the forming candle in place and only hands back
+        # a candle once a kline of the next bucket shows it has closed
+        closed_candle = candle_buffer.update(row)
 
-        new_data = pd.DataFrame(
-            {
-                const.NAME_MAPPER[key]: [const.FUNCTION_MAPPER[key](value)]
-                for key, value in row.items()
-                if key in const.NAME_MAPPER
-            }
-        ).set_index('open_time')
+        if closed_candle is None:
+            return False
 
-        data = pd.concat([data, new_data], axis=0)
+        stored = []
 
-        data = resample_data(
-            data,
-            candle_size,
-            const.COLUMNS_AGGREGATION_WEBSOCKET
-        )
-
-        return self._process_new_data(
-            model_class,
-            data,
-            data_length,
-            candle_size,
-            remove_zeros=remove_zeros,
-            remove_rows=remove_rows
-        )
-
-    def _process_new_data(
-        self,
-        model_class,
-        data,
-        data_length,
-        candle_size,
-        remove_zeros=False,
-        remove_rows=False
-    ):
-        new_entries = False
-        if len(data) != data_length:
-            rows = data.iloc[data_length - 1:-1].reset_index()
-
-            data_length = len(data)
+        def load_candle():
+            stored.append(model_class)
 
             _, new_entries = self._etl_pipeline(
                 model_class,
                 candle_size,
                 reference_candle_size=candle_size,
-                data=rows,
+                data=closed_candle,
                 remove_zeros=remove_zeros,
                 remove_rows=remove_rows,
                 columns_aggregation=const.COLUMNS_AGGREGATION,
                 update_duplicate=True,
             )
+            return new_entries
+
+        # candle rows are shared by every pipeline on the stream: the first
+        # pipeline to close the candle stores it, the others reuse its result
+        new_entries = self.stream_hub.load_once(
+            stream, model_class.__name__, closed_candle["open_time"].iloc[0], load_candle
+        )
+
+        if not stored:
+            # load_data only refreshes the storing pipeline's last entry
+            Pipeline.objects.filter(id=self.pipeline_id).update(last_entry=datetime.now(pytz.utc))
 
-        return data, data_length, new_entries
+        return new_entries
 
-    def get_start_date(self):
+    def get_missing_ranges(self):
         if self.start_date is not None:
             minimum_lookback_date = self.start_date
         else:
@@ -449,7 +416,7 @@ class BinanceDataHandler(BinanceHandler, ThreadedWebsocketManager):
 
         self.start_date = minimum_lookback_date
 
-        return get_earliest_missing_date(minimum_lookback_date, self.symbol)
+        return get_missing_ranges(minimum_lookback_date, self.symbol)
 
     def delete_last_entry(self):
         # ExchangeData/StructuredData rows are shared by every pipeline on the
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+import shared.exchanges.binance.constants as const
+
+
+class CandleBuffer:
+    """
+    Fixed-capacity ring buffer holding the most recent candles of a websocket
+    kline stream.
+
+    Columns are preallocated NumPy arrays and every incoming kline updates the
+    slot of its open_time bucket in place, so the cost per message is constant
+    and the memory used by a pipeline does not grow with its uptime. When a
+    kline for a later bucket arrives, the previous bucket is complete and is
+    returned as the "candle closed" event.
+    """
+
+    COLUMNS = [column for column in const.COLUMNS_AGGREGATION_WEBSOCKET if column != "close_time"]
+
+    KLINE_KEYS = {value: key for key, value in const.NAME_MAPPER.items()}
+
+    def __init__(self, candle_size, capacity=1000):
+
+        if candle_size not in const.CANDLE_SIZES_MAPPER:
+            raise ValueError(f"Unsupported candle size: {candle_size}")
+
+        self.candle_size = candle_size
+        self.capacity = capacity
+
+        self._bucket_ms = int(pd.Timedelta(const.CANDLE_SIZES_MAPPER[candle_size]).total_seconds() * 1000)
+
+        self._open_times = np.zeros(capacity, dtype=np.int64)
+        self._close_times = np.zeros(capacity, dtype=np.int64)
+        self._values = np.full((capacity, len(self.COLUMNS)), np.nan, dtype=np.float64)
+
+        self._head = -1
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def current_bucket(self):
+        return self._open_times[self._head] if self._size > 0 else None
+
+    def update(self, kline):
+        """
+        Writes a websocket kline into the buffer.
+
+        Parameters
+        ----------
+        kline : dict
+            The "k" payload of a binance kline stream message.
+
+        Returns
+        -------
+        pd.DataFrame or None
+            A single row frame with the candle that was closed by this kline,
+            or None if the kline only updated the current candle (or arrived
+            late for a candle that is already closed).
+        """
+        bucket = kline[self.KLINE_KEYS["open_time"]] // self._bucket_ms * self._bucket_ms
+
+        closed_candle = None
+
+        if self._size == 0 or bucket > self.current_bucket:
+            if self._size > 0:
+                closed_candle = self._row_frame([self._head])
+
+            self._head = (self._head + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+
+            self._open_times[self._head] = bucket
+
+        elif bucket < self.current_bucket:
+            return None
+
+        self._close_times[self._head] = kline[self.KLINE_KEYS["close_time"]]
+        self._values[self._head] = [float(kline[self.KLINE_KEYS[column]]) for column in self.COLUMNS]
+
+        return closed_candle
+
+    def to_frame(self):
+        """Returns the buffered candles, oldest first, indexed by open_time."""
+        positions = (np.arange(self._size) + self._head - self._size + 1) % self.capacity
+
+        return self._row_frame(positions).set_index("open_time")
+
+    def _row_frame(self, positions):
+
+        data = pd.DataFrame(self._values[positions], columns=self.COLUMNS)
+
+        data.insert(0, "open_time", pd.to_datetime(self._open_times[positions], unit="ms", utc=True))
+        data.insert(1, "close_time", pd.to_datetime(self._close_times[positions], unit="ms", utc=True))
+
+        return data
@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+
+from binance import ThreadedWebsocketManager
+
+
+class StreamHub(ThreadedWebsocketManager):
+    """
+    Process-wide owner of the binance kline websockets.
+
+    Every stream (e.g. btcusdt@kline_5m) is opened once, no matter how many
+    pipelines consume it, and each incoming message is fanned out to all of
+    the stream's subscribers. Subscriptions are reference counted: the socket
+    is closed when its last subscriber leaves. All sockets share this single
+    thread and event loop instead of one per pipeline.
+    """
+
+    def __init__(self):
+        # kline streams are public market data - no api keys required
+        ThreadedWebsocketManager.__init__(self)
+
+        # see BinanceDataHandler: python-binance may bind a loop that is
+        # already running under gunicorn; the hub owns a dedicated one
+        self._loop = asyncio.new_event_loop()
+
+        # guards subscribe/unsubscribe against concurrent pipeline start/stop.
+        # Re-entrant because opening a socket may dispatch synchronously.
+        self._lock = threading.RLock()
+
+        self._subscribers = defaultdict(dict)
+        self._conn_keys = {}
+        self._loaded = {}
+
+    def subscribe(self, subscriber_id, streams, callback):
+        """
+        Registers a callback for each of the given streams, opening the
+        streams that are not being listened to yet.
+
+        Parameters
+        ----------
+        subscriber_id : hashable
+            Identifies the subscriber (e.g. the pipeline id) for unsubscribe.
+        streams : list of str
+            The stream names, e.g. ["btcusdt@kline_5m", "btcusdt@kline_1h"].
+        callback : callable
+            Called with every message of the subscribed streams.
+        """
+        with self._lock:
+            new_streams = []
+
+            for stream in dict.fromkeys(streams):
+                if not self._subscribers[stream]:
+                    new_streams.append(stream)
+
+                self._subscribers[stream][subscriber_id] = callback
+
+            for stream in new_streams:
+                self._conn_keys[stream] = self.start_multiplex_socket(self._dispatch, [stream])
+
+    def unsubscribe(self, subscriber_id):
+        """Removes a subscriber from all its streams, closing the streams nobody listens to anymore."""
+        with self._lock:
+            for stream in list(self._subscribers):
+                self._subscribers[stream].pop(subscriber_id, None)
+
+                if not self._subscribers[stream]:
+                    self._subscribers.pop(stream)
+                    self._loaded.pop(stream, None)
+
+                    conn_key = self._conn_keys.pop(stream, None)
+                    if conn_key is not None:
+                        self.stop_socket(conn_key)
+
+    def subscriber_count(self, stream):
+        with self._lock:
+            return len(self._subscribers.get(stream, {}))
+
+    def load_once(self, stream, key, open_time, load):
+        """
+        Runs `load` for the first subscriber that closes the candle at
+        open_time on a stream and hands its result to every other
+        subscriber, so rows shared by all pipelines on the stream are written
+        to the database only once.
+
+        Messages of a stream are dispatched sequentially on the hub thread,
+        so subscribers closing the same candle never race each other.
+        """
+        loaded = self._loaded.setdefault(stream, {})
+
+        if key in loaded and loaded[key][0] == open_time:
+            return loaded[key][1]
+
+        result = load()
+
+        loaded[key] = (open_time, result)
+
+        return result
+
+    def _dispatch(self, msg):
+
+        stream = msg.get("stream")
+
+        with self._lock:
+            callbacks = list(self._subscribers.get(stream, {}).values())
+
+        for callback in callbacks:
+            # one failing subscriber must not starve the others of the message
+            try:
+                callback(msg)
+            except Exception as e:
+                logging.exception(f"Error processing {stream} message: {e}")
+
+
+_hub = None
+_hub_lock = threading.Lock()
+
+
+def get_stream_hub():
+    """Returns the process-wide StreamHub, starting it on first use."""
+    global _hub
+    if _hub is None:
+        with _hub_lock:
+            if _hub is None:
+                hub = StreamHub()
+                hub.start()
+                _hub = hub
+    return _hub
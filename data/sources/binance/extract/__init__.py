@@ -1,11 +1,20 @@
 from data.sources.binance.extract._extract import (
     get_historical_data,
     extract_data,
-    extract_data_db
+    extract_data_db,
+    decode_klines
+)
+
+from data.sources.binance.extract._backfill import (
+    fetch_historical_klines,
+    fetch_klines_ranges,
+    get_batch_windows,
+    get_used_weight
 )
 
 from data.sources.binance.extract._helpers import (
     get_earliest_missing_date,
+    get_missing_ranges,
     get_number_of_batches,
     get_end_date,
     convert_date
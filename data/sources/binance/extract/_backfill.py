@@ -0,0 +1,246 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+import pandas as pd
+import progressbar
+import pytz
+from binance.exceptions import BinanceAPIException
+
+from data.sources.binance.extract._extract import extract_data
+from data.sources.binance.extract._helpers import get_end_date
+from shared.utils.settings import settings
+
+USED_WEIGHT_HEADER = "x-mbx-used-weight-1m"
+
+# number of times a window is retried after binance answers 429 (too many requests)
+MAX_RATE_LIMIT_RETRIES = 3
+
+
+def get_used_weight(client):
+    """
+    Returns the request weight used by this IP in the current minute, as
+    reported in the headers of the client's last response (0 if unknown).
+    """
+    response = getattr(client, "response", None)
+
+    try:
+        return int(response.headers.get(USED_WEIGHT_HEADER, 0))
+    except (AttributeError, TypeError, ValueError):
+        return 0
+
+
+def get_batch_windows(start_date, end_date, candle_size, batch_size):
+    """
+    Splits a date range into consecutive windows of at most `batch_size` candles.
+
+    Parameters
+    ----------
+    start_date : datetime
+        The start of the range.
+    end_date : datetime
+        The end of the range.
+    candle_size : str
+        The granularity of the data, e.g., "5m".
+    batch_size : int
+        The number of candles per window.
+
+    Returns
+    -------
+    list of datetime
+        The start date of every window, in chronological order.
+    """
+    windows = []
+
+    batch_start_date = start_date
+    while batch_start_date <= end_date:
+        windows.append(batch_start_date)
+        batch_start_date = get_end_date(batch_start_date, candle_size, batch_size)
+
+    return windows
+
+
+def wait_for_request_weight(get_weight, max_weight, header=''):
+    """
+    Blocks until the next minute when the used request weight reached
+    `max_weight` - binance resets the weight counters every minute.
+    """
+    if get_weight is None or get_weight() < max_weight:
+        return
+
+    now = datetime.now(pytz.utc)
+    seconds = 60 - now.second - now.microsecond / 1e6
+
+    logging.info(header + f"Request weight limit reached. Waiting {round(seconds, 1)}s.")
+    time.sleep(seconds)
+
+
+def _fetch_window(
+    get_klines_method,
+    symbol,
+    candle_size,
+    start_date,
+    end_date,
+    batch_size,
+    get_weight,
+    max_weight,
+    header
+):
+    retries = 0
+    while True:
+        wait_for_request_weight(get_weight, max_weight, header=header)
+
+        try:
+            return extract_data(
+                get_klines_method,
+                symbol,
+                candle_size,
+                start_date=start_date,
+                end_date=end_date,
+                klines_batch_size=batch_size
+            )
+        except BinanceAPIException as e:
+            if e.status_code != 429 or retries >= MAX_RATE_LIMIT_RETRIES:
+                raise
+
+            retries += 1
+
+            try:
+                retry_after = int(e.response.headers.get("Retry-After", 60))
+            except (AttributeError, TypeError, ValueError):
+                retry_after = 60
+
+            logging.warning(header + f"Rate limited by binance. Retrying in {retry_after}s.")
+            time.sleep(retry_after)
+
+
+def fetch_historical_klines(
+    get_klines_method,
+    symbol,
+    candle_size,
+    start_date,
+    end_date=None,
+    batch_size=1000,
+    max_workers=None,
+    get_weight=None,
+    max_weight=None,
+    header=''
+):
+    """
+    Fetches historical klines for a date range by splitting it into batch
+    windows that are downloaded concurrently by a bounded pool of workers.
+
+    Parameters
+    ----------
+    get_klines_method : method
+        Historical data fetching function.
+    symbol : str
+        Symbol for which to retrieve data.
+    candle_size : str
+        Candle size at which data should be retrieved.
+    start_date : datetime
+        Start date from which to retrieve data.
+    end_date : datetime, optional
+        If not specified, data is fetched until the latest candle.
+    batch_size : int, optional
+        Number of klines per request. Default is 1000.
+    max_workers : int, optional
+        Number of concurrent requests. Defaults to the BACKFILL_WORKERS setting.
+    get_weight : callable, optional
+        Returns the currently used request weight. Requests are paused while it
+        is above `max_weight`.
+    max_weight : int, optional
+        Defaults to the BACKFILL_MAX_WEIGHT setting.
+    header : str, optional
+        Prefix for logging purposes.
+
+    Returns
+    -------
+    pd.DataFrame
+        The fetched klines, sorted by open_time and without duplicates. The frame
+        is assembled once all windows are downloaded.
+    """
+    return fetch_klines_ranges(
+        get_klines_method,
+        symbol,
+        candle_size,
+        [(start_date, end_date)],
+        batch_size=batch_size,
+        max_workers=max_workers,
+        get_weight=get_weight,
+        max_weight=max_weight,
+        header=header
+    )
+
+
+def fetch_klines_ranges(
+    get_klines_method,
+    symbol,
+    candle_size,
+    ranges,
+    batch_size=1000,
+    max_workers=None,
+    get_weight=None,
+    max_weight=None,
+    header=''
+):
+    """
+    Same as `fetch_historical_klines`, but for a list of (start, end) date ranges,
+    e.g. the gaps returned by `get_missing_ranges`. The windows of all ranges
+    share the same pool of workers. A range with a None end is fetched until
+    the latest candle.
+    """
+    max_workers = max_workers or settings.backfill_workers
+    max_weight = max_weight or settings.backfill_max_weight
+
+    windows = [
+        (window_start, end_date)
+        for start_date, end_date in ranges
+        for window_start in get_batch_windows(
+            start_date,
+            end_date if end_date is not None else datetime.now(pytz.utc),
+            candle_size,
+            batch_size
+        )
+    ]
+
+    if len(windows) == 0:
+        return pd.DataFrame()
+
+    logging.info(
+        header + f"Extracting historical data from {windows[0][0]} in {len(windows)} batch(es) "
+                 f"over {len(ranges)} range(s)."
+    )
+
+    batches = [None] * len(windows)
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(windows))) as executor, \
+            progressbar.ProgressBar(max_value=len(windows), redirect_stdout=True) as bar:
+
+        futures = {
+            executor.submit(
+                _fetch_window,
+                get_klines_method,
+                symbol,
+                candle_size,
+                window_start,
+                window_end,
+                batch_size,
+                get_weight,
+                max_weight,
+                header
+            ): i
+            for i, (window_start, window_end) in enumerate(windows)
+        }
+
+        for completed, future in enumerate(as_completed(futures)):
+            batches[futures[future]] = future.result()
+            bar.update(completed + 1)
+
+    data = pd.concat(batches, axis=0)
+
+    if len(data) == 0:
+        return data
+
+    return data.drop_duplicates(["open_time"]).sort_values("open_time").reset_index(drop=True)
@@ -1,14 +1,14 @@
 import os
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
-import progressbar
 import pytz
 
 import shared.exchanges.binance.constants as const
 from shared.data.queries import get_data
 from shared.utils.helpers import get_root_dir
-from data.sources.binance.extract._helpers import get_number_of_batches, get_end_date, convert_date
+from data.sources.binance.extract._helpers import get_end_date, convert_date
 
 
 def get_historical_data(
@@ -57,7 +57,8 @@ def get_historical_data(
     -----
     - This function utilizes the BinanceHandler class for fetching data from Binance.
         Ensure the class is properly configured to access the Binance API.
-    - The progress of the data fetching process is displayed using a progress bar.
+    - Batches are fetched concurrently (see `fetch_historical_klines`) and the progress
+        is displayed using a progress bar.
 
     Examples
     --------
@@ -72,37 +73,20 @@ def get_historical_data(
     start_date = convert_date(start_date)
     end_date = convert_date(end_date)
 
-    batch_start_date = start_date
-
     from shared.exchanges.binance import BinanceHandler
+    from data.sources.binance.extract._backfill import fetch_historical_klines, get_used_weight
 
     binance_handler = BinanceHandler()
 
-    data = pd.DataFrame()
-
-    iterations = get_number_of_batches(start_date, candle_size, batch_size, end_date=end_date) + 1
-
-    with progressbar.ProgressBar(max_value=iterations, redirect_stdout=True) as bar:
-        i = 0
-        end_reached = False
-        while not end_reached:
-            batch_data = extract_data(
-                binance_handler.get_historical_klines,
-                symbol,
-                candle_size,
-                start_date=batch_start_date,
-                end_date=end_date,
-                klines_batch_size=batch_size
-            )
-
-            data = pd.concat([data, batch_data], axis=0).drop_duplicates(["open_time"])
-
-            batch_start_date = get_end_date(batch_start_date, candle_size, batch_size)
-
-            end_reached = batch_start_date > end_date
-
-            bar.update(i)
-            i += 1
+    data = fetch_historical_klines(
+        binance_handler.get_historical_klines,
+        symbol,
+        candle_size,
+        start_date,
+        end_date=end_date,
+        batch_size=batch_size,
+        get_weight=lambda: get_used_weight(binance_handler)
+    )
 
     if save_file:
 
@@ -160,14 +144,45 @@ def extract_data(
 
     klines = get_klines_method(symbol, candle_size, start_timestamp, end_timestamp, limit=klines_batch_size)
 
-    data = []
-    for kline in klines:
+    return decode_klines(klines)
+
+
+def decode_klines(klines):
+    """
+    Decodes a batch of klines as returned by the Binance REST API into a DataFrame.
+
+    The whole batch is converted into a 2D NumPy array at once and every column is
+    cast in bulk, instead of parsing the klines cell by cell.
+
+    Parameters
+    ----------
+    klines : list of list
+        The raw klines, e.g. [[1693576800000, "25940.0", ...], ...].
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per kline, with the columns of `const.BINANCE_KEY`. open_time and
+        close_time are datetime64[ms, UTC], trades is int64 and every other
+        column is float64.
+    """
+    columns = list(const.BINANCE_KLINE_INDEX)
+
+    if len(klines) == 0:
+        return pd.DataFrame(columns=columns)
+
+    values = np.array(klines)[:, list(const.BINANCE_KLINE_INDEX.values())].astype(np.float64)
+
+    data = pd.DataFrame(values, columns=columns)
 
-        fields = {field: get_value(kline) for field, get_value in const.BINANCE_KEY.items()}
+    for column in ["open_time", "close_time"]:
+        data[column] = pd.DatetimeIndex(
+            data[column].to_numpy(dtype=np.int64).astype("datetime64[ms]")
+        ).tz_localize(pytz.utc)
 
-        data.append(fields)
+    data["trades"] = data["trades"].astype(np.int64)
 
-    return pd.DataFrame(data)
+    return data
 
 
 def extract_data_db(exchange_data_model, symbol, base_candle_size, start_date):
@@ -3,10 +3,11 @@ import os
 from datetime import datetime
 
 import django
+import numpy as np
 import pandas as pd
 import pytz
 
-from shared.data.queries import get_data
+from shared.data.queries import get_candles
 from shared.exchanges.binance import constants as const
 from shared.exchanges.binance.constants import CANDLE_SIZES_MAPPER
 from shared.utils.settings import settings
@@ -45,7 +46,7 @@ def get_missing_dates(start_date, symbol, end_date):
         If `base_candle_size` does not correspond to a valid key in `CANDLE_SIZES_MAPPER`.
     """
 
-    data = get_data(ExchangeData, start_date, symbol, settings.base_candle_size, exchange='binance')
+    data = get_candles(ExchangeData, start_date, symbol, settings.base_candle_size, exchange='binance', columns=())
 
     freq = CANDLE_SIZES_MAPPER[settings.base_candle_size]
 
@@ -100,6 +101,62 @@ def get_earliest_missing_date(start_date, symbol, end_date=None):
     return missing_dates[0] if len(missing_dates) > 0 else None
 
 
+def get_missing_ranges(start_date, symbol, end_date=None):
+    """
+    Collapses the missing market data entries for a given symbol into contiguous
+    gap intervals, so that only the missing ranges need to be fetched.
+
+    Parameters
+    ----------
+    start_date : str or datetime
+        The start date of the period for which to check for missing data.
+    symbol : str
+        The trading symbol (e.g., "BTCUSDT") for which to check for missing data.
+    end_date : str or datetime, optional
+        The end date of the period for which to check for missing data. Defaults
+        to the current date and time if None.
+
+    Returns
+    -------
+    list of tuple
+        The (first, last) open times of every gap, in chronological order. If
+        `end_date` is None and the data is missing up to the present, the last
+        gap is open ended - its end is None - so that the candle that is still
+        forming is fetched as well.
+
+    Examples
+    --------
+    >>> get_missing_ranges("2021-01-01", "BTCUSDT")
+    [(Timestamp('2021-01-03 10:00:00+0000'), Timestamp('2021-01-03 10:15:00+0000')),
+     (Timestamp('2021-01-10 08:05:00+0000'), None)]
+    """
+
+    open_ended = end_date is None
+
+    start_date = convert_date(start_date)
+    end_date = convert_date(end_date)
+
+    missing_dates = get_missing_dates(start_date, symbol, end_date)
+
+    if len(missing_dates) == 0:
+        return []
+
+    freq = pd.Timedelta(CANDLE_SIZES_MAPPER[settings.base_candle_size])
+
+    # a new gap starts wherever consecutive missing dates are more than one candle apart
+    breaks = np.flatnonzero((missing_dates[1:] - missing_dates[:-1]) != freq) + 1
+
+    starts = missing_dates[np.r_[0, breaks]]
+    ends = missing_dates[np.r_[breaks - 1, len(missing_dates) - 1]]
+
+    ranges = list(zip(starts, ends))
+
+    if open_ended and ranges[-1][1] >= end_date:
+        ranges[-1] = (ranges[-1][0], None)
+
+    return ranges
+
+
 def convert_date(date):
     if date is None:
         date = datetime.now(pytz.utc)
@@ -1,3 +1,4 @@
+import io
 import logging
 import os
 from collections import defaultdict
@@ -5,7 +6,8 @@ from datetime import datetime
 
 import pandas as pd
 import pytz
-from django.db import transaction
+from django.db import connection, transaction
+from django.db.models import IntegerField
 import django
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "database.settings")
@@ -23,22 +25,90 @@ def load_data(model_class, data, pipeline_id, update_duplicate=True, header=''):
     if data.index.name == 'open_time':
         data = data.reset_index()
 
+    if connection.vendor == 'postgresql':
+        new_entries = _copy_load(model_class, data, update_duplicate)
+    else:
+        new_entries = _orm_load(model_class, data, update_duplicate)
+
+    Pipeline.objects.filter(id=pipeline_id).update(last_entry=datetime.now(pytz.utc))
+
+    return new_entries
+
+
+def _orm_load(model_class, data, update_duplicate):
+    """Database agnostic loader, used on SQLite (e.g. in tests)."""
+
     records = [_clean_record(record) for record in data.to_dict('records')]
 
     try:
-        new_entries = _bulk_load(model_class, records, update_duplicate)
+        return _bulk_load(model_class, records, update_duplicate)
     except (ValueError, TypeError) as e:
         # a row that can't be bulk-adapted falls back to the resilient,
         # one-row-at-a-time path rather than failing the whole batch
         logging.warning(f'Bulk load failed ({e}); falling back to row-by-row.')
-        new_entries = sum(
+        return sum(
             1 if save_new_entry_db(model_class, record, update_duplicate) else 0
             for record in records
         )
 
-    Pipeline.objects.filter(id=pipeline_id).update(last_entry=datetime.now(pytz.utc))
 
-    return new_entries
+def _copy_load(model_class, data, update_duplicate):
+    """Postgres loader: streams the rows into a temporary table with COPY and
+    merges them into the model's table with a single INSERT ... ON CONFLICT.
+    Returns the number of rows counted as written (new rows always; duplicates
+    only when update_duplicate is True).
+    """
+    fields = [
+        field for field in model_class._meta.concrete_fields
+        if not field.primary_key and field.column in data.columns
+    ]
+
+    if len(data) == 0 or not fields:
+        return 0
+
+    columns = [field.column for field in fields]
+
+    # a row may only be merged once per statement
+    data = data[columns].drop_duplicates(
+        [column for column in UNIQUE_FIELDS if column in columns], keep='last'
+    )
+
+    # integer columns come out of the transformations as floats
+    for field in fields:
+        if isinstance(field, IntegerField):
+            data = data.astype({field.column: 'Int64'})
+
+    buffer = io.StringIO()
+    data.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+
+    table = connection.ops.quote_name(model_class._meta.db_table)
+    temp_table = connection.ops.quote_name(f"{model_class._meta.db_table}_load")
+    column_list = ", ".join(connection.ops.quote_name(column) for column in columns)
+    conflict_list = ", ".join(connection.ops.quote_name(column) for column in UNIQUE_FIELDS)
+
+    if update_duplicate:
+        on_conflict = "DO UPDATE SET " + ", ".join(
+            f"{connection.ops.quote_name(column)} = EXCLUDED.{connection.ops.quote_name(column)}"
+            for column in columns if column not in UNIQUE_FIELDS
+        )
+    else:
+        on_conflict = "DO NOTHING"
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE {temp_table} ON COMMIT DROP "
+            f"AS SELECT {column_list} FROM {table} WITH NO DATA"
+        )
+
+        cursor.copy_expert(f"COPY {temp_table} ({column_list}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+        cursor.execute(
+            f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {temp_table} "
+            f"ON CONFLICT ({conflict_list}) {on_conflict}"
+        )
+
+        return cursor.rowcount
 
 
 def _clean_record(record):
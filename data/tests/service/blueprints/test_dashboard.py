@@ -618,8 +618,8 @@ class TestDashboardService:
                 '/1?maxItems=32',
                 {
                     "data": [
-                        {"$": 1011.25, "time": 1696161600000},
-                        {"$": 1026.25, "time": 1696176000000},
+                        {"$": 1011.7, "time": 1696161600000},
+                        {"$": 1022.5, "time": 1696176000000},
                         {"$": 1030.0, "time": 1696190400000},
                         {"$": 1030.0, "time": 1696204800000},
                         {"$": 1030.0, "time": 1696219200000},
@@ -633,7 +633,7 @@ class TestDashboardService:
                         {"$": 1030.0, "time": 1696334400000},
                         {"$": 1030.0, "time": 1696348800000},
                         {"$": 1030.0, "time": 1696363200000},
-                        {"$": 1025.0, "time": 1696377600000},
+                        {"$": 1030.0, "time": 1696377600000},
                     ],
                     "success": True,
                 },
@@ -643,8 +643,8 @@ class TestDashboardService:
                 '/1?maxItems=16',
                 {
                     "data": [
-                        {"$": 1011.25, "time": 1696161600000},
-                        {"$": 1026.25, "time": 1696176000000},
+                        {"$": 1011.7, "time": 1696161600000},
+                        {"$": 1022.5, "time": 1696176000000},
                         {"$": 1030.0, "time": 1696190400000},
                         {"$": 1030.0, "time": 1696204800000},
                         {"$": 1030.0, "time": 1696219200000},
@@ -658,7 +658,7 @@ class TestDashboardService:
                         {"$": 1030.0, "time": 1696334400000},
                         {"$": 1030.0, "time": 1696348800000},
                         {"$": 1030.0, "time": 1696363200000},
-                        {"$": 1025.0, "time": 1696377600000},
+                        {"$": 1030.0, "time": 1696377600000},
                     ],
                     "success": True,
                 },
@@ -674,16 +674,16 @@ class TestDashboardService:
                 {
                     "data": {
                         "live": [
-                            {"$": 1022.5, "time": 1696118400000},
+                            {"$": 1017.9, "time": 1696118400000},
                             {"$": 1030.0, "time": 1696204800000},
                             {"$": 1030.0, "time": 1696291200000},
-                            {"$": 1025.0, "time": 1696377600000},
+                            {"$": 1030.0, "time": 1696377600000},
                         ],
                         "testnet": [
-                            {"$": 1022.5, "time": 1696118400000},
+                            {"$": 1017.9, "time": 1696118400000},
                             {"$": 1030.0, "time": 1696204800000},
                             {"$": 1030.0, "time": 1696291200000},
-                            {"$": 1025.0, "time": 1696377600000},
+                            {"$": 1030.0, "time": 1696377600000},
                         ],
                     },
                     "success": True,
@@ -695,16 +695,16 @@ class TestDashboardService:
                 {
                     "data": {
                         "live": [
-                            {"$": 1022.5, "time": 1696118400000},
+                            {"$": 1017.9, "time": 1696118400000},
                             {"$": 1030.0, "time": 1696204800000},
                             {"$": 1030.0, "time": 1696291200000},
-                            {"$": 1025.0, "time": 1696377600000},
+                            {"$": 1030.0, "time": 1696377600000},
                         ],
                         "testnet": [
-                            {"$": 1022.5, "time": 1696118400000},
+                            {"$": 1017.9, "time": 1696118400000},
                             {"$": 1030.0, "time": 1696204800000},
                             {"$": 1030.0, "time": 1696291200000},
-                            {"$": 1025.0, "time": 1696377600000},
+                            {"$": 1030.0, "time": 1696377600000},
                         ],
                     },
                     "success": True,
@@ -730,6 +730,20 @@ class TestDashboardService:
 
         assert res.json == jsonify(response).json
 
+    def test_pipeline_equity_shows_the_latest_reading(self, client, patch_datetime_now, create_pipeline):
+        for time, value in [
+            (datetime.datetime(2023, 10, 3, 20, 0, tzinfo=pytz.utc), 900),
+            (datetime.datetime(2023, 10, 3, 23, 40, tzinfo=pytz.utc), 1000),
+            (datetime.datetime(2023, 10, 3, 23, 50, tzinfo=pytz.utc), 1100),
+        ]:
+            update_rollups([PortfolioTimeSeries.objects.create(pipeline_id=1, time=time, value=value)])
+
+        res = client.get(f'{API_PREFIX}/pipeline-equity/1?maxItems=16')
+
+        # hourly buckets up to now: the empty ones repeat the last reading
+        # before them, and the series ends on the latest one
+        assert [point["$"] for point in res.json["data"]] == [900, 900, 900, 1050, 1100]
+
 
 class TestAlertsEndpoints:
 
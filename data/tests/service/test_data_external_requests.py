@@ -138,6 +138,32 @@ class TestDataExternalRequests:
             timeout=(5, 30)
         )
 
+    def test_get_strategies_revalidates_with_etag(
+        self,
+        mocker,
+        mock_settings_env_vars,
+        mock_redis_connection_external_requests
+    ):
+        import data.service.external_requests as external_requests
+
+        strategies = {"Momentum": {"className": "Momentum"}}
+
+        mocker.patch.dict(external_requests._strategies, {"etag": None, "response": None})
+        mock_get = mocker.patch.object(
+            requests.Session,
+            "get",
+            side_effect=[
+                mocker.MagicMock(status_code=200, ok=True, headers={"ETag": '"v1"'}, json=lambda: strategies),
+                mocker.MagicMock(status_code=304, ok=False, headers={"ETag": '"v1"'}),
+            ]
+        )
+
+        assert get_strategies() == strategies
+        assert get_strategies() == strategies
+
+        assert "If-None-Match" not in mock_get.call_args_list[0].kwargs["headers"]
+        assert mock_get.call_args_list[1].kwargs["headers"]["If-None-Match"] == '"v1"'
+
     def test_get_price(
         self,
         mock_settings_env_vars,
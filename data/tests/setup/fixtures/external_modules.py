@@ -46,7 +46,7 @@ def mock_binance_client_ping(mocker):
 
 @pytest.fixture
 def mock_binance_threaded_websocket(mocker):
-    mocker.patch.object(ThreadedWebsocketManager, "__init__", lambda self, api_key, api_secret: None)
+    mocker.patch.object(ThreadedWebsocketManager, "__init__", lambda self, *args, **kwargs: None)
 
 
 @pytest.fixture
@@ -9,6 +9,7 @@ from django.db import InterfaceError
 import data
 from data.service.helpers.exceptions import PipelineStartFail, DataPipelineCouldNotBeStopped
 from data.sources.binance import BinanceDataHandler
+from data.sources.binance._stream_hub import StreamHub
 from data.tests.setup.test_data.sample_data import mock_websocket_raw_data_5m, mock_websocket_raw_data_1h, STRATEGIES
 from database.model.models import Pipeline
 
@@ -47,26 +48,48 @@ def trigger_signal_spy(mocker):
     return mocker.spy(data.sources.binance._binance, 'trigger_signal')
 
 
-def double_callback(callback, mock_row):
-    callback(mock_row[0])
-    callback(mock_row[1])
+def double_callback(callback, mock_row, streams):
+    for row in mock_row[:2]:
+        if row["stream"] in streams:
+            callback(row)
 
 
 def mock_start_multiplex_socket(self, callback, streams):
-    double_callback(callback, mock_websocket_raw_data_5m)
-    double_callback(callback, mock_websocket_raw_data_1h)
+    double_callback(callback, mock_websocket_raw_data_5m, streams)
+    double_callback(callback, mock_websocket_raw_data_1h, streams)
 
     return f"streams={'/'.join(streams)}"
 
 
 @pytest.fixture
 def mock_binance_handler_websocket(mocker):
-    mocker.patch.object(BinanceDataHandler, "start_multiplex_socket", mock_start_multiplex_socket)
+    mocker.patch.object(StreamHub, "start_multiplex_socket", mock_start_multiplex_socket)
 
 
 @pytest.fixture
 def mock_binance_websocket_start(mocker):
-    mocker.patch.object(BinanceDataHandler, "start", lambda self: None)
+    # every test gets a fresh stream hub, without starting its thread
+    mocker.patch.object(data.sources.binance._stream_hub, "_hub", None)
+    mocker.patch.object(StreamHub, "start", lambda self: None)
+
+
+@pytest.fixture
+def mock_signal_dispatcher_submit(mocker):
+    mocker.patch.object(
+        data.sources.binance._binance.signal_dispatcher,
+        "submit",
+        lambda pipeline_id, fn, *args, **kwargs: fn(*args, **kwargs)
+    )
+
+
+@pytest.fixture
+def mock_signal_batcher_trigger(mocker):
+    # resolve batched requests one by one through the (mockable) trigger_signal
+    mocker.patch.object(
+        data.sources.binance._binance.signal_batcher,
+        "trigger",
+        lambda key, pipeline_id, header='': data.sources.binance._binance.trigger_signal(pipeline_id, header=header)
+    )
 
 
 @pytest.fixture
@@ -230,6 +253,13 @@ def mock_generate_signal(mocker):
     )
 
 
+@pytest.fixture
+def mock_generate_signals(mocker):
+    return mocker.patch(
+        'data.sources._signal_triggerer.generate_signals',
+    )
+
+
 @pytest.fixture
 def mock_wait_for_job_conclusion(mocker):
     return mocker.patch(
@@ -25,6 +25,8 @@ def common_fixture(
     mock_binance_websocket_start,
     mock_binance_websocket_stop,
     mock_binance_threaded_websocket,
+    mock_signal_dispatcher_submit,
+    mock_signal_batcher_trigger,
     # exchange_data,
     populate_structured_data,
     mock_redis_connection_binance,
@@ -46,8 +48,7 @@ class TestBinanceDataHandler:
                 },
                 {
                     "expected_number_objs_structured": 3,
-                    "expected_number_objs_exchange": 14,
-                    "expected_times_called": 2
+                    "expected_number_objs_exchange": 14
                 },
                 id="1hNoPipelineID",
             ),
@@ -59,8 +60,7 @@ class TestBinanceDataHandler:
                 },
                 {
                     "expected_number_objs_structured": 3,
-                    "expected_number_objs_exchange": 14,
-                    "expected_times_called": 2
+                    "expected_number_objs_exchange": 14
                 },
                 id="1hWithPipelineID",
             ),
@@ -71,8 +71,7 @@ class TestBinanceDataHandler:
                 },
                 {
                     "expected_number_objs_structured": 16,
-                    "expected_number_objs_exchange": 14,
-                    "expected_times_called": 2
+                    "expected_number_objs_exchange": 14
                 },
                 id="5mNoPipelineID",
             ),
@@ -84,8 +83,7 @@ class TestBinanceDataHandler:
                 },
                 {
                     "expected_number_objs_structured": 16,
-                    "expected_number_objs_exchange": 14,
-                    "expected_times_called": 2
+                    "expected_number_objs_exchange": 14
                 },
                 id="5mWithPipelineID",
             ),
@@ -123,7 +121,10 @@ class TestBinanceDataHandler:
             pipeline_id = None
 
         assert trigger_signal_spy.call_args_list[-1][0] == (pipeline_id,)
-        assert spy_binance_handler_klines.call_count == output["expected_times_called"]
+        # every batch window is requested exactly once
+        window_starts = [call.args[3] for call in spy_binance_handler_klines.call_args_list]
+        assert len(window_starts) > 0
+        assert len(window_starts) == len(set(window_starts))
 
         binance_data_handler.stop_data_ingestion()
 
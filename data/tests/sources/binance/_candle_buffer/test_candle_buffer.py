@@ -0,0 +1,74 @@
+import pandas as pd
+import pytest
+
+with pytest.MonkeyPatch().context() as ctx:
+    ctx.setenv("TEST", True)
+    from data.sources.binance import CandleBuffer
+
+
+FIVE_MINUTES = 5 * 60 * 1000
+
+
+def kline(open_time, close=1.0):
+    return {
+        "t": open_time,
+        "T": open_time + FIVE_MINUTES - 1,
+        "o": "1.0",
+        "c": str(close),
+        "h": "2.0",
+        "l": "0.5",
+        "v": "10.0",
+        "n": 5,
+        "q": "100.0",
+        "V": "4.0",
+        "Q": "40.0",
+    }
+
+
+class TestCandleBuffer:
+
+    def test_update_in_place_until_bucket_rolls_over(self):
+        buffer = CandleBuffer("5m", capacity=3)
+
+        assert buffer.update(kline(1693576800000, close=1.0)) is None
+        assert buffer.update(kline(1693576800000, close=1.5)) is None
+        assert len(buffer) == 1
+
+        closed_candle = buffer.update(kline(1693576800000 + FIVE_MINUTES, close=3.0))
+
+        assert len(closed_candle) == 1
+        assert closed_candle["open_time"][0] == pd.Timestamp(1693576800000, unit="ms", tz="UTC")
+        assert closed_candle["close"][0] == 1.5
+        assert closed_candle["trades"][0] == 5
+
+    def test_late_kline_is_ignored(self):
+        buffer = CandleBuffer("5m", capacity=3)
+
+        buffer.update(kline(1693576800000 + FIVE_MINUTES, close=2.0))
+
+        assert buffer.update(kline(1693576800000, close=9.0)) is None
+        assert buffer.to_frame()["close"].tolist() == [2.0]
+
+    def test_klines_are_bucketed_by_candle_size(self):
+        buffer = CandleBuffer("1h", capacity=3)
+
+        assert buffer.update(kline(1693576800000)) is None
+        assert buffer.update(kline(1693576800000 + FIVE_MINUTES)) is None
+
+        assert len(buffer) == 1
+
+    def test_capacity_is_bounded(self):
+        buffer = CandleBuffer("5m", capacity=3)
+
+        for i in range(10):
+            buffer.update(kline(1693576800000 + i * FIVE_MINUTES, close=float(i)))
+
+        data = buffer.to_frame()
+
+        assert len(buffer) == 3
+        assert data["close"].tolist() == [7.0, 8.0, 9.0]
+        assert data.index.is_monotonic_increasing
+
+    def test_invalid_candle_size(self):
+        with pytest.raises(ValueError):
+            CandleBuffer("3m")
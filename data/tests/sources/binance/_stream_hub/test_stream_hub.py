@@ -0,0 +1,77 @@
+from unittest.mock import MagicMock
+
+import pytest
+from binance import ThreadedWebsocketManager
+
+with pytest.MonkeyPatch().context() as ctx:
+    ctx.setenv("TEST", True)
+    from data.sources.binance._stream_hub import StreamHub
+
+
+@pytest.fixture
+def hub(mocker):
+    mocker.patch.object(ThreadedWebsocketManager, "__init__", lambda self, *args, **kwargs: None)
+    mocker.patch.object(StreamHub, "start_multiplex_socket", lambda self, callback, streams: streams[0])
+    mocker.patch.object(StreamHub, "stop_socket")
+
+    return StreamHub()
+
+
+def message(stream):
+    return {"stream": stream, "data": {"k": {}}}
+
+
+class TestStreamHub:
+
+    def test_streams_are_shared_between_subscribers(self, hub, mocker):
+        open_socket = mocker.spy(StreamHub, "start_multiplex_socket")
+
+        callback_1, callback_2 = MagicMock(), MagicMock()
+
+        hub.subscribe(1, ["btcusdt@kline_5m", "btcusdt@kline_1h"], callback_1)
+        hub.subscribe(2, ["btcusdt@kline_5m", "btcusdt@kline_5m"], callback_2)
+
+        assert open_socket.call_count == 2
+        assert hub.subscriber_count("btcusdt@kline_5m") == 2
+
+        hub._dispatch(message("btcusdt@kline_5m"))
+        hub._dispatch(message("btcusdt@kline_1h"))
+
+        assert callback_1.call_count == 2
+        assert callback_2.call_count == 1
+
+    def test_socket_closed_with_last_subscriber(self, hub):
+        hub.subscribe(1, ["btcusdt@kline_5m", "btcusdt@kline_1h"], MagicMock())
+        hub.subscribe(2, ["btcusdt@kline_5m"], MagicMock())
+
+        hub.unsubscribe(1)
+
+        hub.stop_socket.assert_called_once_with("btcusdt@kline_1h")
+        assert hub.subscriber_count("btcusdt@kline_5m") == 1
+
+        hub.unsubscribe(2)
+
+        assert hub.stop_socket.call_count == 2
+        assert hub.subscriber_count("btcusdt@kline_5m") == 0
+
+    def test_failing_subscriber_does_not_block_others(self, hub):
+        callback = MagicMock()
+
+        hub.subscribe(1, ["btcusdt@kline_5m"], MagicMock(side_effect=ValueError))
+        hub.subscribe(2, ["btcusdt@kline_5m"], callback)
+
+        hub._dispatch(message("btcusdt@kline_5m"))
+
+        callback.assert_called_once()
+
+    def test_load_once_per_candle(self, hub):
+        load = MagicMock(return_value=1)
+
+        assert hub.load_once("btcusdt@kline_5m", "ExchangeData", 1, load) == 1
+        assert hub.load_once("btcusdt@kline_5m", "ExchangeData", 1, load) == 1
+        assert load.call_count == 1
+
+        hub.load_once("btcusdt@kline_5m", "StructuredData", 1, load)
+        hub.load_once("btcusdt@kline_5m", "ExchangeData", 2, load)
+
+        assert load.call_count == 3
@@ -2,4 +2,7 @@ import pandas as pd
 
 from data.tests.setup.test_data.sample_data import processed_historical_data_5m_2
 
-expected_value = pd.DataFrame(processed_historical_data_5m_2)
+expected_value = pd.DataFrame(processed_historical_data_5m_2).astype({
+    "open_time": "datetime64[ms, UTC]",
+    "close_time": "datetime64[ms, UTC]",
+})
@@ -0,0 +1,137 @@
+import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+import pytz
+from binance.exceptions import BinanceAPIException
+
+with pytest.MonkeyPatch().context() as ctx:
+    ctx.setenv("TEST", True)
+    import data.sources.binance.extract._backfill as backfill
+    import data.sources.binance.extract._helpers as helpers
+    from data.sources.binance.extract import (
+        fetch_historical_klines,
+        fetch_klines_ranges,
+        get_batch_windows,
+        get_missing_ranges,
+        get_used_weight
+    )
+
+
+START_DATE = datetime.datetime(2023, 9, 1, tzinfo=pytz.utc)
+FIVE_MINUTES = 5 * 60 * 1000
+
+
+def get_klines(symbol, candle_size, start_timestamp, end_timestamp, limit):
+    # one kline per 5 minutes, overlapping the next window by one candle
+    return [
+        [t, "1.0", "2.0", "0.5", "1.5", "10.0", t + FIVE_MINUTES - 1, "100.0", 5, "4.0", "40.0", "0"]
+        for t in range(start_timestamp, end_timestamp + 1, FIVE_MINUTES)
+    ]
+
+
+class TestBackfill:
+
+    def test_get_batch_windows(self):
+        end_date = START_DATE + datetime.timedelta(minutes=5 * 25)
+
+        windows = get_batch_windows(START_DATE, end_date, "5m", 10)
+
+        assert windows == [START_DATE + datetime.timedelta(minutes=50 * i) for i in range(3)]
+
+    def test_fetch_historical_klines_is_sorted_and_deduplicated(self):
+        end_date = START_DATE + datetime.timedelta(minutes=5 * 25)
+
+        data = fetch_historical_klines(get_klines, "BTCUSDT", "5m", START_DATE, end_date=end_date, batch_size=10)
+
+        assert len(data) == 26
+        assert data["open_time"].is_monotonic_increasing
+        assert data["open_time"].is_unique
+
+    def test_requests_wait_for_the_weight_to_reset(self, mocker):
+        sleep = mocker.patch.object(backfill.time, "sleep")
+
+        used_weight = iter([5000, 10])
+
+        data = fetch_historical_klines(
+            get_klines,
+            "BTCUSDT",
+            "5m",
+            START_DATE,
+            end_date=START_DATE + datetime.timedelta(minutes=5),
+            max_weight=4800,
+            get_weight=lambda: next(used_weight)
+        )
+
+        assert len(data) == 2
+        assert sleep.call_count == 1
+
+    def test_rate_limited_window_is_retried(self, mocker):
+        sleep = mocker.patch.object(backfill.time, "sleep")
+
+        response = MagicMock(status_code=429, headers={"Retry-After": "7"}, text="")
+        get_klines_method = MagicMock(side_effect=[BinanceAPIException(response, 429, ""), get_klines(
+            "BTCUSDT", "5m", int(START_DATE.timestamp() * 1000), int(START_DATE.timestamp() * 1000), 1000
+        )])
+
+        data = fetch_historical_klines(get_klines_method, "BTCUSDT", "5m", START_DATE, end_date=START_DATE)
+
+        assert len(data) == 1
+        sleep.assert_called_once_with(7)
+
+    def test_get_used_weight(self):
+        client = SimpleNamespace(response=SimpleNamespace(headers={"x-mbx-used-weight-1m": "1200"}))
+
+        assert get_used_weight(client) == 1200
+        assert get_used_weight(SimpleNamespace()) == 0
+
+    def test_fetch_klines_ranges_only_requests_the_gaps(self):
+        get_klines_method = MagicMock(side_effect=get_klines)
+
+        ranges = [
+            (START_DATE, START_DATE + datetime.timedelta(minutes=10)),
+            (START_DATE + datetime.timedelta(days=7), START_DATE + datetime.timedelta(days=7, minutes=5)),
+        ]
+
+        data = fetch_klines_ranges(get_klines_method, "BTCUSDT", "5m", ranges)
+
+        assert get_klines_method.call_count == 2
+        assert len(data) == 5
+
+
+class TestMissingRanges:
+
+    @pytest.fixture
+    def mock_missing_dates(self, mocker):
+        def mock(missing_dates):
+            mocker.patch.object(helpers, "get_missing_dates", lambda start_date, symbol, end_date: missing_dates)
+        return mock
+
+    def test_gaps_are_collapsed_into_ranges(self, mock_missing_dates):
+        mock_missing_dates(pd.DatetimeIndex([
+            "2023-09-01 00:00", "2023-09-01 00:05", "2023-09-01 00:10",
+            "2023-09-01 01:00",
+            "2023-09-02 00:00", "2023-09-02 00:05",
+        ], tz="UTC"))
+
+        ranges = get_missing_ranges(START_DATE, "BTCUSDT", end_date="2023-09-03")
+
+        assert ranges == [
+            (pd.Timestamp("2023-09-01 00:00", tz="UTC"), pd.Timestamp("2023-09-01 00:10", tz="UTC")),
+            (pd.Timestamp("2023-09-01 01:00", tz="UTC"), pd.Timestamp("2023-09-01 01:00", tz="UTC")),
+            (pd.Timestamp("2023-09-02 00:00", tz="UTC"), pd.Timestamp("2023-09-02 00:05", tz="UTC")),
+        ]
+
+    def test_trailing_gap_is_open_ended(self, mock_missing_dates):
+        now = helpers.convert_date(None)
+
+        mock_missing_dates(pd.date_range(now - pd.Timedelta("15m"), now, freq="5min"))
+
+        assert get_missing_ranges(START_DATE, "BTCUSDT") == [(now - pd.Timedelta("15m"), None)]
+
+    def test_no_gaps(self, mock_missing_dates):
+        mock_missing_dates(pd.DatetimeIndex([], tz="UTC"))
+
+        assert get_missing_ranges(START_DATE, "BTCUSDT") == []
@@ -1,6 +1,7 @@
 from shared.utils.tests.fixtures.models import *
 from shared.utils.tests.test_setup import get_fixtures
 from data.sources.binance.extract import extract_data
+import shared.exchanges.binance.constants as const
 from data.tests.setup.fixtures.external_modules import mock_get_historical_klines_generator
 
 current_path = os.path.dirname(os.path.realpath(__file__))
@@ -30,3 +31,17 @@ class TestBinanceExtract:
         )
 
         assert extract_data(**params_dict).equals(fixture["out"]["expected_value"])
+
+    def test_extract_data_empty_batch(self):
+
+        params_dict = dict(
+            get_klines_method=lambda symbol, candle_size, start_date, end_date, limit: [],
+            symbol="BTCUSDT",
+            candle_size="5m",
+            start_date=datetime.datetime(2023, 9, 1).replace(tzinfo=pytz.utc)
+        )
+
+        data = extract_data(**params_dict)
+
+        assert len(data) == 0
+        assert list(data.columns) == list(const.BINANCE_KEY)
@@ -2,6 +2,7 @@ import os
 
 import pandas as pd
 
+import data.sources.binance.load._load as load_module
 from data.sources.binance.load import load_data
 from data.tests.setup.test_data.sample_data import (
     exchange_data_1, exchange_data_2, exchange_data_3,
@@ -58,3 +59,39 @@ class TestBinanceLoad:
         # only the 2 new rows count; the duplicate is left untouched
         assert new_entries == 2
         assert ExchangeData.objects.count() == 3
+
+    @pytest.mark.parametrize(
+        "update_duplicate,on_conflict",
+        [
+            pytest.param(True, "DO UPDATE SET", id="update_duplicate"),
+            pytest.param(False, "DO NOTHING", id="skip_duplicate"),
+        ],
+    )
+    def test_copy_load_on_postgres(self, mocker, create_pipeline, update_duplicate, on_conflict):
+        cursor = mocker.MagicMock(rowcount=2)
+
+        mock_connection = mocker.patch.object(load_module, "connection")
+        mock_connection.vendor = "postgresql"
+        mock_connection.ops.quote_name = lambda name: f'"{name}"'
+        mock_connection.cursor.return_value.__enter__.return_value = cursor
+
+        copied = []
+        cursor.copy_expert.side_effect = lambda sql, buffer: copied.append(buffer.getvalue())
+
+        data = pd.DataFrame([exchange_data_1, exchange_data_2, exchange_data_2])
+
+        new_entries = load_data(ExchangeData, data, pipeline_id=1, update_duplicate=update_duplicate)
+
+        assert new_entries == 2
+
+        # duplicated rows are merged once, integer columns are not written as floats
+        rows = copied[0].splitlines()
+        assert len(rows) == 2
+        assert rows[0].startswith("binance,2023-09-01 10:00:00+00:00,2023-09-01 11:00:00+00:00,BTCUSDT,1h")
+
+        merge_statement = cursor.execute.call_args_list[-1].args[0]
+        assert merge_statement.startswith('INSERT INTO "model_exchangedata"')
+        assert f'ON CONFLICT ("open_time", "exchange_id", "symbol_id", "interval") {on_conflict}' in merge_statement
+
+        # the ORM path is not used
+        assert ExchangeData.objects.count() == 0
@@ -0,0 +1,109 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import data.sources._local_signals as local_signals_module
+from data.sources import LocalSignalGenerator
+from data.sources._signal_triggerer import RESPONSES
+from data.tests.setup.fixtures.internal_modules import mock_redis
+from shared.utils.tests.fixtures.models import *
+
+
+@pytest.fixture
+def generator(mocker):
+    generator = LocalSignalGenerator(max_workers=1)
+
+    # run the "worker processes" as threads, so the worker function can be mocked
+    executor = ThreadPoolExecutor(1)
+    mocker.patch.object(generator, "_get_executor", return_value=executor)
+    mocker.patch.object(local_signals_module, "cache", mock_redis())
+
+    yield generator
+
+    executor.shutdown()
+
+
+@pytest.fixture
+def mock_run_signal_generator(mocker):
+    return mocker.patch.object(local_signals_module, "run_signal_generator")
+
+
+class TestLocalSignalGenerator:
+
+    @pytest.mark.parametrize(
+        "worker_result,expected_value",
+        [
+            pytest.param((True, None), RESPONSES["SUCCESS"], id="success"),
+            pytest.param((False, None), RESPONSES["JOB_FAILED"], id="order-declined"),
+            pytest.param((False, "StaleSignal: stale"), RESPONSES["JOB_FAILED"], id="exception"),
+        ],
+    )
+    def test_trigger(self, worker_result, expected_value, generator, mock_run_signal_generator, create_pipeline):
+        mock_run_signal_generator.return_value = worker_result
+
+        assert generator.trigger(1, header="header") == expected_value
+
+        pipeline_id, enqueued_at, bearer_token, header = mock_run_signal_generator.call_args.args
+
+        assert pipeline_id == 1
+        assert bearer_token == "mock bearer_token"
+        assert header == "header"
+        # stamped at the candle close, for the staleness deadline of the model
+        assert datetime.datetime.fromisoformat(enqueued_at).tzinfo is not None
+
+    def test_trigger_inactive_pipeline(self, generator, mock_run_signal_generator, create_inactive_pipeline):
+        assert generator.trigger(3) == RESPONSES["PIPELINE_NOT_ACTIVE"]
+
+        mock_run_signal_generator.assert_not_called()
+
+
+class TestRunSignalGenerator:
+
+    def test_pipeline_is_passed_to_the_signal_generator(self, mocker, create_pipeline):
+        import model.service  # noqa: F401  the model's import order
+        import model.signal_generation
+
+        mock_signal_generator = mocker.patch.object(model.signal_generation, "signal_generator", return_value=True)
+
+        res = local_signals_module.run_signal_generator(1, "2023-09-01T10:00:00+00:00", "token", "header")
+
+        assert res == (True, None)
+
+        pipeline, bearer_token = mock_signal_generator.call_args.args
+
+        assert pipeline["id"] == 1
+        assert pipeline["symbol"] == "BTCUSDT"
+        assert pipeline["interval"] == "1h"
+        assert pipeline["enqueued_at"] == "2023-09-01T10:00:00+00:00"
+        assert bearer_token == "token"
+
+    @pytest.mark.parametrize("side_effect", [None, ValueError("boom")], ids=["success", "exception"])
+    def test_db_connections_are_recycled_around_each_signal(self, mocker, side_effect, create_pipeline):
+        import model.service  # noqa: F401  the model's import order
+        import model.signal_generation
+        import model.signal_generation._signal_generation as signal_generation
+
+        close_old_connections = mocker.patch.object(local_signals_module, "close_old_connections")
+        mocker.patch.object(
+            model.signal_generation,
+            "signal_generator",
+            side_effect=side_effect or (lambda *args, **kwargs: close_old_connections.assert_called_once()),
+        )
+        mocker.patch.object(signal_generation, "send_alert")
+
+        local_signals_module.run_signal_generator(1, None, "token")
+
+        assert close_old_connections.call_count == 2
+
+    def test_exceptions_are_alerted_and_returned(self, mocker, create_pipeline):
+        import model.service  # noqa: F401  the model's import order
+        import model.signal_generation
+        import model.signal_generation._signal_generation as signal_generation
+
+        mocker.patch.object(model.signal_generation, "signal_generator", side_effect=ValueError("boom"))
+        mock_alert = mocker.patch.object(signal_generation, "send_alert")
+
+        res = local_signals_module.run_signal_generator(1, None, "token")
+
+        assert res == (False, "ValueError: boom")
+        mock_alert.assert_called_once()
@@ -0,0 +1,88 @@
+import threading
+
+import pytest
+
+import data.sources._signal_dispatcher as dispatcher_module
+from data.sources import SignalDispatcher
+
+
+@pytest.fixture
+def mock_send_alert(mocker):
+    return mocker.patch.object(dispatcher_module, "send_alert")
+
+
+@pytest.fixture
+def dispatcher():
+    dispatcher = SignalDispatcher(max_workers=4, max_pending=2)
+    yield dispatcher
+    dispatcher.shutdown()
+
+
+class TestSignalDispatcher:
+
+    def test_requests_of_a_pipeline_run_in_order(self, dispatcher):
+        release = threading.Event()
+        calls = []
+
+        def signal(candle):
+            if candle == 1:
+                release.wait(1)
+            calls.append(candle)
+
+        dispatcher.submit(1, signal, 1)
+        dispatcher.submit(1, signal, 2)
+        # supersedes the still waiting request of candle 2
+        dispatcher.submit(1, signal, 3)
+
+        assert dispatcher.stats()["waiting"] == 1
+
+        release.set()
+        dispatcher.shutdown()
+
+        assert calls == [1, 3]
+
+        stats = dispatcher.stats()
+        assert stats["submitted"] == 3
+        assert stats["completed"] == 2
+        assert stats["superseded"] == 1
+        assert stats["in_flight"] == 0
+
+    def test_pipelines_run_concurrently(self, dispatcher):
+        barrier = threading.Barrier(2, timeout=1)
+
+        dispatcher.submit(1, barrier.wait)
+        dispatcher.submit(2, barrier.wait)
+
+        dispatcher.shutdown()
+
+        assert dispatcher.stats()["completed"] == 2
+
+    def test_requests_are_rejected_when_full(self, dispatcher, mock_send_alert):
+        release = threading.Event()
+
+        assert dispatcher.submit(1, release.wait, 1) is True
+        assert dispatcher.submit(2, release.wait, 1) is True
+        assert dispatcher.submit(3, release.wait, 1) is False
+
+        release.set()
+        dispatcher.shutdown()
+
+        assert dispatcher.stats()["rejected"] == 1
+        mock_send_alert.assert_called_once()
+
+    def test_failed_requests_do_not_block_the_pipeline(self, dispatcher):
+        release = threading.Event()
+        calls = []
+
+        def failing_signal():
+            release.wait(1)
+            raise ValueError("boom")
+
+        dispatcher.submit(1, failing_signal)
+        dispatcher.submit(1, calls.append, 2)
+
+        release.set()
+        dispatcher.shutdown()
+
+        assert calls == [2]
+        assert dispatcher.stats()["failed"] == 1
@@ -1,7 +1,9 @@
+from concurrent.futures import ThreadPoolExecutor
+
 from data.service.external_requests import generate_signal
 from data.service.helpers import MODEL_APP_ENDPOINTS
 from data.sources._signal_triggerer import wait_for_job_conclusion, RESPONSES
-from data.sources import trigger_signal
+from data.sources import trigger_signal, trigger_signals, SignalBatcher
 from shared.utils.tests.fixtures.external_modules import mock_time_sleep
 from shared.utils.tests.fixtures.models import *
 from data.tests.setup.fixtures.internal_modules import *
@@ -115,6 +117,32 @@ class TestExternalRequests:
 
         assert mock_check_job_status_response.call_count == len(side_effects)
 
+    def test_wait_for_job_conclusion_notified(
+        self,
+        mocker,
+        mock_check_job_status_response,
+        mock_redis_connection_external_requests,
+        create_pipeline
+    ):
+        """
+        GIVEN the model worker publishes the job's result
+        WHEN the method wait_for_job_conclusion is called
+        THEN the result is used without polling the job's status
+
+        """
+        mock_wait = mocker.patch(
+            "data.sources._signal_triggerer.wait_for_job_result",
+            side_effect=[None, {"code": "FINISHED", "success": True, "status": "Job finished."}]
+        )
+        mock_check_job_status_response.return_value = {"code": "WAITING", "status": "waiting"}
+
+        res = wait_for_job_conclusion(job_id="abcdef", pipeline_id=1, retry=0)
+
+        assert res == RESPONSES["SUCCESS"]
+
+        assert mock_wait.call_count == 2
+        assert mock_check_job_status_response.call_count == 1
+
     @pytest.mark.parametrize(
         "generate_signal_return_value,wait_for_job_conclusion_return_value,expected_value",
         [
@@ -205,3 +233,121 @@ class TestExternalRequests:
         res = trigger_signal(**params)
 
         assert res == expected_value
+
+    @pytest.mark.parametrize(
+        "check_job_side_effects,expected_value",
+        [
+            pytest.param(
+                [
+                    {"code": "WAITING", "status": "waiting"},
+                    {"code": "FINISHED", "success": {"1": True, "2": False}, "status": "finished"},
+                ],
+                {1: RESPONSES["SUCCESS"], 2: RESPONSES["JOB_FAILED"], 3: RESPONSES["PIPELINE_NOT_ACTIVE"]},
+                id="STATUS_FINISHED",
+            ),
+            pytest.param(
+                [
+                    {"code": "FAILED", "status": "failed"},
+                ],
+                {1: RESPONSES["JOB_FAILED"], 2: RESPONSES["JOB_FAILED"], 3: RESPONSES["PIPELINE_NOT_ACTIVE"]},
+                id="STATUS_FAILED",
+            ),
+        ],
+    )
+    def test_trigger_signals(
+        self,
+        check_job_side_effects,
+        expected_value,
+        mock_generate_signals,
+        mock_check_job_status_response,
+        mock_time_sleep,
+        mock_redis_connection_external_requests,
+        create_pipeline,
+        create_pipeline_2,
+        create_inactive_pipeline
+    ):
+        mock_generate_signals.return_value = {"success": True, "job_ids": {"1": "abcdef", "2": "abcdef"}}
+        mock_check_job_status_response.side_effect = check_job_side_effects
+
+        res = trigger_signals([1, 2, 3])
+
+        assert res == expected_value
+
+        # inactive pipelines are not requested, and the shared job is polled once
+        mock_generate_signals.assert_called_once_with([1, 2])
+        assert mock_check_job_status_response.call_count == len(check_job_side_effects)
+
+    def test_signal_batcher_groups_requests(self, mocker):
+        trigger_signals_mock = mocker.patch(
+            'data.sources._signal_triggerer.trigger_signals',
+            side_effect=lambda pipeline_ids, headers: {
+                pipeline_id: (True, str(pipeline_ids)) for pipeline_id in pipeline_ids
+            }
+        )
+
+        batcher = SignalBatcher(window=0.2)
+
+        for key, pipeline_id in [(("BTCUSDT", "1h"), 1), (("BTCUSDT", "1h"), 2), (("ETHUSDT", "1h"), 3)]:
+            batcher.register(key, pipeline_id)
+
+        with ThreadPoolExecutor(3) as executor:
+            futures = [
+                executor.submit(batcher.trigger, key, pipeline_id)
+                for key, pipeline_id in [(("BTCUSDT", "1h"), 1), (("BTCUSDT", "1h"), 2), (("ETHUSDT", "1h"), 3)]
+            ]
+
+            results = [future.result() for future in futures]
+
+        assert results == [(True, "[1, 2]"), (True, "[1, 2]"), (True, "[3]")]
+        assert trigger_signals_mock.call_count == 2
+
+    @pytest.mark.parametrize(
+        "pipelines,requests,expected_batches",
+        [
+            pytest.param([1], [1], [[1]], id="single-pipeline"),
+            pytest.param([1, 2], [1, 2], [[1, 2]], id="all-pipelines-reported"),
+            pytest.param([], [1], [[1]], id="unregistered-pipeline"),
+        ],
+    )
+    def test_signal_batcher_sends_complete_batches_right_away(
+        self, mocker, pipelines, requests, expected_batches
+    ):
+        trigger_signals_mock = mocker.patch(
+            'data.sources._signal_triggerer.trigger_signals',
+            side_effect=lambda pipeline_ids, headers: {pipeline_id: (True, "") for pipeline_id in pipeline_ids}
+        )
+
+        # far longer than the test may take
+        batcher = SignalBatcher(window=60)
+
+        for pipeline_id in pipelines:
+            batcher.register(("BTCUSDT", "1h"), pipeline_id)
+
+        with ThreadPoolExecutor(len(requests)) as executor:
+            futures = [executor.submit(batcher.trigger, ("BTCUSDT", "1h"), pipeline_id) for pipeline_id in requests]
+
+            results = [future.result(timeout=5) for future in futures]
+
+        assert results == [(True, "")] * len(requests)
+        assert [sorted(call.args[0]) for call in trigger_signals_mock.call_args_list] == expected_batches
+
+    def test_signal_batcher_window_bounds_the_wait(self, mocker):
+        trigger_signals_mock = mocker.patch(
+            'data.sources._signal_triggerer.trigger_signals',
+            side_effect=lambda pipeline_ids, headers: {pipeline_id: (True, "") for pipeline_id in pipeline_ids}
+        )
+
+        batcher = SignalBatcher(window=0.1)
+
+        batcher.register(("BTCUSDT", "1h"), 1)
+        batcher.register(("BTCUSDT", "1h"), 2)
+
+        # pipeline 2 never reports
+        assert batcher.trigger(("BTCUSDT", "1h"), 1) == (True, "")
+        trigger_signals_mock.assert_called_once_with([1], headers={1: ""})
+
+        # a stopped pipeline is not waited for
+        batcher.unregister(("BTCUSDT", "1h"), 2)
+
+        with ThreadPoolExecutor(1) as executor:
+            assert executor.submit(batcher.trigger, ("BTCUSDT", "1h"), 1).result(timeout=0.05) == (True, "")
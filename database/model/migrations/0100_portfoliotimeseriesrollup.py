@@ -0,0 +1,67 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:34
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("model", "0099_appsetting"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PortfolioTimeSeriesRollup",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("type", models.TextField(blank=True, default=None, null=True)),
+                ("resolution", models.TextField()),
+                ("time", models.DateTimeField()),
+                ("count", models.IntegerField()),
+                ("total", models.FloatField()),
+                ("last", models.FloatField()),
+                ("last_time", models.DateTimeField()),
+                (
+                    "pipeline",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="model.pipeline",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["pipeline", "resolution", "time"],
+                        name="model_portf_pipelin_f6962d_idx",
+                    ),
+                    models.Index(
+                        fields=["type", "resolution", "time"],
+                        name="model_portf_type_6aac24_idx",
+                    ),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        condition=models.Q(("pipeline__isnull", False)),
+                        fields=("pipeline", "resolution", "time"),
+                        name="unique_pipeline_rollup_bucket",
+                    ),
+                    models.UniqueConstraint(
+                        condition=models.Q(("pipeline__isnull", True)),
+                        fields=("type", "resolution", "time"),
+                        name="unique_account_rollup_bucket",
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+
+import pytz
+from django.db import migrations
+
+
+RESOLUTIONS = {
+    "5m": 300,
+    "1h": 3600,
+    "4h": 14400,
+    "1d": 86400,
+}
+
+
+EPOCH = datetime(1970, 1, 1, tzinfo=pytz.utc)
+
+
+def bucket_start(time, seconds):
+    elapsed = int((time - EPOCH).total_seconds())
+    return EPOCH + timedelta(seconds=elapsed - elapsed % seconds)
+
+
+def build_portfolio_rollups(apps, schema_editor):
+    PortfolioTimeSeries = apps.get_model('model', 'PortfolioTimeSeries')
+    PortfolioTimeSeriesRollup = apps.get_model('model', 'PortfolioTimeSeriesRollup')
+
+    buckets = {}
+
+    snapshots = PortfolioTimeSeries.objects.order_by('time').values_list('pipeline_id', 'type', 'time', 'value')
+
+    for pipeline_id, type_, time, value in snapshots.iterator():
+        # snapshots of deleted pipelines
+        if pipeline_id is None and type_ is None:
+            continue
+
+        # a pipeline has one bucket per resolution and time, whatever the type
+        # of its snapshots
+        if pipeline_id is not None:
+            type_ = None
+
+        for resolution, seconds in RESOLUTIONS.items():
+            key = (pipeline_id, type_, resolution, bucket_start(time, seconds))
+
+            bucket = buckets.get(key)
+
+            if bucket is None:
+                buckets[key] = PortfolioTimeSeriesRollup(
+                    pipeline_id=pipeline_id,
+                    type=type_,
+                    resolution=resolution,
+                    time=key[3],
+                    count=1,
+                    total=value,
+                    last=value,
+                    last_time=time,
+                )
+            else:
+                bucket.count += 1
+                bucket.total += value
+                bucket.last = value
+                bucket.last_time = time
+
+    PortfolioTimeSeriesRollup.objects.bulk_create(buckets.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('model', '0100_portfoliotimeseriesrollup'),
+    ]
+
+    operations = [
+        migrations.RunPython(build_portfolio_rollups, migrations.RunPython.noop)
+    ]
@@ -335,6 +335,45 @@ class PortfolioTimeSeries(models.Model):
     type = models.TextField(null=True, blank=True, default=None)
 
 
+class PortfolioTimeSeriesRollup(models.Model):
+    """PortfolioTimeSeries of a pipeline (or of an account `type`) aggregated
+    into buckets of a fixed resolution, updated as the snapshots are saved."""
+
+    pipeline = models.ForeignKey(Pipeline, on_delete=models.CASCADE, null=True)
+    type = models.TextField(null=True, blank=True, default=None)
+    resolution = models.TextField()
+    time = models.DateTimeField()
+    count = models.IntegerField()
+    total = models.FloatField()
+    last = models.FloatField()
+    last_time = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            # range query of the equity chart:
+            # filter(pipeline | type, resolution, time__gte).order_by('time')
+            models.Index(fields=["pipeline", "resolution", "time"]),
+            models.Index(fields=["type", "resolution", "time"]),
+        ]
+        constraints = [
+            # one bucket per pipeline (or per account when there is no pipeline)
+            models.UniqueConstraint(
+                fields=["pipeline", "resolution", "time"],
+                condition=models.Q(pipeline__isnull=False),
+                name="unique_pipeline_rollup_bucket",
+            ),
+            models.UniqueConstraint(
+                fields=["type", "resolution", "time"],
+                condition=models.Q(pipeline__isnull=True),
+                name="unique_account_rollup_bucket",
+            ),
+        ]
+
+    @property
+    def mean(self):
+        return self.total / self.count
+
+
 class AppSetting(models.Model):
     """Server-side key/value settings editable from the dashboard (e.g. the
     Telegram alert credentials). Environment variables always take
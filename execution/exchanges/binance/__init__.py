@@ -1 +1,3 @@
+from execution.exchanges.binance._bookkeeping_journal import BookkeepingJournal
+from execution.exchanges.binance._market_cache import MarketCache
 from execution.exchanges.binance._trading import BinanceTrader
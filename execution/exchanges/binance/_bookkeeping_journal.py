@@ -0,0 +1,247 @@
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+import django
+from django.db import DatabaseError, close_old_connections, transaction
+
+from shared.utils.events import publish_pipeline_event, EVENT_DEACTIVATED
+from shared.utils.notifier import send_alert
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "database.settings")
+django.setup()
+
+from database.model.models import AppSetting, Pipeline
+
+
+# back-off between attempts to apply an entry while the database is unavailable
+MAX_RETRY_DELAY = 60
+
+
+class BookkeepingJournal:
+    """
+    Write-ahead journal of the bookkeeping of a trader, applied to the database
+    by a background writer thread (BOOKKEEPING_MODE=async).
+
+    Once an order is filled, the trader appends its bookkeeping writes to the
+    journal, an append-only file that is fsynced before `append` returns, and
+    applies the new state to memory right away: the order request does not wait
+    on the database. The writer thread applies the entries in order, each in
+    its own transaction together with the sequence number of the last applied
+    entry (an AppSetting row), so an entry is applied all-or-nothing and
+    exactly once.
+
+    While the database is unavailable, the writer retries the entry at the head
+    of the journal with back-off: later entries wait behind it, and nothing is
+    lost if the process dies in the meantime. On startup, `recover` replays the
+    entries that were journaled but not applied.
+
+    Parameters
+    ----------
+    path : str
+        The journal file.
+    name : str
+        Name of the journal, used for the applied sequence number and in alerts.
+    apply : callable
+        apply(op, entry) performs the writes of an entry. It is called inside a
+        transaction.
+    """
+
+    def __init__(self, path, name, apply):
+        self.path = path
+        self.name = name
+        self.apply = apply
+
+        self._marker_key = f"bookkeeping_journal:{name}"
+
+        self._lock = threading.Lock()
+        self._drained = threading.Condition(self._lock)
+        self._queue = queue.Queue()
+        self._pending = 0
+        self._seq = None
+
+        self._file = None
+        self._writer = None
+
+    @property
+    def pending(self):
+        """Number of journaled entries not yet applied."""
+        with self._lock:
+            return self._pending
+
+    def append(self, op, entry):
+        """
+        Durably journals a bookkeeping operation and queues it for the writer.
+
+        Raises
+        ------
+        OSError
+            If the entry could not be written to the journal.
+        """
+        with self._lock:
+            if self._seq is None:
+                self._seq = self._get_applied_seq()
+
+            seq = self._seq + 1
+
+            self._open().write(json.dumps({"seq": seq, "op": op, "entry": entry}) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+            self._seq = seq
+            self._pending += 1
+
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run, name=f"bookkeeping-{self.name}", daemon=True)
+                self._writer.start()
+
+        self._queue.put((seq, op, entry))
+
+    def recover(self):
+        """
+        Applies the entries of the journal file that were not applied before the
+        process stopped. Must run before the records are read at startup.
+
+        Returns
+        -------
+        int
+            The number of replayed entries.
+        """
+        applied = self._get_applied_seq()
+        entries = []
+
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # a torn last line: the process died while appending it,
+                        # before the order request it belongs to returned
+                        logging.warning(f"Bookkeeping journal {self.name}: skipping a partial entry.")
+                        continue
+
+                    if record["seq"] > applied:
+                        entries.append(record)
+
+        for record in entries:
+            self._apply_with_retries(record["seq"], record["op"], record["entry"])
+
+        with self._lock:
+            self._seq = max([applied] + [record["seq"] for record in entries])
+            self._truncate()
+
+        if entries:
+            logging.info(f"Bookkeeping journal {self.name}: replayed {len(entries)} entries.")
+
+        return len(entries)
+
+    def flush(self, timeout=None):
+        """
+        Waits until every journaled entry is applied.
+
+        Returns
+        -------
+        bool
+            False if entries were still pending after `timeout` seconds.
+        """
+        with self._drained:
+            return self._drained.wait_for(lambda: self._pending == 0, timeout=timeout)
+
+    def _run(self):
+        while True:
+            seq, op, entry = self._queue.get()
+
+            self._apply_with_retries(seq, op, entry)
+
+            with self._drained:
+                self._pending -= 1
+
+                # everything journaled is applied: start the file over
+                if self._pending == 0:
+                    self._truncate()
+                    self._drained.notify_all()
+
+    def _apply_with_retries(self, seq, op, entry):
+        attempts = 0
+
+        while True:
+            try:
+                with transaction.atomic():
+                    self.apply(op, entry)
+                    AppSetting.objects.update_or_create(key=self._marker_key, defaults={"value": str(seq)})
+                return
+
+            except DatabaseError as e:
+                attempts += 1
+
+                # the writer thread keeps its connection: drop it if it broke
+                close_old_connections()
+
+                logging.warning(f"Bookkeeping journal {self.name}: entry {seq} failed ({e}). Retrying.")
+
+                if attempts == 2:
+                    send_alert(
+                        title="Bookkeeping delayed - database unavailable",
+                        body=(
+                            f"Journal {self.name}: {op} of pipeline {entry.get('pipeline_id')} could "
+                            f"not be written ({e}). Bookkeeping is journaled and will be applied once "
+                            f"the database is back; {self.pending} entries pending."
+                        ),
+                        severity="warning",
+                        dedup_key=f"bookkeeping-journal-{self.name}",
+                        throttle_seconds=900,
+                    )
+
+                time.sleep(min(2 ** attempts, MAX_RETRY_DELAY))
+
+            except Exception as e:
+                # not transient: retrying would block every later entry.
+                # Freeze the pipeline and skip the entry, as a failed
+                # synchronous bookkeeping would
+                logging.exception(f"Bookkeeping journal {self.name}: entry {seq} cannot be applied: {e!r}")
+
+                send_alert(
+                    title="Bookkeeping failed after exchange fill",
+                    body=(
+                        f"Journal {self.name}: {op} of pipeline {entry.get('pipeline_id')} could not "
+                        f"be applied ({e!r}). The exchange was updated but local records were not - "
+                        f"the pipeline will be deactivated and reconciled at next startup."
+                    ),
+                    severity="critical",
+                    dedup_key=f"bookkeeping-{entry.get('pipeline_id')}",
+                )
+
+                pipeline_id = entry.get("pipeline_id")
+
+                try:
+                    with transaction.atomic():
+                        if pipeline_id is not None:
+                            Pipeline.objects.filter(id=pipeline_id).update(active=False)
+
+                        AppSetting.objects.update_or_create(key=self._marker_key, defaults={"value": str(seq)})
+                except DatabaseError as db_error:
+                    # the entry stays in the journal and is retried at next startup
+                    logging.error(f"Bookkeeping journal {self.name}: could not skip entry {seq} ({db_error}).")
+                    return
+
+                if pipeline_id is not None:
+                    publish_pipeline_event(EVENT_DEACTIVATED, pipeline_id, reason=f"Bookkeeping failed: {e!r}")
+                return
+
+    def _get_applied_seq(self):
+        value = AppSetting.objects.filter(key=self._marker_key).values_list("value", flat=True).first()
+        return int(value) if value else 0
+
+    def _open(self):
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._file = open(self.path, "a")
+
+        return self._file
+
+    def _truncate(self):
+        self._open().truncate(0)
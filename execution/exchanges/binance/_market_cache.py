@@ -0,0 +1,308 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from binance import ThreadedWebsocketManager
+
+# symbol precisions practically never change: re-read them once an hour
+SYMBOL_INFO_TTL = 3600
+
+# orders of the user data stream kept for lookups (the oldest are dropped first)
+MAX_TRACKED_ORDERS = 1000
+
+FINAL_ORDER_STATUSES = {"FILLED", "CANCELED", "EXPIRED", "REJECTED"}
+
+
+class MarketCache:
+    """
+    In-memory exchange metadata, mark prices, positions and orders of a Binance
+    Futures account, so that placing an order does not wait on lookups.
+
+    Symbol info is read from the database and kept for SYMBOL_INFO_TTL. Mark
+    prices are fed by the exchange's mark price stream, positions and orders
+    by the account's user data stream (ACCOUNT_UPDATE and ORDER_TRADE_UPDATE
+    events). A price or position older than its TTL (e.g. while the streams
+    are down, or before they have sent anything for a symbol) is fetched over
+    REST instead, and cached in turn. Orders are only tracked while the user
+    data stream is up: callers fall back to the REST order endpoints when an
+    order is not in the book.
+
+    The user data stream is considered up once it has delivered an event, for
+    as long as events or keepalives keep arriving within
+    `user_stream_timeout`: an account without activity only sends events when
+    it trades, so the stream's listen key is kept alive over REST.
+
+    Parameters
+    ----------
+    client : BinanceHandler
+        The client of the account, used for the REST fallbacks.
+    mark_price_ttl : int
+        Seconds a mark price is used for.
+    position_ttl : int
+        Seconds a position is used for.
+    user_stream_timeout : int
+        Seconds without events or keepalives after which the user data stream
+        is considered down.
+    """
+
+    def __init__(self, client, mark_price_ttl, position_ttl, user_stream_timeout):
+        self.client = client
+        self.mark_price_ttl = mark_price_ttl
+        self.position_ttl = position_ttl
+        self.user_stream_timeout = user_stream_timeout
+
+        self._symbols = {}
+        self._prices = {}
+        self._positions = {}
+        self._orders = OrderedDict()
+        self._lock = threading.Lock()
+        self._order_updated = threading.Condition(self._lock)
+
+        self._streams = None
+        self._streams_stopped = threading.Event()
+        # time.monotonic() of the last event or keepalive of the user data
+        # stream, None until it delivers an event (again, after an error)
+        self._user_stream_seen = None
+
+    @property
+    def streaming(self):
+        """Whether the user data stream is up, i.e. order updates are received."""
+        seen = self._user_stream_seen
+
+        return (
+            self._streams is not None
+            and seen is not None
+            and time.monotonic() - seen < self.user_stream_timeout
+        )
+
+    def get_symbol_info(self, symbol):
+        """
+        Base and quote assets, price and quantity precision of a symbol.
+
+        Raises
+        ------
+        SymbolInvalid
+            If the symbol does not exist.
+        """
+        info = self._get_fresh(self._symbols, symbol, SYMBOL_INFO_TTL)
+
+        if info is None:
+            symbol_obj = self.client.validate_symbol(symbol)
+
+            info = {
+                "base": symbol_obj.base,
+                "quote": symbol_obj.quote,
+                "price_precision": symbol_obj.price_precision,
+                "quantity_precision": symbol_obj.quantity_precision
+            }
+
+            self._set(self._symbols, symbol, info)
+
+        return info
+
+    def get_mark_price(self, symbol):
+        """
+        The latest mark price of a symbol, or its last traded price over REST
+        if no recent mark price was received.
+        """
+        price = self._get_fresh(self._prices, symbol, self.mark_price_ttl)
+
+        if price is None:
+            price = float(self.client.futures_symbol_ticker(symbol=symbol)['price'])
+
+            self._set(self._prices, symbol, price)
+
+        return price
+
+    def get_position_amt(self, symbol):
+        """
+        The position amount of the account on a symbol, or None if the exchange
+        does not list the symbol.
+        """
+        units = self._get_fresh(self._positions, symbol, self.position_ttl)
+
+        if units is None:
+            units = next(
+                (
+                    float(position["positionAmt"])
+                    for position in self.client.futures_position_information(symbol=symbol)
+                    if position["symbol"] == symbol
+                ),
+                None
+            )
+
+            if units is not None:
+                self._set(self._positions, symbol, units)
+
+        return units
+
+    def invalidate_position(self, symbol, older_than=None):
+        """
+        Drops the cached position of a symbol, e.g. after placing an order on
+        it: it is read again from the stream's next update, or over REST.
+
+        Parameters
+        ----------
+        symbol : str
+        older_than : float, optional
+            time.monotonic() timestamp. If given, a position received at or
+            after it is kept, since it already reflects the order.
+        """
+        with self._lock:
+            entry = self._positions.get(symbol)
+
+            if entry is not None and (older_than is None or entry[1] < older_than):
+                del self._positions[symbol]
+
+    def get_order(self, client_order_id):
+        """
+        The latest state of an order received on the user data stream, in the
+        format of the REST order endpoints, or None if it was not received.
+        """
+        with self._lock:
+            return self._orders.get(client_order_id)
+
+    def wait_for_order(self, client_order_id, timeout):
+        """
+        Waits until the user data stream reports an order as filled (or
+        otherwise final) and returns it, in the format of the REST order
+        endpoints.
+
+        Returns
+        -------
+        dict or None
+            None if the order was not final after `timeout` seconds.
+        """
+        with self._order_updated:
+            self._order_updated.wait_for(
+                lambda: self._orders.get(client_order_id, {}).get("status") in FINAL_ORDER_STATUSES,
+                timeout=timeout
+            )
+
+            order = self._orders.get(client_order_id)
+
+        return order if order is not None and order["status"] in FINAL_ORDER_STATUSES else None
+
+    def start_streams(self):
+        """Starts listening to the mark price and user data streams of the account."""
+        if os.getenv('TEST') or self._streams is not None:
+            return
+
+        streams = ThreadedWebsocketManager(
+            self.client.binance_api_key,
+            self.client.binance_api_secret,
+            testnet=self.client.paper_trading
+        )
+        streams.start()
+
+        streams.start_all_mark_price_socket(self._handle_mark_prices)
+        streams.start_futures_user_socket(self._handle_user_event)
+
+        self._streams = streams
+        self._streams_stopped.clear()
+
+        threading.Thread(target=self._keep_user_stream_alive, daemon=True).start()
+
+    def stop_streams(self):
+        if self._streams is not None:
+            self._streams.stop()
+            self._streams = None
+            self._streams_stopped.set()
+            self._user_stream_seen = None
+
+    def _keep_user_stream_alive(self):
+        # well within the timeout, so that one failed keepalive does not
+        # take the stream down
+        while not self._streams_stopped.wait(self.user_stream_timeout / 3):
+            self._send_user_stream_keepalive()
+
+    def _send_user_stream_keepalive(self):
+        # an active listen key is returned and extended, not replaced
+        try:
+            self.client.futures_stream_get_listen_key()
+        except Exception as e:
+            logging.warning(f"User data stream keepalive failed: {e!r}")
+            return
+
+        # a keepalive only extends a stream that has delivered events: after an
+        # error, the socket may be gone for good
+        if self._user_stream_seen is not None:
+            self._user_stream_seen = time.monotonic()
+
+    def _handle_mark_prices(self, msg):
+        data = msg.get("data", msg) if isinstance(msg, dict) else msg
+
+        if not isinstance(data, list):
+            # error messages of the socket manager (e.g. on disconnect): the
+            # prices expire and are read over REST until the stream recovers
+            logging.warning(f"Mark price stream: {data}")
+            return
+
+        now = time.monotonic()
+
+        with self._lock:
+            for update in data:
+                self._prices[update["s"]] = (float(update["p"]), now)
+
+    def _handle_user_event(self, msg):
+        event = msg.get("data", msg)
+
+        if event.get("e") == "error":
+            # updates may be missed from here on: until the stream delivers
+            # again, orders are looked up over REST
+            logging.warning(f"User data stream: {event}")
+            self._user_stream_seen = None
+            return
+
+        self._user_stream_seen = time.monotonic()
+
+        if event.get("e") == "ACCOUNT_UPDATE":
+            now = time.monotonic()
+
+            with self._lock:
+                for position in event["a"].get("P", []):
+                    self._positions[position["s"]] = (float(position["pa"]), now)
+
+        elif event.get("e") == "ORDER_TRADE_UPDATE":
+            order = self._format_order_update(event["o"])
+
+            with self._order_updated:
+                self._orders[order["clientOrderId"]] = order
+                self._orders.move_to_end(order["clientOrderId"])
+
+                while len(self._orders) > MAX_TRACKED_ORDERS:
+                    self._orders.popitem(last=False)
+
+                self._order_updated.notify_all()
+
+    @staticmethod
+    def _format_order_update(update):
+        return {
+            "orderId": update["i"],
+            "clientOrderId": update["c"],
+            "symbol": update["s"],
+            "updateTime": update["T"],
+            "avgPrice": update["ap"],
+            "origQty": update["q"],
+            "executedQty": update["z"],
+            # not part of the event: the fills' quote quantity
+            "cumQuote": str(float(update["ap"]) * float(update["z"])),
+            "status": update["X"],
+            "type": update["o"],
+            "side": update["S"],
+        }
+
+    def _get_fresh(self, entries, key, ttl):
+        with self._lock:
+            entry = entries.get(key)
+
+        if entry is not None and time.monotonic() - entry[1] < ttl:
+            return entry[0]
+
+        return None
+
+    def _set(self, entries, key, value):
+        with self._lock:
+            entries[key] = (value, time.monotonic())
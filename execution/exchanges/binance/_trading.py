@@ -17,10 +17,12 @@ from stratestic.backtesting.helpers.evaluation import (
 )
 from stratestic.backtesting.helpers.evaluation.metrics import exposure_time
 
+from execution.exchanges.binance._bookkeeping_journal import BookkeepingJournal
 from execution.service.helpers.exceptions.bookkeeping_failed import BookkeepingFailed
 from shared.exchanges.binance import BinanceHandler
 from shared.utils.helpers import get_pipeline_data, convert_trade
 from shared.utils.notifier import send_alert
+from shared.utils.settings import settings
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "database.settings")
 django.setup()
@@ -44,6 +46,17 @@ class BinanceTrader(BinanceHandler, Trader):
         self.exchange = "binance"
         self.start_date = {}
 
+        self.journal = None
+
+        if settings.bookkeeping_mode == "async":
+            name = "testnet" if paper_trading else "live"
+
+            self.journal = BookkeepingJournal(
+                os.path.join(settings.bookkeeping_journal_dir, f"{name}.jsonl"),
+                name,
+                self._apply_bookkeeping
+            )
+
     def buy_instrument(self, symbol, date=None, row=None, units=None, amount=None, header='', **kwargs):
         self._execute_order(
             symbol,
@@ -82,49 +95,96 @@ class BinanceTrader(BinanceHandler, Trader):
 
         previous_position = kwargs.pop("previous_position", 0)
 
-        # Trade and Position rows are written in one transaction; the
-        # in-memory position is only updated after the commit so memory
-        # always matches the database.
-        def bookkeeping():
-            with transaction.atomic():
-                new_trade = self._handle_trades(pipeline_id, symbol, previous_position, position)
-
-                if Position.objects.filter(pipeline_id=pipeline_id).exists():
-                    if position == 0:
-                        Position.objects.filter(
-                            pipeline_id=pipeline_id,
-                        ).update(
-                            position=position,
-                            amount=None,
-                            buying_price=None,
-                            open_time=None,
-                        )
-                    else:
-                        if new_trade:
-                            Position.objects.filter(
-                                pipeline_id=pipeline_id,
-                            ).update(
-                                position=position,
-                                open_time=datetime.now(tz=pytz.UTC),
-                                buying_price=new_trade.open_price,
-                                amount=new_trade.amount
-                            )
-                else:
-                    Position.objects.create(
-                        position=position,
+        # the in-memory position is only updated once the Trade and Position
+        # writes are committed (or journaled), so memory never runs behind
+        self._record(
+            "position",
+            dict(symbol=symbol, pipeline_id=pipeline_id, previous_position=previous_position, position=position),
+            detail=f"position change {previous_position} -> {position}"
+        )
+
+        # positions are tracked per pipeline: several pipelines may trade a symbol
+        super()._set_position(pipeline_id, position)
+
+    def _write_position(self, symbol, pipeline_id, previous_position, position):
+        new_trade = self._handle_trades(pipeline_id, symbol, previous_position, position)
+
+        if Position.objects.filter(pipeline_id=pipeline_id).exists():
+            if position == 0:
+                Position.objects.filter(
+                    pipeline_id=pipeline_id,
+                ).update(
+                    position=position,
+                    amount=None,
+                    buying_price=None,
+                    open_time=None,
+                )
+            else:
+                if new_trade:
+                    Position.objects.filter(
                         pipeline_id=pipeline_id,
-                        buying_price=new_trade.open_price if new_trade else None,
-                        amount=new_trade.amount if new_trade else None,
+                    ).update(
+                        position=position,
+                        open_time=datetime.now(tz=pytz.UTC),
+                        buying_price=new_trade.open_price,
+                        amount=new_trade.amount
                     )
+        else:
+            Position.objects.create(
+                position=position,
+                pipeline_id=pipeline_id,
+                buying_price=new_trade.open_price if new_trade else None,
+                amount=new_trade.amount if new_trade else None,
+            )
 
-        self._run_bookkeeping(
-            bookkeeping,
-            pipeline_id=pipeline_id,
-            symbol=symbol,
-            detail=f"position change {previous_position} -> {position}"
-        )
+    def _record(self, op, entry, detail, **context):
+        """
+        Runs the bookkeeping write `_write_<op>(**entry)` after an exchange
+        update, all-or-nothing.
+
+        By default the write runs in a transaction before this returns. With
+        BOOKKEEPING_MODE=async it is appended to the journal instead, and
+        applied in order by the journal's writer thread.
+
+        Parameters
+        ----------
+        op : str
+        entry : dict
+            The arguments of the write. They must serialize to JSON.
+        detail : str
+            Description of the operation, for alerts.
+        context : dict
+            Extra arguments for a synchronous write (e.g. objects already
+            loaded), not journaled.
+        """
+        pipeline_id = entry.get("pipeline_id")
+        symbol = entry.get("symbol") or entry.get("order", {}).get("symbol")
+
+        if self.journal is None:
+            def bookkeeping():
+                with transaction.atomic():
+                    return self._apply_bookkeeping(op, {**entry, **context})
+
+            return self._run_bookkeeping(bookkeeping, pipeline_id=pipeline_id, symbol=symbol, detail=detail)
+
+        try:
+            self.journal.append(op, entry)
+        except (OSError, DatabaseError) as e:
+            send_alert(
+                title="Bookkeeping failed after exchange fill",
+                body=(
+                    f"Pipeline {pipeline_id}, symbol {symbol}: {detail}. "
+                    f"Could not journal the bookkeeping: {e}. The exchange was updated but "
+                    f"local records were not - the pipeline will be deactivated and reconciled "
+                    f"at next startup."
+                ),
+                severity="critical",
+                dedup_key=f"bookkeeping-{pipeline_id}",
+            )
+            raise BookkeepingFailed(pipeline_id, detail) from e
 
-        super()._set_position(symbol, position)
+    def _apply_bookkeeping(self, op, entry):
+        return getattr(self, f"_write_{op}")(**entry)
 
     def _run_bookkeeping(self, operation, pipeline_id, symbol, detail):
         """
@@ -174,8 +234,8 @@ class BinanceTrader(BinanceHandler, Trader):
 
         return formatted_order
 
-    def _get_position(self, symbol):
-        return self.position[symbol]
+    def _get_position(self, pipeline_id):
+        return self.position[pipeline_id]
 
     def _handle_trades(self, pipeline_id, symbol, previous_position, position):
 
@@ -234,13 +294,37 @@ class BinanceTrader(BinanceHandler, Trader):
 
         return df
 
+    def flush_bookkeeping(self):
+        """
+        Waits until the journaled bookkeeping is written (BOOKKEEPING_MODE=async).
+
+        Must be called before the Pipeline, Position or Trade rows are read or
+        written outside the journal: the pending entries hold newer state than
+        the rows, and would overwrite a write made in the meantime.
+        """
+        if self.journal is None:
+            return True
+
+        flushed = self.journal.flush(timeout=settings.bookkeeping_flush_timeout)
+
+        if not flushed:
+            logging.warning(
+                f"{self.journal.pending} bookkeeping entries still pending after "
+                f"{settings.bookkeeping_flush_timeout}s."
+            )
+
+        return flushed
+
     def print_trading_results(self, pipeline_id):
+        # the results are computed from the Trade rows
+        self.flush_bookkeeping()
+
         pipeline = get_pipeline_data(pipeline_id)
 
         # Retrieve trading bot data
         trades = Trade.objects.filter(
             pipeline__id=pipeline_id,
-            open_time__gte=self.start_date[pipeline.symbol],
+            open_time__gte=self.start_date[pipeline_id],
             close_time__isnull=False
         ).order_by('open_time')
 
@@ -253,7 +337,7 @@ class BinanceTrader(BinanceHandler, Trader):
         data = self._process_trading_bot_results(trades)
 
         leverage = pipeline.leverage
-        amount = self.initial_balance[pipeline.symbol]
+        amount = self.initial_balance[pipeline_id]
         results = {}
 
         # Get metrics
@@ -12,22 +12,44 @@ from django.db import transaction
 from requests import ReadTimeout, ConnectionError
 
 from database.model.models import Pipeline
-from execution.exchanges.binance import BinanceTrader
+from execution.exchanges.binance import BinanceTrader, MarketCache
 from execution.service.blueprints.market_data import filter_balances
 from execution.service.cron_jobs.save_pipelines_snapshot import save_pipeline_snapshot
 from execution.service.helpers.exceptions import SymbolAlreadyTraded, SymbolNotBeingTraded, NoUnits, NegativeEquity, \
     InsufficientBalance
+from execution.service.helpers.exceptions.bookkeeping_failed import BookkeepingFailed
 from execution.service.helpers.exceptions.leverage_setting_fail import LeverageSettingFail
 from execution.service.helpers.decorators import handle_order_execution_errors
 from shared.utils.decorators.failed_connection import retry_failed_connection
 from shared.utils.helpers import get_pipeline_data
 from shared.utils.notifier import send_alert
+from shared.utils.settings import settings
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "database.settings")
 django.setup()
 
 
+class _Leg:
+    """One side of a pipeline's trade, in signed units (positive buys)."""
+
+    __slots__ = ("pipeline_id", "units", "reducing", "going")
+
+    def __init__(self, pipeline_id, units, reducing, going):
+        self.pipeline_id = pipeline_id
+        self.units = units
+        self.reducing = reducing
+        self.going = going
+
+
 class BinanceFuturesTrader(BinanceTrader):
+    """
+    Trades Binance Futures on behalf of the pipelines.
+
+    The trading state (units, balance, equity and position) is a sub-ledger per
+    pipeline, keyed by the pipeline id, so several pipelines can hold virtual
+    positions on the same symbol. The exchange position of a symbol is the sum
+    of the units of its pipelines.
+    """
 
     def __init__(self, paper_trading=False):
         """
@@ -42,6 +64,7 @@ class BinanceFuturesTrader(BinanceTrader):
         BinanceTrader.__init__(self, paper_trading)
 
         self.symbols = {}
+        self.pipelines = {}
         self.leverage = {}
         self.position = {}
         self.initial_balance = {}
@@ -49,6 +72,10 @@ class BinanceFuturesTrader(BinanceTrader):
         self.current_equity = {}
         self.units = {}
 
+        self.market_cache = MarketCache(
+            self, settings.mark_price_ttl, settings.position_ttl, settings.user_stream_timeout
+        )
+
         self.open_orders = []
         self.filled_orders = []
         self.conn_key = None
@@ -76,19 +103,25 @@ class BinanceFuturesTrader(BinanceTrader):
         Raises
         ------
         SymbolAlreadyTraded
-            If an attempt is made to start trading a symbol that is already being traded by this instance.
+            If the pipeline is already trading its symbol on this instance. Other pipelines
+            may be trading the same symbol.
         """
+        # the pipeline's row may still have journaled updates pending (e.g. from its last stop)
+        self.flush_bookkeeping()
+
         pipeline = get_pipeline_data(pipeline_id, return_obj=True)
 
         symbol = pipeline.symbol.name
 
-        if symbol in self.symbols:
+        if pipeline.id in self.pipelines:
             raise SymbolAlreadyTraded(symbol)
 
         self._get_symbol_info(symbol)
 
         self._set_leverage(pipeline, symbol, header)
 
+        self.pipelines[pipeline.id] = symbol
+
         self._set_initial_position(symbol, initial_position, header, pipeline_id=pipeline.id, **kwargs)
 
         self._set_initial_balance(symbol, pipeline, header=header)
@@ -96,7 +129,7 @@ class BinanceFuturesTrader(BinanceTrader):
         if initial_position == 0:
             self._check_enough_balance(symbol, pipeline)
 
-        self.start_date[symbol] = datetime.now(tz=pytz.utc)
+        self.start_date[pipeline.id] = datetime.now(tz=pytz.utc)
 
     def stop_symbol_trading(self, pipeline_id, symbol, header='', force=False):
         """
@@ -111,24 +144,30 @@ class BinanceFuturesTrader(BinanceTrader):
         header : str, optional
             A header string for logging purposes. Default is an empty string.
         force : bool, optional
-            If True, forces the closure of any open positions for the symbol. Default is False.
+            If True, closes the units the exchange holds for the symbol beyond the positions of
+            the other pipelines trading it, even if the pipeline is not being traded by this
+            instance. Default is False.
 
         Raises
         ------
         SymbolNotBeingTraded
-            If an attempt is made to stop trading a symbol that is not currently being traded by this instance.
+            If the pipeline is not currently trading the symbol on this instance.
         """
+        self.flush_bookkeeping()
+
         if force:
-            units = self._get_position_amt(symbol)
+            # the exchange position net of the other pipelines' sub-ledgers
+            units = (self._get_position_amt(symbol) or 0) - self._get_symbol_units(symbol, exclude=pipeline_id)
 
             if not units:
-                self._reset_symbol(symbol)
+                self._reset_pipeline(pipeline_id)
                 return
 
-            self.units[symbol] = units
+            self.pipelines[pipeline_id] = symbol
+            self.units[pipeline_id] = units
             self._get_symbol_info(symbol)
         else:
-            if symbol not in self.symbols:
+            if pipeline_id not in self.pipelines:
                 raise SymbolNotBeingTraded(symbol)
 
         logging.info(header + f"Stopping trading for pipeline {pipeline_id}, symbol {symbol}.")
@@ -140,16 +179,278 @@ class BinanceFuturesTrader(BinanceTrader):
         except KeyError:
             logging.info(header + "There's no position to be closed.")
 
-        self._reset_symbol(symbol)
+        self._reset_pipeline(pipeline_id)
+
+    def _reset_pipeline(self, pipeline_id):
+        symbol = self.pipelines.pop(pipeline_id, None)
+
+        if symbol is not None and symbol not in self.pipelines.values():
+            self.symbols.pop(symbol, None)
+
+    def _get_symbol_units(self, symbol, exclude=None):
+        """Sum of the units of the pipelines trading a symbol."""
+        return sum(
+            self.units.get(pipeline_id) or 0
+            for pipeline_id, pipeline_symbol in self.pipelines.items()
+            if pipeline_symbol == symbol and pipeline_id != exclude
+        )
+
+    def trade(self, symbol, signal, date=None, row=None, amount=None, units=None, header='', **kwargs):
+        """
+        Trades a pipeline's signal: closes the pipeline's position if the signal differs from it,
+        then opens the new position.
+
+        Same flow as stratestic's `Trader.trade`, with the state read from the pipeline's
+        sub-ledger rather than by symbol.
+
+        Parameters
+        ----------
+        symbol : str
+            The trading symbol.
+        signal : int
+            The new position of the pipeline: 1 (long), -1 (short) or 0 (neutral).
+        amount : float or str, optional
+            The amount of the order in quote currency, or "all" for the pipeline's whole balance.
+        units : float, optional
+            The number of units to trade, instead of an amount.
+        header : str, optional
+            A header string for logging purposes. Default is an empty string.
+        kwargs : dict
+            Must include 'pipeline_id'.
+        """
+        pipeline_id = kwargs["pipeline_id"]
+
+        position = self._get_position(pipeline_id)
+
+        if signal != position:
+            if position == -1:
+                self.buy_instrument(
+                    symbol, date, row, units=-self.units[pipeline_id], header=header, reducing=True, **kwargs
+                )
+            elif position == 1:
+                self.sell_instrument(
+                    symbol, date, row, units=self.units[pipeline_id], header=header, reducing=True, **kwargs
+                )
+
+            open_position = self.buy_instrument if signal == 1 else self.sell_instrument
+
+            if signal != 0 and units:
+                open_position(symbol, date, row, units=units, header=header, **kwargs)
+            elif signal != 0 and amount:
+                if amount == "all":
+                    amount = self.current_balance[pipeline_id]
+
+                open_position(symbol, date, row, amount=amount, header=header, **kwargs)
+
+        elif kwargs.get("print_results"):
+            verbose_position = "LONG" if position == 1 else "SHORT" if position == -1 else "NEUTRAL"
+
+            logging.info(header + f"Maintaining {verbose_position} position.")
+
+            self.print_current_balance(date, header, symbol=pipeline_id)
+
+        self._set_position(symbol, signal, previous_position=position, **kwargs)
+
+    def trade_pipelines(self, symbol, signals, headers=None):
+        """
+        Trades the signals of several pipelines on a symbol with a single exchange order.
+
+        Each pipeline's trade is planned in its sub-ledger as `trade` would execute it (close
+        the current position, then open the new one with the whole balance), and the legs
+        of all the pipelines are netted into one market order. The fill is then allocated
+        back to the legs: each is booked in its pipeline's sub-ledger at the order's average
+        price, with an Orders row of its own. Opposite legs cross internally, so if they
+        cancel out no order is placed and the legs are booked at the ticker price. If the
+        net order is not filled in full, the shortfall is spread over the legs on its side,
+        and their pipelines book what was filled and return BookkeepingFailed.
+
+        Parameters
+        ----------
+        symbol : str
+            The trading symbol.
+        signals : dict
+            The signal of each pipeline, keyed by the pipeline id.
+        headers : dict, optional
+            Logging prefix of each pipeline, keyed by the pipeline id.
+
+        Returns
+        -------
+        dict
+            The error raised booking each pipeline's legs (NegativeEquity or
+            BookkeepingFailed) or None, keyed by the pipeline id. Errors are returned instead
+            of raised, since the exchange has filled the legs of every pipeline by then.
+
+        Raises
+        ------
+        BinanceAPIException
+            If the exchange rejects the net order, in which case nothing is booked.
+        """
+        headers = headers or {}
+
+        price = self._get_price(symbol)
+
+        pipelines = {pipeline_id: get_pipeline_data(pipeline_id, return_obj=True) for pipeline_id in signals}
+        positions = {pipeline_id: self._get_position(pipeline_id) for pipeline_id in signals}
+
+        legs = []
+        for pipeline_id, signal in signals.items():
+            legs.extend(self._plan_legs(symbol, pipelines[pipeline_id], signal, price))
+
+        net_units = round(sum(leg.units for leg in legs), self.symbols[symbol]["quantity_precision"])
+
+        client_order_id = f"net-{uuid.uuid4().hex}"[:36]
+
+        if net_units:
+            order = self._place_order_idempotent(
+                symbol=symbol,
+                side=self.SIDE_BUY if net_units > 0 else self.SIDE_SELL,
+                type=self.ORDER_TYPE_MARKET,
+                newOrderRespType='RESULT',
+                quantity=abs(net_units),
+                newClientOrderId=client_order_id,
+            )
+        else:
+            order = dict(
+                orderId=client_order_id,
+                updateTime=int(datetime.now(tz=pytz.utc).timestamp() * 1000),
+                avgPrice=price,
+            )
+
+        logging.info(f"{symbol}: netted {len(legs)} orders of {len(signals)} pipelines into {net_units} units.")
+
+        fills = self._get_leg_fills(symbol, legs, net_units, order)
+
+        errors = {}
+        for pipeline_id, signal in signals.items():
+            header = headers.get(pipeline_id, '')
+
+            try:
+                pipeline_legs = [(leg, filled) for leg, filled in zip(legs, fills) if leg.pipeline_id == pipeline_id]
+
+                for n, (leg, filled) in enumerate(pipeline_legs):
+                    if not filled:
+                        continue
+
+                    allocation = self._allocate_fill(symbol, order, client_order_id, leg, n, filled)
+
+                    self._book_order(
+                        symbol,
+                        allocation,
+                        allocation["side"],
+                        leg.going,
+                        pipelines[pipeline_id],
+                        pipeline_id=pipeline_id,
+                        reducing=leg.reducing,
+                        header=header,
+                        detail=f"allocation {allocation['orderId']} ({allocation['side']} {filled} {symbol})"
+                    )
+
+                unfilled = [(leg, filled) for leg, filled in pipeline_legs if filled < abs(leg.units)]
+
+                if unfilled:
+                    # the sub-ledger holds what was filled, but not the position of the signal
+                    raise BookkeepingFailed(
+                        pipeline_id,
+                        f"net order {order['orderId']} ({order.get('status')}) filled "
+                        + ", ".join(f"{filled} of {abs(leg.units)}" for leg, filled in unfilled)
+                        + f" {symbol}"
+                    )
+
+                self._set_position(symbol, signal, previous_position=positions[pipeline_id], pipeline_id=pipeline_id)
 
-    def _reset_symbol(self, symbol):
-        if symbol in self.symbols:
-            self.symbols.pop(symbol)
+                self._check_negative_equity(pipeline_id, reducing=any(leg.reducing for leg, _ in pipeline_legs))
+
+                errors[pipeline_id] = None
+
+            except (NegativeEquity, BookkeepingFailed) as e:
+                errors[pipeline_id] = e
+
+        return errors
+
+    def _get_leg_fills(self, symbol, legs, net_units, order):
+        """
+        The units of each leg the net order filled. Opposite legs cross each other in
+        full; a shortfall of the net order is spread over the legs on its side in
+        proportion to their units.
+        """
+        if not net_units:
+            return [abs(leg.units) for leg in legs]
+
+        shortfall = max(0, abs(net_units) - float(order.get("executedQty", abs(net_units))))
+
+        side_units = sum(abs(leg.units) for leg in legs if leg.units * net_units > 0)
+
+        ratio = 1 - shortfall / side_units
+
+        return [
+            round(abs(leg.units) * ratio, self.symbols[symbol]["quantity_precision"])
+            if leg.units * net_units > 0 else abs(leg.units)
+            for leg in legs
+        ]
+
+    def _plan_legs(self, symbol, pipeline, signal, price):
+        """
+        The orders `trade` would place for the pipeline's signal, with the new position
+        sized on the balance closing the current one frees at the given price.
+        """
+        position = self._get_position(pipeline.id)
+
+        if signal == position:
+            return []
+
+        quantity_precision = self.symbols[symbol]["quantity_precision"]
+
+        legs = []
+        balance = self.current_balance[pipeline.id]
+
+        close_units = round(-self.units[pipeline.id], quantity_precision)
+
+        if position != 0 and close_units:
+            legs.append(_Leg(pipeline.id, close_units, True, "GOING LONG" if close_units > 0 else "GOING SHORT"))
+
+            balance = self._compute_net_value(
+                pipeline.id, -close_units * price, -close_units, pipeline, reducing=True
+            )["balance"]
+
+        if signal != 0:
+            open_units = max(0, round(balance / price, quantity_precision))
+
+            legs.append(_Leg(pipeline.id, open_units * signal, False, "GOING LONG" if signal == 1 else "GOING SHORT"))
+
+        return legs
+
+    def _allocate_fill(self, symbol, order, client_order_id, leg, n, filled):
+        """
+        The share of a net order filling `filled` units of a leg, formatted as an order
+        of its own. The legs of a pipeline are timestamped 1ms apart so that they keep
+        their order.
+        """
+        price = float(order["avgPrice"])
+        units = abs(leg.units)
+
+        return {
+            "orderId": f"{order['orderId']}-{leg.pipeline_id}-{n}",
+            "clientOrderId": client_order_id,
+            "symbol": symbol,
+            "updateTime": order["updateTime"] + n,
+            "avgPrice": price,
+            "origQty": units,
+            "executedQty": filled,
+            "cumQuote": filled * price,
+            "status": "FILLED" if filled >= units else order.get("status", "PARTIALLY_FILLED"),
+            "type": self.ORDER_TYPE_MARKET,
+            "side": self.SIDE_BUY if leg.units > 0 else self.SIDE_SELL,
+        }
 
     def _set_leverage(self, pipeline, symbol, header):
         """
         Sets the leverage for a given symbol based on the pipeline configuration.
 
+        Binance sets the leverage per symbol, so with several pipelines on a symbol it is
+        set to the highest of their leverages: each pipeline's balance is tracked in its
+        sub-ledger with its own leverage, and the exchange leverage only needs to provide
+        enough margin for all of them.
+
         Parameters
         ----------
         pipeline : Pipeline object
@@ -164,18 +465,27 @@ class BinanceFuturesTrader(BinanceTrader):
         LeverageSettingFail
             If the leverage setting fails due to an API error or invalid configuration.
         """
+        leverage = max(
+            [pipeline.leverage] + [
+                self.leverage[pipeline_id] for pipeline_id, pipeline_symbol in self.pipelines.items()
+                if pipeline_symbol == symbol and pipeline_id in self.leverage
+            ]
+        )
+
         return_value = handle_order_execution_errors(
             symbol=symbol,
             trader_instance=self,
             header=header,
             pipeline_id=pipeline.id
         )(
-            lambda: self.futures_change_leverage(symbol=symbol, leverage=pipeline.leverage)
+            lambda: self.futures_change_leverage(symbol=symbol, leverage=leverage)
         )()
 
         if return_value and "message" in return_value:
             raise LeverageSettingFail(return_value["message"])
 
+        self.leverage[pipeline.id] = pipeline.leverage
+
     def _check_enough_balance(self, symbol, pipeline):
         """
         Checks if there is enough balance available for a given symbol based on the
@@ -199,7 +509,7 @@ class BinanceFuturesTrader(BinanceTrader):
         balance = float(filter_balances(balances, ["USDT"])[0]["availableBalance"])
 
         if pipeline.current_equity > balance:
-            self.symbols.pop(symbol)
+            self._reset_pipeline(pipeline.id)
             raise InsufficientBalance(round(pipeline.current_equity, 2), round(balance, 2))
 
     @retry_failed_connection(num_times=2)
@@ -219,13 +529,10 @@ class BinanceFuturesTrader(BinanceTrader):
 
         Notes
         -----
-        This method uses the futures position information endpoint to fetch the
-         current position amount. It is part of the position management functionality.
+        The amount is kept up to date by the user data stream, and fetched from the
+        futures position information endpoint when it is older than POSITION_TTL.
         """
-        positions = self.futures_position_information()
-        for symbol_info in positions:
-            if symbol_info["symbol"] == symbol:
-                return float(symbol_info["positionAmt"])
+        return self.market_cache.get_position_amt(symbol)
 
     def close_pos(self, symbol, date=None, row=None, header='', **kwargs):
         """
@@ -254,17 +561,17 @@ class BinanceFuturesTrader(BinanceTrader):
 
         logging.info(header + f"Closing position for symbol: {symbol}")
 
-        units = self._convert_units(None, self.units[symbol], symbol)
+        units = self._convert_units(None, self.units[pipeline_id], symbol)
 
         if units in [0, -0]:
             raise NoUnits
 
-        if self.units[symbol] < 0:
+        if self.units[pipeline_id] < 0:
             self.buy_instrument(
                 symbol,
                 date,
                 row,
-                units=-self.units[symbol],
+                units=-self.units[pipeline_id],
                 header=header,
                 reducing=True,
                 stop_trading=True,
@@ -274,7 +581,7 @@ class BinanceFuturesTrader(BinanceTrader):
                 symbol,
                 date,
                 row,
-                units=self.units[symbol],
+                units=self.units[pipeline_id],
                 header=header,
                 reducing=True,
                 stop_trading=True,
@@ -294,15 +601,44 @@ class BinanceFuturesTrader(BinanceTrader):
 
         Raises the original connection error if the order status cannot be
         confirmed, so callers never mistake an unknown outcome for success.
+
+        While the user data stream is up, the order is only acknowledged by the
+        request and its fill is read from the stream, falling back to the order
+        endpoint if the stream does not report it within ORDER_STREAM_TIMEOUT.
+        The cached position of the symbol is dropped once the order is placed.
         """
         symbol = order_kwargs["symbol"]
+
+        placed_at = time.monotonic()
+
+        order = self._submit_order(num_times, **order_kwargs)
+
+        self.market_cache.invalidate_position(symbol, older_than=placed_at)
+
+        return order
+
+    def _submit_order(self, num_times, **order_kwargs):
+        symbol = order_kwargs["symbol"]
         client_order_id = order_kwargs["newClientOrderId"]
 
         retries = 0
         while True:
             try:
-                return self.futures_create_order(**order_kwargs)
+                if not self.market_cache.streaming:
+                    return self.futures_create_order(**order_kwargs)
+
+                self.futures_create_order(**{**order_kwargs, "newOrderRespType": "ACK"})
+
+                return (
+                    self.market_cache.wait_for_order(client_order_id, settings.order_stream_timeout)
+                    or self.futures_get_order(symbol=symbol, origClientOrderId=client_order_id)
+                )
             except (ConnectionError, ReadTimeout) as conn_error:
+                order = self.market_cache.get_order(client_order_id)
+
+                if order is not None:
+                    return order
+
                 try:
                     return self.futures_get_order(
                         symbol=symbol, origClientOrderId=client_order_id
@@ -389,6 +725,11 @@ class BinanceFuturesTrader(BinanceTrader):
         # reused across retries so Binance can deduplicate a re-placed order
         client_order_id = f"{pipeline_id or 'manual'}-{uuid.uuid4().hex}"[:36]
 
+        # the exchange position is the net of every pipeline on the symbol: a pipeline's
+        # close only reduces it if no other pipeline holds units, otherwise reduceOnly
+        # would be rejected or clipped by what the others hold
+        reduce_only = reducing and self._get_symbol_units(symbol, exclude=pipeline_id) == 0
+
         order = self._place_order_idempotent(
             symbol=symbol,
             side=order_side,
@@ -396,50 +737,71 @@ class BinanceFuturesTrader(BinanceTrader):
             newOrderRespType='RESULT',
             quantity=units,
             newClientOrderId=client_order_id,
-            **({"reduceOnly": True} if reducing else {})
+            **({"reduceOnly": True} if reduce_only else {})
         )
 
-        # The exchange has filled the order at this point: everything below is
-        # bookkeeping, written in one transaction so local records are
-        # all-or-nothing, and applied to in-memory state only after commit so
-        # that memory always matches the database.
-        def bookkeeping():
-            with transaction.atomic():
-                formatted_order = self._process_order(order, pipeline_id)
+        self._book_order(
+            symbol,
+            order,
+            order_side,
+            going,
+            pipeline,
+            pipeline_id=pipeline_id,
+            reducing=reducing,
+            header=header,
+            detail=f"order {client_order_id} ({order_side} {units} {symbol})"
+        )
 
-                state = None
-                if pipeline:
-                    factor = 1 if order_side == self.SIDE_SELL else -1
-                    units_filled = float(formatted_order["executed_qty"])
+        if pipeline:
+            self._check_negative_equity(pipeline_id, reducing=reducing, stop_trading=stop_trading)
 
-                    state = self._compute_net_value(
-                        symbol,
-                        factor * float(formatted_order['cummulative_quote_qty']),
-                        factor * units_filled,
-                        pipeline,
-                        reducing
-                    )
-                    self._persist_net_value(pipeline, state, reducing)
+    def _book_order(self, symbol, order, order_side, going, pipeline, pipeline_id, reducing, header='', detail=''):
+        """
+        Records a filled order and applies it to the pipeline's sub-ledger.
 
-                return formatted_order, state
+        The exchange has filled the order at this point: everything below is
+        bookkeeping. The Orders row and the pipeline's new net value are
+        written all-or-nothing (see `_record`), and applied to in-memory
+        state only once written or journaled, so that memory never runs
+        behind the records.
+        """
+        state = None
 
-        formatted_order, new_state = self._run_bookkeeping(
-            bookkeeping,
-            pipeline_id=pipeline_id,
-            symbol=symbol,
-            detail=f"order {client_order_id} ({order_side} {units} {symbol})"
-        )
+        if pipeline:
+            formatted_order = self._format_order(order, pipeline_id)
 
-        units = float(formatted_order["executed_qty"])
+            factor = 1 if order_side == self.SIDE_SELL else -1
+            units = float(formatted_order["executed_qty"])
+
+            state = self._compute_net_value(
+                pipeline_id,
+                factor * float(formatted_order['cummulative_quote_qty']),
+                factor * units,
+                pipeline,
+                reducing
+            )
+
+        self._record(
+            "order",
+            dict(order=order, pipeline_id=pipeline_id, state=state, reducing=reducing),
+            detail=detail,
+            pipeline=pipeline
+        )
 
         self.nr_trades += 1
 
         if pipeline:
-            self._apply_net_value(symbol, new_state)
+            self._apply_net_value(pipeline_id, state)
+
+            # stratestic's reporting helpers look the state up by a `symbol` key,
+            # which here is the pipeline's sub-ledger
+            self.report_trade(formatted_order, units, going, header, symbol=pipeline_id)
 
-            self.report_trade(formatted_order, units, going, header, symbol=symbol)
+    def _write_order(self, order, pipeline_id, state, reducing, pipeline=None):
+        self._process_order(order, pipeline_id)
 
-            self._check_negative_equity(symbol, reducing=reducing, stop_trading=stop_trading)
+        if state is not None:
+            self._persist_net_value(pipeline or Pipeline.objects.get(id=pipeline_id), state, reducing)
 
     def _convert_units(self, amount, units, symbol, units_factor=1):
         """
@@ -467,11 +829,10 @@ class BinanceFuturesTrader(BinanceTrader):
         This method is used for unit conversions necessary for order execution, accommodating both
         amount-based and units-based trade specifications.
         """
-        price_precision = self.symbols[symbol]["price_precision"]
         quantity_precision = self.symbols[symbol]["quantity_precision"]
 
         if amount is not None and units is None:
-            price = round(float(self.futures_symbol_ticker(symbol=symbol)['price']), price_precision)
+            price = self._get_price(symbol)
             units = round(amount / price * units_factor, quantity_precision)
 
             # in case units are negative
@@ -481,6 +842,11 @@ class BinanceFuturesTrader(BinanceTrader):
         else:
             return round(units * units_factor, quantity_precision)
 
+    def _get_price(self, symbol):
+        price_precision = self.symbols[symbol]["price_precision"]
+
+        return round(self.market_cache.get_mark_price(symbol), price_precision)
+
     def _format_order(self, order, pipeline_id):
         return dict(
             order_id=order["orderId"],
@@ -520,32 +886,33 @@ class BinanceFuturesTrader(BinanceTrader):
         """
         logging.debug(header + f"Updating balance for symbol: {symbol}.")
 
-        self.initial_balance[symbol] = pipeline.current_equity * pipeline.leverage
-        self.current_balance[symbol] = 0
-        self.units[symbol] = 0
-        self.current_equity[symbol] = pipeline.current_equity
+        self.initial_balance[pipeline.id] = pipeline.current_equity * pipeline.leverage
+        self.current_balance[pipeline.id] = 0
+        self.units[pipeline.id] = 0
+        self.current_equity[pipeline.id] = pipeline.current_equity
 
-        self._update_net_value(symbol, pipeline.balance, -pipeline.units, pipeline)
+        self._update_net_value(pipeline.id, pipeline.balance, -pipeline.units, pipeline)
 
-        self.print_current_balance(datetime.now(), header=header, symbol=symbol)
+        self.print_current_balance(datetime.now(), header=header, symbol=pipeline.id)
 
-    def _compute_net_value(self, symbol, balance, units, pipeline, reducing=False):
+    def _compute_net_value(self, pipeline_id, balance, units, pipeline, reducing=False):
         """
-        Computes the new net value, units, and balances for a specified symbol
-        without mutating any state.
+        Computes the new net value, units, and balances of a pipeline's
+        sub-ledger without mutating any state.
 
         Pure on purpose: the result is first persisted to the database inside
-        a transaction and only applied to the in-memory trading state after
-        the commit succeeds, so memory and database can never diverge.
+        a transaction (or journaled, see `_record`) and only applied to the
+        in-memory trading state after that succeeds, so memory and database
+        can never diverge.
 
         Returns
         -------
         dict
-            The new `units`, `balance` and `equity` values for the symbol.
+            The new `units`, `balance` and `equity` values for the pipeline.
         """
-        new_units = self.units[symbol] - units
-        new_balance = self.current_balance[symbol] + balance
-        new_equity = self.current_equity[symbol]
+        new_units = self.units[pipeline_id] - units
+        new_balance = self.current_balance[pipeline_id] + balance
+        new_equity = self.current_equity[pipeline_id]
 
         # Correction of balance if leverage is different from 1
         if reducing:
@@ -571,24 +938,27 @@ class BinanceFuturesTrader(BinanceTrader):
         if reducing:
             transaction.on_commit(lambda: save_pipeline_snapshot(pipeline_id=pipeline.id))
 
-    def _apply_net_value(self, symbol, state):
+    def _apply_net_value(self, pipeline_id, state):
         """Applies a computed net value to the in-memory trading state."""
-        self.units[symbol] = state["units"]
-        self.current_balance[symbol] = state["balance"]
-        self.current_equity[symbol] = state["equity"]
+        self.units[pipeline_id] = state["units"]
+        self.current_balance[pipeline_id] = state["balance"]
+        self.current_equity[pipeline_id] = state["equity"]
 
-    def _update_net_value(self, symbol, balance, units, pipeline, reducing=False):
+    def _update_net_value(self, pipeline_id, balance, units, pipeline, reducing=False):
         """
         Computes, persists and applies a net value update in one step. Used
-        outside the order path (e.g. when initializing a symbol's balance);
+        outside the order path (e.g. when initializing a pipeline's balance);
         the order path runs the same pieces inside its own transaction.
         """
-        state = self._compute_net_value(symbol, balance, units, pipeline, reducing)
+        # written outside the journal: pending entries would overwrite it with older state
+        self.flush_bookkeeping()
+
+        state = self._compute_net_value(pipeline_id, balance, units, pipeline, reducing)
 
         with transaction.atomic():
             self._persist_net_value(pipeline, state, reducing)
 
-        self._apply_net_value(symbol, state)
+        self._apply_net_value(pipeline_id, state)
 
     def _get_symbol_info(self, symbol):
         """
@@ -602,31 +972,23 @@ class BinanceFuturesTrader(BinanceTrader):
 
         Notes
         -----
-        This method uses the `validate_symbol` method (expected to be implemented
-        within the `BinanceTrader` or an equivalent class) to fetch symbol information from the exchange.
-        The information is stored in the `symbols` dictionary attribute, indexed by the symbol string.
+        The symbol information is read through the market cache, which validates the
+        symbol against the database only once per SYMBOL_INFO_TTL. The information is stored in the `symbols` dictionary attribute, indexed by the symbol string.
 
         The `symbols` dictionary is essential for ensuring that orders are placed with the
         correct precision and for handling asset conversions and calculations accurately.
         """
 
-        symbol_obj = self.validate_symbol(symbol)
+        self.symbols[symbol] = self.market_cache.get_symbol_info(symbol)
 
-        self.symbols[symbol] = {
-            "base": symbol_obj.base,
-            "quote": symbol_obj.quote,
-            "price_precision": symbol_obj.price_precision,
-            "quantity_precision": symbol_obj.quantity_precision
-        }
-
-    def _check_negative_equity(self, symbol, reducing, stop_trading=False):
+    def _check_negative_equity(self, pipeline_id, reducing, stop_trading=False):
         """
-        Checks for negative equity for a given symbol and raises an exception if found.
+        Checks for negative equity for a given pipeline and raises an exception if found.
 
         Parameters
         ----------
-        symbol : str
-            The trading symbol to check for negative equity.
+        pipeline_id : int
+            The pipeline to check for negative equity.
         reducing : bool
             Indicates whether the equity check is performed after reducing a position.
         stop_trading : bool, optional
@@ -635,8 +997,8 @@ class BinanceFuturesTrader(BinanceTrader):
         Raises
         ------
         NegativeEquity
-            If negative equity is detected for the symbol.
+            If negative equity is detected for the pipeline.
         """
         if reducing and not stop_trading:
-            if self.current_balance[symbol] < 0:
-                raise NegativeEquity(self.current_balance[symbol])
+            if self.current_balance[pipeline_id] < 0:
+                raise NegativeEquity(pipeline_id)
@@ -1,8 +1,11 @@
+import functools
 import logging
 import os
 import sys
+from collections import defaultdict
 
 import django
+from binance.exceptions import BinanceAPIException
 from flask import Flask, jsonify, request
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager, jwt_required
@@ -50,6 +53,11 @@ def startup_task():
 
     start_background_scheduler()
 
+    # apply the bookkeeping journaled but not written before the last shutdown
+    for trader in [binance_futures_trader, binance_futures_mock_trader]:
+        if trader.journal is not None:
+            trader.journal.recover()
+
     # the exchange is the source of truth: repair any Position/Trade/units
     # drift left behind by a crash before trusting the local records below
     reconcile_positions(get_binance_trader_instance)
@@ -100,13 +108,16 @@ def startup_task():
 
 
 def start_pipeline_trade(pipeline, header):
+    bt = get_binance_trader_instance(pipeline.paper_trading)
+
+    # a quick stop and restart: the stop's bookkeeping may still be journaled
+    bt.flush_bookkeeping()
+
     try:
         initial_position = Position.objects.get(pipeline__id=pipeline.id).position
     except Position.DoesNotExist:
         initial_position = 0
 
-    bt = get_binance_trader_instance(pipeline.paper_trading)
-
     bt.start_symbol_trading(
         pipeline.id,
         initial_position=initial_position,
@@ -114,6 +125,81 @@ def start_pipeline_trade(pipeline, header):
     )
 
 
+def validate_order(order):
+    pipeline, parameters = extract_and_validate(order)
+
+    if not pipeline.active:
+        raise PipelineNotActive(pipeline.id)
+
+    validate_signal(signal=parameters.signal)
+
+    return pipeline, parameters
+
+
+def raise_error(error):
+    if error is not None:
+        raise error
+
+
+def execute_symbol_orders(bt, symbol, orders):
+    """
+    Executes the signals of the pipelines trading a symbol, netted into a single exchange
+    order when there are several of them.
+
+    Parameters
+    ----------
+    bt : BinanceFuturesTrader
+    symbol : str
+    orders : dict
+        The validated parameters of each pipeline's order, keyed by the pipeline id.
+
+    Returns
+    -------
+    dict
+        The response of each pipeline, keyed by the pipeline id as a string.
+    """
+    errors = None
+
+    if len(orders) > 1:
+        try:
+            errors = bt.trade_pipelines(
+                symbol,
+                {pipeline_id: parameters.signal for pipeline_id, parameters in orders.items()},
+                headers={pipeline_id: parameters.header for pipeline_id, parameters in orders.items()},
+            )
+        except BinanceAPIException as e:
+            # nothing was booked: trade the pipelines one by one instead
+            logging.warning(f"{symbol}: the net order was rejected ({e.message}). Trading each pipeline separately.")
+
+    responses = {}
+
+    for pipeline_id, parameters in orders.items():
+        if errors is not None:
+            # the outcome of each pipeline goes through the same handling as a single order
+            operation = functools.partial(raise_error, errors[pipeline_id])
+        else:
+            operation = functools.partial(
+                bt.trade,
+                symbol,
+                parameters.signal,
+                amount=parameters.amount,
+                header=parameters.header,
+                pipeline_id=pipeline_id,
+                print_results=True
+            )
+
+        return_value = handle_order_execution_errors(
+            symbol=symbol,
+            trader_instance=bt,
+            header=parameters.header,
+            pipeline_id=pipeline_id
+        )(operation)()
+
+        responses[str(pipeline_id)] = return_value or Responses.ORDER_EXECUTION_SUCCESS(symbol)
+
+    return responses
+
+
 def create_app():
 
     global binance_futures_mock_trader, binance_futures_trader
@@ -121,6 +207,9 @@ def create_app():
     binance_futures_trader = BinanceFuturesTrader()
     binance_futures_mock_trader = BinanceFuturesTrader(paper_trading=True)
 
+    binance_futures_trader.market_cache.start_streams()
+    binance_futures_mock_trader.market_cache.start_streams()
+
     app = Flask(__name__)
     app.register_blueprint(market_data)
 
@@ -230,6 +319,42 @@ def create_app():
 
         return jsonify(Responses.ORDER_EXECUTION_SUCCESS(pipeline.symbol.name))
 
+    @app.route('/execute_orders', methods=['POST'])
+    @handle_app_errors
+    @jwt_required()
+    @handle_db_connection_error
+    def execute_orders():
+
+        request_data = request.get_json(force=True)
+
+        logging.debug(request_data)
+
+        responses = {}
+        batches = defaultdict(dict)
+
+        for order in request_data.get("orders", []):
+            validated = handle_app_errors(validate_order)(order)
+
+            if not isinstance(validated, tuple):
+                # rejected: the error response of a single order
+                responses[str(order.get("pipeline_id"))] = validated.get_json()
+                continue
+
+            pipeline, parameters = validated
+
+            if pipeline.exchange.name.lower() != 'binance':
+                responses[str(pipeline.id)] = Responses.ORDER_EXECUTION_SUCCESS(pipeline.symbol.name)
+                continue
+
+            batches[(pipeline.paper_trading, pipeline.symbol.name)][pipeline.id] = parameters
+
+        for (paper_trading, symbol), orders in batches.items():
+            bt = get_binance_trader_instance(paper_trading)
+
+            responses.update(execute_symbol_orders(bt, symbol, orders))
+
+        return jsonify(Responses.ORDERS_EXECUTED(responses))
+
     return app
 
 
@@ -3,10 +3,13 @@ import os
 from datetime import datetime
 
 import django
+import pandas as pd
 import pytz
+from django.db import transaction
 
-from execution.service.blueprints.market_data import get_account_data
+from execution.service.blueprints.market_data import get_account_data, get_ticker
 from shared.utils.decorators import handle_db_connection_error
+from shared.utils.equity_rollups import update_rollups
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "database.settings")
 django.setup()
@@ -22,26 +25,54 @@ def parse_balance(value):
         return 0.0
 
 
+def get_mark_price(position):
+    # the account positions carry no mark price: it is implied by the notional
+    # of a non-flat position
+    units = parse_balance(position.get("positionAmt"))
+
+    return parse_balance(position.get("notional")) / units if units != 0 else None
+
+
+ACCOUNT_TYPES = {True: "testnet", False: "live"}
+
+
 @handle_db_connection_error
 def save_portfolio_value_snapshot():
+    """
+    Saves the value of each account with active pipelines, and the equity of
+    its pipelines: the account state is fetched once per account, and all
+    the values are written in a single bulk insert, along with their rollups.
+
+    The unrealized profit of each pipeline is computed from its own signed
+    units and entry price, so that pipelines holding opposite positions on a
+    symbol are each valued on their own leg.
+    """
     logging.debug('Saving pipelines snapshot...')
 
-    open_positions_test = Position.objects.filter(pipeline__active=True, pipeline__paper_trading=True)
-    open_positions_live = Position.objects.filter(pipeline__active=True, pipeline__paper_trading=False)
-
-    if len(open_positions_live) == 0 and len(open_positions_test) == 0:
+    pipelines = pd.DataFrame(
+        Position.objects.filter(pipeline__active=True).values_list(
+            "pipeline_id",
+            "pipeline__paper_trading",
+            "pipeline__symbol_id",
+            "pipeline__current_equity",
+            "pipeline__units",
+            "buying_price",
+        ),
+        columns=["pipeline_id", "paper_trading", "symbol", "equity", "units", "buying_price"],
+    )
+
+    if len(pipelines) == 0:
         return
 
     time = datetime.now(pytz.utc)
 
-    symbols = dict()
-
-    symbols["testnet"] = [{"symbol": position.pipeline.symbol.name, "pipeline_id": position.pipeline.id} for position in open_positions_test]
-    symbols["live"] = [{"symbol": position.pipeline.symbol.name, "pipeline_id": position.pipeline.id} for position in open_positions_live]
+    pipelines["account_type"] = pipelines["paper_trading"].map(ACCOUNT_TYPES)
+    pipelines["units"] = pipelines["units"].fillna(0)
 
-    account_types = [account_type for account_type, account_symbols in symbols.items() if account_symbols]
+    balances = get_account_data(list(pipelines["account_type"].unique()))
 
-    balances = get_account_data(account_types)
+    snapshots = []
+    mark_prices = []
 
     for account_type, account_balances in balances.items():
 
@@ -49,18 +80,45 @@ def save_portfolio_value_snapshot():
             parse_balance(account_balances.get("totalWalletBalance"))
             - parse_balance(account_balances.get("totalUnrealizedProfit"))
         )
-        PortfolioTimeSeries.objects.create(time=time, value=net_account_balance, type=account_type)
+        snapshots.append(PortfolioTimeSeries(time=time, value=net_account_balance, type=account_type))
+
+        mark_prices.extend(
+            (account_type, position["symbol"], get_mark_price(position))
+            for position in account_balances.get("positions", [])
+        )
+
+    mark_prices = pd.DataFrame(
+        mark_prices, columns=["account_type", "symbol", "mark_price"], dtype=object
+    ).drop_duplicates(["account_type", "symbol"])
+
+    pipelines = pipelines.merge(mark_prices, on=["account_type", "symbol"], how="left")
+    pipelines["mark_price"] = pipelines["mark_price"].astype(float)
+
+    # opposite pipelines can net the account position to flat, in which case
+    # the price is fetched from the ticker
+    missing = pipelines["mark_price"].isna() & (pipelines["units"] != 0)
+
+    for account_type, symbol in set(zip(pipelines.loc[missing, "account_type"], pipelines.loc[missing, "symbol"])):
+        ticker = get_ticker(symbol, paper_trading=account_type == ACCOUNT_TYPES[True]) or {}
+        price = parse_balance(ticker.get("price"))
+
+        if price:
+            pipelines.loc[
+                (pipelines["account_type"] == account_type) & (pipelines["symbol"] == symbol), "mark_price"
+            ] = price
 
-        for symbol in symbols[account_type]:
+    unrealized_profit = pipelines["units"] * (pipelines["mark_price"] - pipelines["buying_price"])
 
-            position = next(
-                (balance for balance in account_balances.get("positions", []) if balance["symbol"] == symbol["symbol"]),
-                None,
-            )
+    pipelines["value"] = pipelines["equity"] + unrealized_profit.where(pipelines["units"] != 0, 0).fillna(0)
 
-            unrealized_profit = parse_balance(position["unrealizedProfit"]) if position else 0.0
+    snapshots.extend(
+        PortfolioTimeSeries(pipeline_id=int(pipeline_id), time=time, value=float(value))
+        for pipeline_id, value in zip(pipelines["pipeline_id"], pipelines["value"])
+    )
 
-            save_pipeline_snapshot(symbol["pipeline_id"], unrealized_profit)
+    with transaction.atomic():
+        PortfolioTimeSeries.objects.bulk_create(snapshots)
+        update_rollups(snapshots)
 
 
 def save_pipeline_snapshot(pipeline_id, unrealized_profit=0):
@@ -71,4 +129,6 @@ def save_pipeline_snapshot(pipeline_id, unrealized_profit=0):
 
     equity = pipeline.current_equity + unrealized_profit
 
-    PortfolioTimeSeries.objects.create(pipeline=pipeline, time=time, value=equity)
+    with transaction.atomic():
+        snapshot = PortfolioTimeSeries.objects.create(pipeline=pipeline, time=time, value=equity)
+        update_rollups([snapshot])
@@ -22,7 +22,8 @@ RESPONSES = namedtuple(
         "LEVERAGE_SETTING_FAILURE",
         "NEGATIVE_EQUITY",
         "INSUFFICIENT_BALANCE",
-        "BOOKKEEPING_FAILED"
+        "BOOKKEEPING_FAILED",
+        "ORDERS_EXECUTED"
     ]
 )
 
@@ -46,7 +47,8 @@ ReturnCodes = RESPONSES(
     LEVERAGE_SETTING_FAILURE="LEVERAGE_SETTING_FAILURE",
     NEGATIVE_EQUITY="NEGATIVE_EQUITY",
     INSUFFICIENT_BALANCE="INSUFFICIENT_BALANCE",
-    BOOKKEEPING_FAILED="BOOKKEEPING_FAILED"
+    BOOKKEEPING_FAILED="BOOKKEEPING_FAILED",
+    ORDERS_EXECUTED="ORDERS_EXECUTED"
 )
 
 
@@ -146,4 +148,10 @@ Responses = RESPONSES(
         "success": False,
         "message":  message
     },
+    ORDERS_EXECUTED=lambda responses: {
+        "code": ReturnCodes.ORDERS_EXECUTED,
+        "success": True,
+        "message": "Orders were processed.",
+        "responses": responses
+    },
 )
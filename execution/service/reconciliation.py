@@ -17,6 +17,9 @@ Limitations (v1, by design):
   can adjust `current_equity` manually if needed.
 - Corrected prices (`buying_price`, dangling-trade close price) use the
   current mark price, which is approximate; alerts flag this.
+
+Positions and mark prices are read from the trader's market cache, i.e. from
+the exchange streams when they are up, and over REST otherwise.
 """
 
 import logging
@@ -42,13 +45,13 @@ def _account_name(paper_trading):
 
 def _quantity_tolerance(trader, symbol):
     try:
-        return 10 ** -trader.validate_symbol(symbol).quantity_precision
+        return 10 ** -trader.market_cache.get_symbol_info(symbol)["quantity_precision"]
     except Exception:
         return 1e-8
 
 
 def _mark_price(trader, symbol):
-    return float(trader.futures_symbol_ticker(symbol=symbol)["price"])
+    return trader.market_cache.get_mark_price(symbol)
 
 
 def reconcile_positions(get_trader_instance):
@@ -67,6 +70,10 @@ def reconcile_positions(get_trader_instance):
     back to the existing DB state for that group and alerts, so startup
     always proceeds.
     """
+    # the records are read and corrected outside the bookkeeping journal
+    for paper_trading in (False, True):
+        get_trader_instance(paper_trading).flush_bookkeeping()
+
     groups = defaultdict(list)
 
     for pipeline in Pipeline.objects.filter(active=True).select_related("symbol"):
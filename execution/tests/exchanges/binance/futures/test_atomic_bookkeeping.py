@@ -39,11 +39,12 @@ def trader(mocker, create_pipeline):
         "base": "BTC", "quote": "USDT",
         "price_precision": 2, "quantity_precision": 3,
     }
-    trader.units["BTCUSDT"] = 1.0
-    trader.current_balance["BTCUSDT"] = 1000.0
-    trader.current_equity["BTCUSDT"] = 1000.0
-    trader.initial_balance["BTCUSDT"] = 1000.0
-    trader.position["BTCUSDT"] = 1
+    trader.pipelines[1] = "BTCUSDT"
+    trader.units[1] = 1.0
+    trader.current_balance[1] = 1000.0
+    trader.current_equity[1] = 1000.0
+    trader.initial_balance[1] = 1000.0
+    trader.position[1] = 1
 
     mocker.patch.object(trader, "_place_order_idempotent", return_value=FULL_ORDER)
     mocker.patch.object(trader, "report_trade")
@@ -69,9 +70,9 @@ class TestAtomicOrderBookkeeping:
 
         pipeline = Pipeline.objects.get(id=1)
         assert Orders.objects.count() == 1
-        assert trader.units["BTCUSDT"] == pipeline.units
-        assert trader.current_balance["BTCUSDT"] == pipeline.balance
-        assert trader.current_equity["BTCUSDT"] == pipeline.current_equity
+        assert trader.units[1] == pipeline.units
+        assert trader.current_balance[1] == pipeline.balance
+        assert trader.current_equity[1] == pipeline.current_equity
 
     def test_orders_create_failure_leaves_db_and_memory_unchanged(
         self, trader, create_pipeline, mocker, mock_alert
@@ -80,8 +81,8 @@ class TestAtomicOrderBookkeeping:
             Orders.objects, "create", side_effect=DatabaseError("db down")
         )
 
-        units_before = trader.units["BTCUSDT"]
-        balance_before = trader.current_balance["BTCUSDT"]
+        units_before = trader.units[1]
+        balance_before = trader.current_balance[1]
         pipeline_units_before = Pipeline.objects.get(id=1).units
 
         with pytest.raises(BookkeepingFailed):
@@ -90,8 +91,8 @@ class TestAtomicOrderBookkeeping:
             )
 
         assert Orders.objects.count() == 0
-        assert trader.units["BTCUSDT"] == units_before
-        assert trader.current_balance["BTCUSDT"] == balance_before
+        assert trader.units[1] == units_before
+        assert trader.current_balance[1] == balance_before
         assert Pipeline.objects.get(id=1).units == pipeline_units_before
         mock_alert.assert_called_once()
         assert mock_alert.call_args.kwargs["severity"] == "critical"
@@ -158,13 +159,13 @@ class TestAtomicPositionBookkeeping:
         # the Trade opened inside the transaction must have rolled back, and
         # the in-memory position must not have been touched
         assert Trade.objects.count() == 0
-        assert trader.position["BTCUSDT"] == 1  # unchanged from fixture
+        assert trader.position[1] == 1  # unchanged from fixture
         mock_alert.assert_called_once()
 
     def test_position_memory_updated_after_commit(self, trader, create_pipeline):
         trader._set_position("BTCUSDT", -1, previous_position=0, pipeline_id=1)
 
-        assert trader.position["BTCUSDT"] == -1
+        assert trader.position[1] == -1
         assert Position.objects.filter(pipeline_id=1, position=-1).exists()
 
 
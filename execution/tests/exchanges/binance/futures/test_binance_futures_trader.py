@@ -139,10 +139,10 @@ class TestBinanceFuturesTrader:
         assert futures_change_leverage_spy.call_count == times_called[0]
         assert futures_create_order_spy.call_count == times_called[2]
 
-        assert binance_trader.units[symbol] == balance_units[1]
-        assert binance_trader.current_balance[symbol] == balance_units[0]
-        assert binance_trader.initial_balance[symbol] == pipeline.current_equity * pipeline.leverage
-        assert binance_trader.position[symbol] == parameters["initial_position"]
+        assert binance_trader.units[pipeline.id] == balance_units[1]
+        assert binance_trader.current_balance[pipeline.id] == balance_units[0]
+        assert binance_trader.initial_balance[pipeline.id] == pipeline.current_equity * pipeline.leverage
+        assert binance_trader.position[pipeline.id] == parameters["initial_position"]
 
     @pytest.mark.slow
     @pytest.mark.parametrize(
@@ -230,7 +230,7 @@ class TestBinanceFuturesTrader:
             units,
         )
 
-        assert binance_trader.position[symbol] == 0
+        assert binance_trader.position[parameters["pipeline_id"]] == 0
         assert futures_create_order_spy.call_count == times_called
 
     @pytest.mark.parametrize("signal", [-1, 0, 1])
@@ -255,8 +255,8 @@ class TestBinanceFuturesTrader:
         initial_balance = pipeline.balance
 
         binance_trader = BinanceFuturesTrader()
-        binance_trader.initial_balance[self.symbol] = initial_balance
-        binance_trader.current_balance[self.symbol] = initial_balance
+        binance_trader.initial_balance[pipeline_id] = initial_balance
+        binance_trader.current_balance[pipeline_id] = initial_balance
 
         binance_trader.start_symbol_trading(pipeline_id, leverage=pipeline.leverage)
         binance_trader.trade(self.symbol, initial_position, amount="all", pipeline_id=pipeline_id)
@@ -267,13 +267,13 @@ class TestBinanceFuturesTrader:
 
         binance_trader.trade(self.symbol, signal, amount="all", pipeline_id=pipeline_id)
 
-        assert binance_trader._get_position(self.symbol) == signal
+        assert binance_trader._get_position(pipeline_id) == signal
 
         factor = (signal - 1) * -1
 
-        assert binance_trader.units[self.symbol] == float(futures_order_creation["origQty"]) * signal
-        assert binance_trader.initial_balance[self.symbol] == initial_balance
-        assert binance_trader.current_balance[self.symbol] == initial_balance * factor
+        assert binance_trader.units[pipeline_id] == float(futures_order_creation["origQty"]) * signal
+        assert binance_trader.initial_balance[pipeline_id] == initial_balance
+        assert binance_trader.current_balance[pipeline_id] == initial_balance * factor
 
         number_orders = abs(initial_position - signal)
 
@@ -395,17 +395,17 @@ class TestBinanceFuturesTrader:
 
         binance_trader = self.start_symbol_trading(parameters, symbol, {})
 
-        initial_equity = binance_trader.current_equity[symbol]
+        initial_equity = binance_trader.current_equity[pipeline.id]
         pnl = side_effect[1] - side_effect[0] if side_effect[2] is None else side_effect[2] - side_effect[0]
 
         binance_trader.trade(self.symbol, signal, amount="all", pipeline_id=pipeline.id)
 
-        assert binance_trader.current_equity[symbol] == initial_equity
+        assert binance_trader.current_equity[pipeline.id] == initial_equity
 
         binance_trader.trade(self.symbol, 0, amount="all", pipeline_id=pipeline.id)
 
-        assert binance_trader.current_equity[symbol] == initial_equity + pnl * signal
-        assert binance_trader.current_balance[symbol] == binance_trader.current_equity[symbol] * pipeline.leverage
+        assert binance_trader.current_equity[pipeline.id] == initial_equity + pnl * signal
+        assert binance_trader.current_balance[pipeline.id] == binance_trader.current_equity[pipeline.id] * pipeline.leverage
 
     def test_all(
         self,
@@ -438,11 +438,11 @@ class TestBinanceFuturesTrader:
         assert all(trade.open_price == float(margin_order_creation["price"]) for trade in trades)
 
     @pytest.mark.parametrize(
-        "parameters,symbols,times_called,expected_exception",
+        "parameters,pipelines,times_called,expected_exception",
         [
             pytest.param(
                 {"pipeline_id": 1, "leverage": 1},
-                {"BTCUSDT"},
+                {1: "BTCUSDT"},
                 (0, 0, 0),
                 SymbolAlreadyTraded,
                 id="SymbolIsAlreadyBeingTraded",
@@ -459,7 +459,7 @@ class TestBinanceFuturesTrader:
     def test_exception_start_symbol_trading(
         self,
         parameters,
-        symbols,
+        pipelines,
         times_called,
         expected_exception,
         test_mock_setup,
@@ -469,7 +469,7 @@ class TestBinanceFuturesTrader:
         futures_create_order_spy,
     ):
         with pytest.raises(Exception) as exception:
-            self.start_symbol_trading(parameters, self.symbol, symbols)
+            self.start_symbol_trading(parameters, self.symbol, pipelines)
 
         assert exception.type == expected_exception
         assert futures_change_leverage_spy.call_count == times_called[0]
@@ -595,12 +595,9 @@ class TestBinanceFuturesTrader:
         assert futures_create_order_spy.call_count == times_called
 
     @staticmethod
-    def start_symbol_trading(parameters, symbol, symbols):
+    def start_symbol_trading(parameters, symbol, pipelines):
         binance_trader = BinanceFuturesTrader()
-        binance_trader.symbols = symbols
-        binance_trader.current_balance = {symbol: 0}
-        binance_trader.initial_balance = {symbol: 0}
-        binance_trader.current_equity = {symbol: 0}
+        binance_trader.pipelines = pipelines
 
         binance_trader.start_symbol_trading(**parameters)
 
@@ -610,19 +607,21 @@ class TestBinanceFuturesTrader:
     def stop_symbol_trading(parameters, symbols, position, units):
 
         symbol = parameters["symbol"]
+        pipeline_id = parameters["pipeline_id"]
 
         binance_trader = BinanceFuturesTrader()
         binance_trader.symbols = symbols
+        binance_trader.pipelines = {pipeline_id: symbol} if symbol in symbols else {}
 
-        binance_trader._set_position(symbol, position, pipeline_id=1)
+        binance_trader._set_position(symbol, position, pipeline_id=pipeline_id)
         if units is not None:
-            binance_trader.units[symbol] = units
+            binance_trader.units[pipeline_id] = units
 
-        binance_trader.initial_balance[symbol] = 1000
-        binance_trader.current_balance[symbol] = 1000
-        binance_trader.current_equity[symbol] = 100
+        binance_trader.initial_balance[pipeline_id] = 1000
+        binance_trader.current_balance[pipeline_id] = 1000
+        binance_trader.current_equity[pipeline_id] = 100
 
-        binance_trader.start_date[symbol] = datetime.datetime.now(tz=pytz.utc)
+        binance_trader.start_date[pipeline_id] = datetime.datetime.now(tz=pytz.utc)
 
         binance_trader.stop_symbol_trading(**parameters)
 
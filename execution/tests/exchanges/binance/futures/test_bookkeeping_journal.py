@@ -0,0 +1,206 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from django.db import DatabaseError
+
+with pytest.MonkeyPatch().context() as ctx:
+    ctx.setenv("TEST", True)
+    # importing via execution.service first avoids the app <-> trader
+    # circular import (same order as test_order_idempotency.py)
+    from execution.service.helpers.exceptions import BookkeepingFailed
+    from execution.exchanges.binance import BookkeepingJournal
+    from execution.exchanges.binance.futures import BinanceFuturesTrader
+
+from database.model.models import AppSetting, Orders, Pipeline
+from shared.utils.tests.fixtures.models import (  # noqa: F401
+    create_exchange, create_symbol, create_assets, create_pipeline,
+)
+
+
+FULL_ORDER = {
+    "orderId": 1,
+    "clientOrderId": "1-abc",
+    "symbol": "BTCUSDT",
+    "updateTime": 1693560000000,
+    "avgPrice": "100.0",
+    "origQty": "1.0",
+    "executedQty": "1.0",
+    "cumQuote": "100.0",
+    "status": "FILLED",
+    "type": "MARKET",
+    "side": "SELL",
+}
+
+
+@pytest.fixture(autouse=True)
+def no_writer_thread(mocker):
+    # entries are applied by `recover`, on the test's database connection
+    mocker.patch("execution.exchanges.binance._bookkeeping_journal.threading.Thread")
+    mocker.patch("execution.exchanges.binance._bookkeeping_journal.time.sleep")
+
+
+@pytest.fixture
+def mock_alert(mocker):
+    return mocker.patch("execution.exchanges.binance._bookkeeping_journal.send_alert")
+
+
+@pytest.fixture
+def trader(mocker, tmp_path, create_pipeline):
+    trader = BinanceFuturesTrader(paper_trading=True)
+    trader.journal = BookkeepingJournal(str(tmp_path / "testnet.jsonl"), "testnet", trader._apply_bookkeeping)
+
+    trader.symbols["BTCUSDT"] = {
+        "base": "BTC", "quote": "USDT",
+        "price_precision": 2, "quantity_precision": 3,
+    }
+    trader.pipelines[1] = "BTCUSDT"
+    trader.units[1] = 1.0
+    trader.current_balance[1] = 1000.0
+    trader.current_equity[1] = 1000.0
+    trader.initial_balance[1] = 1000.0
+    trader.position[1] = 1
+
+    mocker.patch.object(trader, "_place_order_idempotent", return_value=FULL_ORDER)
+    mocker.patch.object(trader, "report_trade")
+    mocker.patch(
+        "execution.exchanges.binance.futures._trading.get_pipeline_data",
+        return_value=create_pipeline,
+    )
+    return trader
+
+
+def read_journal(journal):
+    with open(journal.path) as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.mark.django_db
+class TestAsyncBookkeeping:
+
+    def test_order_returns_before_the_records_are_written(self, trader):
+        trader._execute_order(
+            "BTCUSDT", "MARKET", "SELL", "GOING SHORT", units=1, pipeline_id=1
+        )
+
+        # memory is up to date, the database is not yet
+        assert trader.units[1] == 0
+        assert Orders.objects.count() == 0
+        assert [record["op"] for record in read_journal(trader.journal)] == ["order"]
+        assert trader.journal.pending == 1
+
+    def test_recovery_replays_the_journal_in_order(self, trader):
+        trader._execute_order(
+            "BTCUSDT", "MARKET", "SELL", "GOING SHORT", units=1, pipeline_id=1
+        )
+        trader._set_position("BTCUSDT", 0, previous_position=1, pipeline_id=1)
+
+        journal = BookkeepingJournal(trader.journal.path, "testnet", trader._apply_bookkeeping)
+
+        assert journal.recover() == 2
+
+        pipeline = Pipeline.objects.get(id=1)
+        assert Orders.objects.count() == 1
+        assert pipeline.units == trader.units[1]
+        assert pipeline.balance == trader.current_balance[1]
+        assert AppSetting.objects.get(key="bookkeeping_journal:testnet").value == "2"
+        assert read_journal(journal) == []
+
+    def test_applied_entries_are_not_replayed(self, trader):
+        trader._execute_order(
+            "BTCUSDT", "MARKET", "SELL", "GOING SHORT", units=1, pipeline_id=1
+        )
+        journal_lines = open(trader.journal.path).read()
+
+        trader.journal.recover()
+
+        # the process died after the commit but before the file was truncated
+        with open(trader.journal.path, "w") as f:
+            f.write(journal_lines)
+
+        assert trader.journal.recover() == 0
+        assert Orders.objects.count() == 1
+
+    def test_partial_entry_is_skipped(self, trader):
+        with open(trader.journal.path, "w") as f:
+            f.write('{"seq": 1, "op": "ord')
+
+        assert trader.journal.recover() == 0
+
+    def test_database_errors_are_retried(self, trader, mocker, mock_alert):
+        trader._execute_order(
+            "BTCUSDT", "MARKET", "SELL", "GOING SHORT", units=1, pipeline_id=1
+        )
+
+        original_create = Orders.objects.create
+        calls = {"n": 0}
+
+        def flaky_create(**kwargs):
+            calls["n"] += 1
+            if calls["n"] <= 2:
+                raise DatabaseError("db down")
+            return original_create(**kwargs)
+
+        mocker.patch.object(Orders.objects, "create", side_effect=flaky_create)
+
+        trader.journal.recover()
+
+        assert calls["n"] == 3
+        assert Orders.objects.count() == 1
+        assert mock_alert.call_args.kwargs["severity"] == "warning"
+
+    def test_failing_entry_freezes_the_pipeline(self, trader, mock_alert):
+        # an order without the fields of an exchange response
+        trader.journal.append(
+            "order", {"order": {"symbol": "BTCUSDT"}, "pipeline_id": 1, "state": None, "reducing": False}
+        )
+
+        trader.journal.recover()
+
+        assert Pipeline.objects.get(id=1).active is False
+        assert AppSetting.objects.get(key="bookkeeping_journal:testnet").value == "1"
+        assert mock_alert.call_args.kwargs["severity"] == "critical"
+
+    def test_journal_failure_raises_bookkeeping_failed(self, trader, mocker):
+        mocker.patch.object(trader.journal, "append", side_effect=OSError("disk full"))
+        mocker.patch("execution.exchanges.binance._trading.send_alert")
+
+        with pytest.raises(BookkeepingFailed):
+            trader._execute_order(
+                "BTCUSDT", "MARKET", "SELL", "GOING SHORT", units=1, pipeline_id=1
+            )
+
+        assert trader.units[1] == 1.0
+
+    def test_restart_waits_for_the_pending_bookkeeping(self, trader, mocker):
+        # the writer thread, applying the pending entries on the test's connection
+        mocker.patch.object(trader.journal, "flush", side_effect=lambda timeout=None: trader.journal.recover() >= 0)
+        mocker.patch.object(trader, "print_trading_results")
+        mocker.patch(
+            "execution.exchanges.binance.futures._trading.get_pipeline_data",
+            side_effect=lambda pipeline_id, **kwargs: Pipeline.objects.get(id=pipeline_id),
+        )
+        mocker.patch.object(
+            trader,
+            "validate_symbol",
+            return_value=MagicMock(base="BTC", quote="USDT", price_precision=2, quantity_precision=3),
+        )
+        mocker.patch.object(trader, "futures_change_leverage")
+        mocker.patch.object(
+            trader, "futures_account_balance", return_value=[{"asset": "USDT", "availableBalance": "100000"}]
+        )
+
+        trader.stop_symbol_trading(1, "BTCUSDT")
+
+        # the close is journaled, not written
+        assert Orders.objects.count() == 0
+
+        trader.start_symbol_trading(1)
+        trader.journal.recover()
+
+        # the restart read the closed state, which no pending entry overwrote
+        pipeline = Pipeline.objects.get(id=1)
+        assert Orders.objects.count() == 1
+        assert pipeline.units == trader.units[1] == 0
+        assert pipeline.balance == trader.current_balance[1]
+        assert pipeline.current_equity == trader.current_equity[1]
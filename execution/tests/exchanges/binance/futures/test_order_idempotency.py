@@ -1,4 +1,5 @@
 import json
+import time
 from datetime import datetime
 from unittest.mock import MagicMock
 
@@ -152,6 +153,53 @@ class TestPlaceOrderIdempotent:
         assert create.call_count == 1
 
 
+class TestStreamedFills:
+
+    @pytest.fixture
+    def streaming(self, trader, mocker):
+        trader.market_cache._streams = MagicMock()
+        trader.market_cache._user_stream_seen = time.monotonic()
+
+    def test_fill_is_read_from_the_user_data_stream(self, trader, streaming, mocker):
+        create = mocker.patch.object(trader, "futures_create_order")
+        get_order = mocker.patch.object(trader, "futures_get_order")
+        mocker.patch.object(trader.market_cache, "wait_for_order", return_value=ORDER)
+
+        order = trader._place_order_idempotent(
+            symbol="BTCUSDT", newClientOrderId="abc", side="BUY", newOrderRespType="RESULT"
+        )
+
+        assert order == ORDER
+        assert create.call_args.kwargs["newOrderRespType"] == "ACK"
+        get_order.assert_not_called()
+
+    def test_unreported_fill_is_looked_up(self, trader, streaming, mocker):
+        mocker.patch.object(trader, "futures_create_order")
+        mocker.patch.object(trader, "futures_get_order", return_value=ORDER)
+        mocker.patch.object(trader.market_cache, "wait_for_order", return_value=None)
+
+        order = trader._place_order_idempotent(
+            symbol="BTCUSDT", newClientOrderId="abc", side="BUY"
+        )
+
+        assert order == ORDER
+        trader.futures_get_order.assert_called_once_with(symbol="BTCUSDT", origClientOrderId="abc")
+
+    def test_streamed_order_found_after_timeout(self, trader, mocker):
+        """The create request timed out, but the stream reported the order:
+        no status request is needed."""
+        mocker.patch.object(trader, "futures_create_order", side_effect=ReadTimeout)
+        get_order = mocker.patch.object(trader, "futures_get_order")
+        mocker.patch.object(trader.market_cache, "get_order", return_value=ORDER)
+
+        order = trader._place_order_idempotent(
+            symbol="BTCUSDT", newClientOrderId="abc", side="BUY"
+        )
+
+        assert order == ORDER
+        get_order.assert_not_called()
+
+
 class TestExecuteOrderKwargs:
 
     @pytest.mark.django_db
@@ -0,0 +1,236 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+with pytest.MonkeyPatch().context() as ctx:
+    ctx.setenv("TEST", True)
+    # importing via execution.service first avoids the app <-> trader
+    # circular import (same order as test_order_idempotency.py)
+    from execution.service.helpers.exceptions import SymbolAlreadyTraded, NegativeEquity, BookkeepingFailed
+    from execution.exchanges.binance.futures import BinanceFuturesTrader
+
+from database.model.models import Orders, Pipeline, Position
+from shared.utils.tests.fixtures.models import (  # noqa: F401
+    create_exchange, create_symbol, create_assets, create_pipeline, create_pipeline_2,
+)
+
+SYMBOL = "BTCUSDT"
+
+NET_ORDER = {
+    "orderId": 42,
+    "clientOrderId": "net-abc",
+    "symbol": SYMBOL,
+    "updateTime": 1693560000000,
+    "avgPrice": "100.0",
+    "origQty": "20.0",
+    "executedQty": "20.0",
+    "cumQuote": "2000.0",
+    "status": "FILLED",
+    "type": "MARKET",
+    "side": "BUY",
+}
+
+
+@pytest.fixture
+def pipelines(create_pipeline, create_pipeline_2):
+    Pipeline.objects.filter(id=1).update(leverage=1, current_equity=1000, balance=1000, units=0)
+    Pipeline.objects.filter(id=2).update(leverage=2, current_equity=500, balance=1000, units=0)
+
+
+@pytest.fixture
+def trader(mocker, pipelines):
+    trader = BinanceFuturesTrader(paper_trading=True)
+
+    mocker.patch.object(
+        trader,
+        "validate_symbol",
+        return_value=MagicMock(base="BTC", quote="USDT", price_precision=2, quantity_precision=3),
+    )
+    mocker.patch.object(trader, "futures_change_leverage")
+    mocker.patch.object(
+        trader, "futures_account_balance", return_value=[{"asset": "USDT", "availableBalance": "100000"}]
+    )
+    mocker.patch.object(trader, "futures_symbol_ticker", return_value={"price": "100"})
+    mocker.patch.object(trader, "_place_order_idempotent", return_value=NET_ORDER)
+    mocker.patch.object(trader, "report_trade")
+
+    return trader
+
+
+def set_ledger(trader, pipeline_id, position, units, balance, equity):
+    trader.pipelines[pipeline_id] = SYMBOL
+    trader.position[pipeline_id] = position
+    trader.units[pipeline_id] = units
+    trader.current_balance[pipeline_id] = balance
+    trader.current_equity[pipeline_id] = equity
+    trader.initial_balance[pipeline_id] = balance
+
+
+@pytest.mark.django_db
+class TestPipelineLedgers:
+
+    def test_pipelines_share_a_symbol(self, trader):
+        trader.start_symbol_trading(1)
+        trader.start_symbol_trading(2)
+
+        assert trader.pipelines == {1: SYMBOL, 2: SYMBOL}
+        assert trader.current_balance == {1: 1000, 2: 1000}
+
+        # the exchange leverage covers the pipeline with the highest leverage
+        assert trader.futures_change_leverage.call_args.kwargs == {"symbol": SYMBOL, "leverage": 2}
+
+    def test_pipeline_cannot_start_twice(self, trader):
+        trader.start_symbol_trading(1)
+
+        with pytest.raises(SymbolAlreadyTraded):
+            trader.start_symbol_trading(1)
+
+    def test_symbol_info_kept_until_last_pipeline_stops(self, trader):
+        trader.start_symbol_trading(1)
+        trader.start_symbol_trading(2)
+
+        trader.stop_symbol_trading(1, SYMBOL)
+        assert SYMBOL in trader.symbols
+
+        trader.stop_symbol_trading(2, SYMBOL)
+        assert SYMBOL not in trader.symbols
+
+    def test_forced_stop_closes_only_unallocated_units(self, trader, mocker):
+        trader._get_symbol_info(SYMBOL)
+        set_ledger(trader, 2, 1, 10, 0, 500)
+
+        mocker.patch.object(trader, "_get_position_amt", return_value=15)
+        execute_order = mocker.patch.object(trader, "_execute_order")
+        mocker.patch.object(trader, "print_trading_results")
+
+        trader.stop_symbol_trading(1, SYMBOL, force=True)
+
+        assert execute_order.call_args.kwargs["units"] == 5
+        assert trader.pipelines == {2: SYMBOL}
+
+    def test_close_is_not_reduce_only_against_an_opposite_pipeline(self, trader):
+        trader._get_symbol_info(SYMBOL)
+        set_ledger(trader, 1, 1, 1, 0, 1000)
+        set_ledger(trader, 2, -1, -1, 0, 500)
+
+        # the exchange position is flat: a reduce-only close would be rejected
+        trader.trade(SYMBOL, 0, pipeline_id=1)
+
+        order_kwargs = trader._place_order_idempotent.call_args.kwargs
+        assert order_kwargs["side"] == "SELL"
+        assert "reduceOnly" not in order_kwargs
+
+    def test_close_is_reduce_only_when_the_pipeline_holds_the_whole_position(self, trader):
+        trader._get_symbol_info(SYMBOL)
+        set_ledger(trader, 1, 1, 1, 0, 1000)
+        set_ledger(trader, 2, 0, 0, 1000, 500)
+
+        trader.trade(SYMBOL, 0, pipeline_id=1)
+
+        assert trader._place_order_idempotent.call_args.kwargs["reduceOnly"] is True
+
+
+@pytest.mark.django_db
+class TestNetting:
+
+    def test_signals_are_netted_into_one_order(self, trader):
+        trader._get_symbol_info(SYMBOL)
+        set_ledger(trader, 1, 0, 0, 1000, 1000)
+        set_ledger(trader, 2, 0, 0, 1000, 500)
+
+        errors = trader.trade_pipelines(SYMBOL, {1: 1, 2: 1})
+
+        assert errors == {1: None, 2: None}
+
+        trader._place_order_idempotent.assert_called_once()
+        order_kwargs = trader._place_order_idempotent.call_args.kwargs
+        assert order_kwargs["side"] == "BUY"
+        assert order_kwargs["quantity"] == 20
+
+        assert trader.units == {1: 10, 2: 10}
+        assert trader.current_balance == {1: 0, 2: 0}
+        assert trader.position == {1: 1, 2: 1}
+
+        assert sorted(Orders.objects.values_list("order_id", flat=True)) == ["42-1-0", "42-2-0"]
+        assert Pipeline.objects.get(id=1).units == 10
+        assert Position.objects.get(pipeline_id=2).position == 1
+
+    def test_opposite_legs_cross_without_an_order(self, trader):
+        trader._get_symbol_info(SYMBOL)
+        set_ledger(trader, 1, 1, 10, 0, 1000)
+        set_ledger(trader, 2, 0, 0, 1000, 500)
+
+        errors = trader.trade_pipelines(SYMBOL, {1: 0, 2: 1})
+
+        assert errors == {1: None, 2: None}
+
+        trader._place_order_idempotent.assert_not_called()
+
+        assert trader.units == {1: 0, 2: 10}
+        assert trader.current_balance == {1: 1000, 2: 0}
+        assert trader.current_equity == {1: 1000, 2: 500}
+
+    def test_reversal_books_close_and_open_legs(self, trader):
+        trader._get_symbol_info(SYMBOL)
+        set_ledger(trader, 1, 1, 10, 0, 1000)
+        set_ledger(trader, 2, 0, 0, 1000, 500)
+
+        trader._place_order_idempotent.return_value = {
+            **NET_ORDER, "side": "SELL", "origQty": "30.0", "executedQty": "30.0", "cumQuote": "3000.0"
+        }
+
+        trader.trade_pipelines(SYMBOL, {1: -1, 2: -1})
+
+        assert trader._place_order_idempotent.call_args.kwargs["quantity"] == 30
+        assert trader.units == {1: -10, 2: -10}
+
+        close_leg, open_leg = Orders.objects.filter(pipeline_id=1).order_by("transact_time")
+        assert (close_leg.order_id, close_leg.side) == ("42-1-0", "SELL")
+        assert (open_leg.order_id, open_leg.side) == ("42-1-1", "SELL")
+
+    def test_partial_fill_is_pro_rated_and_reported(self, trader):
+        trader._get_symbol_info(SYMBOL)
+        set_ledger(trader, 1, 0, 0, 1000, 1000)
+        set_ledger(trader, 2, 0, 0, 1000, 500)
+
+        trader._place_order_idempotent.return_value = {
+            **NET_ORDER, "status": "EXPIRED", "executedQty": "15.0", "cumQuote": "1500.0"
+        }
+
+        errors = trader.trade_pipelines(SYMBOL, {1: 1, 2: 1})
+
+        assert isinstance(errors[1], BookkeepingFailed)
+        assert isinstance(errors[2], BookkeepingFailed)
+
+        # the sub-ledgers hold what the account holds, not the signal's position
+        assert trader.units == {1: 7.5, 2: 7.5}
+        assert trader.position == {1: 0, 2: 0}
+        assert Orders.objects.get(order_id="42-1-0").executed_qty == 7.5
+
+    def test_shortfall_only_affects_the_legs_on_the_net_side(self, trader):
+        trader._get_symbol_info(SYMBOL)
+        set_ledger(trader, 1, 1, 10, 0, 1000)
+        set_ledger(trader, 2, 0, 0, 1000, 500)
+
+        trader._place_order_idempotent.return_value = {
+            **NET_ORDER, "side": "SELL", "origQty": "10.0", "status": "EXPIRED", "executedQty": "0", "cumQuote": "0"
+        }
+
+        errors = trader.trade_pipelines(SYMBOL, {1: -1, 2: 1})
+
+        # pipeline 2's buy crosses half of pipeline 1's sells
+        assert errors[2] is None
+        assert isinstance(errors[1], BookkeepingFailed)
+        assert trader.units == {1: 0, 2: 10}
+        assert trader.position[2] == 1
+
+    def test_negative_equity_is_returned_per_pipeline(self, trader):
+        trader._get_symbol_info(SYMBOL)
+        set_ledger(trader, 1, 1, 10, -2000, 1000)
+        set_ledger(trader, 2, 0, 0, 1000, 500)
+
+        errors = trader.trade_pipelines(SYMBOL, {1: 0, 2: 1})
+
+        assert isinstance(errors[1], NegativeEquity)
+        assert errors[2] is None
+        assert trader.units == {1: 0, 2: 10}
@@ -0,0 +1,214 @@
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+with pytest.MonkeyPatch().context() as ctx:
+    ctx.setenv("TEST", True)
+    # importing via execution.service first avoids the app <-> trader
+    # circular import (same order as test_order_idempotency.py)
+    from execution.service.helpers.exceptions import SymbolNotBeingTraded  # noqa: F401
+    from execution.exchanges.binance import MarketCache
+
+from shared.utils.exceptions import SymbolInvalid
+
+SYMBOL = "BTCUSDT"
+
+
+@pytest.fixture
+def clock(mocker):
+    clock = mocker.patch("execution.exchanges.binance._market_cache.time.monotonic", return_value=1000)
+    return clock
+
+
+@pytest.fixture
+def client():
+    client = MagicMock()
+    client.validate_symbol.return_value = MagicMock(
+        base="BTC", quote="USDT", price_precision=2, quantity_precision=3
+    )
+    client.futures_symbol_ticker.return_value = {"symbol": SYMBOL, "price": "40000"}
+    client.futures_position_information.return_value = [
+        {"symbol": "ETHUSDT", "positionAmt": "1.5"},
+        {"symbol": SYMBOL, "positionAmt": "-0.2"},
+    ]
+    return client
+
+
+@pytest.fixture
+def market_cache(client, clock):
+    return MarketCache(client, mark_price_ttl=5, position_ttl=30, user_stream_timeout=180)
+
+
+def order_update(client_order_id, status, filled):
+    return {
+        "e": "ORDER_TRADE_UPDATE",
+        "o": {
+            "s": SYMBOL, "c": client_order_id, "S": "BUY", "o": "MARKET", "q": "0.2",
+            "ap": "40000" if filled else "0", "X": status, "i": 8886774,
+            "z": "0.2" if filled else "0", "T": 1693560000000,
+        },
+    }
+
+
+def account_update(symbol, amount):
+    return {"e": "ACCOUNT_UPDATE", "a": {"m": "ORDER", "B": [], "P": [{"s": symbol, "pa": str(amount)}]}}
+
+
+class TestMarketCache:
+
+    def test_symbol_info_is_loaded_once(self, market_cache, client):
+        info = market_cache.get_symbol_info(SYMBOL)
+
+        assert info == {"base": "BTC", "quote": "USDT", "price_precision": 2, "quantity_precision": 3}
+        assert market_cache.get_symbol_info(SYMBOL) == info
+
+        client.validate_symbol.assert_called_once_with(SYMBOL)
+
+    def test_invalid_symbol_is_not_cached(self, market_cache, client):
+        client.validate_symbol.side_effect = SymbolInvalid("XYZ")
+
+        for _ in range(2):
+            with pytest.raises(SymbolInvalid):
+                market_cache.get_symbol_info("XYZ")
+
+        assert client.validate_symbol.call_count == 2
+
+    def test_streamed_mark_price_is_used(self, market_cache, client):
+        market_cache._handle_mark_prices({
+            "stream": "!markPrice@arr@1s",
+            "data": [{"e": "markPriceUpdate", "s": SYMBOL, "p": "41000.5"}],
+        })
+
+        assert market_cache.get_mark_price(SYMBOL) == 41000.5
+        client.futures_symbol_ticker.assert_not_called()
+
+    def test_stale_mark_price_falls_back_to_rest(self, market_cache, client, clock):
+        market_cache._handle_mark_prices([{"s": SYMBOL, "p": "41000.5"}])
+
+        clock.return_value += 5
+
+        assert market_cache.get_mark_price(SYMBOL) == 40000
+        assert market_cache.get_mark_price(SYMBOL) == 40000
+
+        client.futures_symbol_ticker.assert_called_once_with(symbol=SYMBOL)
+
+    def test_stream_errors_are_ignored(self, market_cache, client):
+        market_cache._handle_mark_prices({"e": "error", "m": "Max reconnections 5 reached"})
+
+        assert market_cache.get_mark_price(SYMBOL) == 40000
+
+    def test_streamed_position_is_used(self, market_cache, client):
+        market_cache._handle_user_event(account_update(SYMBOL, 0.5))
+
+        assert market_cache.get_position_amt(SYMBOL) == 0.5
+        client.futures_position_information.assert_not_called()
+
+    def test_position_falls_back_to_rest(self, market_cache, client, clock):
+        market_cache._handle_user_event(account_update(SYMBOL, 0.5))
+
+        clock.return_value += 30
+
+        assert market_cache.get_position_amt(SYMBOL) == -0.2
+        client.futures_position_information.assert_called_once_with(symbol=SYMBOL)
+
+    def test_invalidated_position_is_fetched_again(self, market_cache, client):
+        market_cache._handle_user_event(account_update(SYMBOL, 0.5))
+
+        market_cache.invalidate_position(SYMBOL)
+
+        assert market_cache.get_position_amt(SYMBOL) == -0.2
+
+    def test_unknown_symbol_has_no_position(self, market_cache):
+        assert market_cache.get_position_amt("XYZUSDT") is None
+
+    def test_invalidation_keeps_newer_positions(self, market_cache, clock):
+        market_cache._handle_user_event(account_update(SYMBOL, 0.5))
+
+        market_cache.invalidate_position(SYMBOL, older_than=1000)
+
+        assert market_cache.get_position_amt(SYMBOL) == 0.5
+
+    def test_streamed_order_is_in_rest_format(self, market_cache):
+        market_cache._handle_user_event(order_update("abc", "FILLED", filled=True))
+
+        assert market_cache.get_order("abc") == {
+            "orderId": 8886774,
+            "clientOrderId": "abc",
+            "symbol": SYMBOL,
+            "updateTime": 1693560000000,
+            "avgPrice": "40000",
+            "origQty": "0.2",
+            "executedQty": "0.2",
+            "cumQuote": "8000.0",
+            "status": "FILLED",
+            "type": "MARKET",
+            "side": "BUY",
+        }
+
+    def test_wait_for_order_returns_the_fill(self, market_cache):
+        market_cache._handle_user_event(order_update("abc", "NEW", filled=False))
+
+        threading.Timer(
+            0.05, market_cache._handle_user_event, [order_update("abc", "FILLED", filled=True)]
+        ).start()
+
+        assert market_cache.wait_for_order("abc", timeout=5)["status"] == "FILLED"
+
+    def test_wait_for_order_times_out(self, market_cache):
+        market_cache._handle_user_event(order_update("abc", "NEW", filled=False))
+
+        assert market_cache.wait_for_order("abc", timeout=0.01) is None
+
+    def test_stream_is_up_after_its_first_event(self, market_cache):
+        market_cache._streams = MagicMock()
+        assert not market_cache.streaming
+
+        market_cache._handle_user_event(account_update(SYMBOL, 0.5))
+        assert market_cache.streaming
+
+    def test_stream_error_stops_streaming(self, market_cache):
+        market_cache._streams = MagicMock()
+        market_cache._handle_user_event(account_update(SYMBOL, 0.5))
+
+        market_cache._handle_user_event({"e": "error", "m": "Max reconnections 5 reached"})
+        assert not market_cache.streaming
+
+        market_cache._handle_user_event(account_update(SYMBOL, 0.5))
+        assert market_cache.streaming
+
+    def test_silent_stream_times_out(self, market_cache, clock):
+        market_cache._streams = MagicMock()
+        market_cache._handle_user_event(account_update(SYMBOL, 0.5))
+
+        clock.return_value = 1180
+        assert not market_cache.streaming
+
+    def test_keepalive_extends_the_stream(self, market_cache, client, clock):
+        market_cache._streams = MagicMock()
+        market_cache._handle_user_event(account_update(SYMBOL, 0.5))
+
+        clock.return_value = 1100
+        market_cache._send_user_stream_keepalive()
+
+        clock.return_value = 1200
+        assert market_cache.streaming
+        client.futures_stream_get_listen_key.assert_called_once()
+
+    def test_keepalive_does_not_revive_a_failed_stream(self, market_cache, client):
+        market_cache._streams = MagicMock()
+        market_cache._handle_user_event({"e": "error", "m": "Max reconnections 5 reached"})
+
+        market_cache._send_user_stream_keepalive()
+        assert not market_cache.streaming
+
+    def test_failed_keepalive_does_not_extend_the_stream(self, market_cache, client, clock):
+        market_cache._streams = MagicMock()
+        market_cache._handle_user_event(account_update(SYMBOL, 0.5))
+        client.futures_stream_get_listen_key.side_effect = ConnectionError
+
+        clock.return_value = 1100
+        market_cache._send_user_stream_keepalive()
+
+        clock.return_value = 1200
+        assert not market_cache.streaming
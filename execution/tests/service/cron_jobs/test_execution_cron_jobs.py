@@ -1,8 +1,12 @@
 import pytest
+from django.db import IntegrityError, transaction
 
 import execution.service.blueprints.market_data
+import shared.utils.equity_rollups
 from execution.service.cron_jobs.save_pipelines_snapshot import save_portfolio_value_snapshot, save_pipeline_snapshot
 from execution.tests.setup.fixtures.external_modules import binance_handler_market_data_factory
+from database.model.models import PortfolioTimeSeriesRollup
+from shared.utils.equity_rollups import RESOLUTIONS
 from shared.utils.tests.fixtures.models import *
 
 
@@ -43,7 +47,7 @@ class TestCronJobs:
         [
             pytest.param(
                 [2, 11],
-                {"portfolio_timeseries": 4, "values": [85, 100030]},
+                {"portfolio_timeseries": 4, "values": [100, 100000]},
                 id="pipelines=[2, 11]",
             ),
         ],
@@ -127,6 +131,130 @@ class TestCronJobs:
             entry = PortfolioTimeSeries.objects.filter(pipeline_id=pipeline).last()
             assert entry.value == entry.pipeline.current_equity
 
+    def test_save_portfolio_value_snapshot_single_bulk_insert(
+        self,
+        mocker,
+        test_mock_setup,
+        create_open_position,
+        create_open_position_paper_trading_pipeline,
+    ):
+        spy = mocker.spy(PortfolioTimeSeries.objects, "bulk_create")
+
+        save_portfolio_value_snapshot()
+
+        spy.assert_called_once()
+        assert len(spy.call_args.args[0]) == 4
+
+    def test_save_portfolio_value_snapshot_unrealized_profit_by_pipeline_units(
+        self,
+        test_mock_setup,
+        create_pipeline,
+        create_open_position,
+    ):
+        Position.objects.create(position=1, pipeline_id=1, buying_price=45000, amount=0.3)
+
+        save_portfolio_value_snapshot()
+
+        # pipeline 1 holds all the BTCUSDT units, pipeline 2 none
+        pipeline_1 = PortfolioTimeSeries.objects.get(pipeline_id=1)
+        pipeline_2 = PortfolioTimeSeries.objects.get(pipeline_id=2)
+
+        # the mark price is implied by the account position: -1600 / -0.035
+        assert pipeline_1.value == pytest.approx(pipeline_1.pipeline.current_equity + 0.3 * (1600 / 0.035 - 45000))
+        assert pipeline_2.value == pipeline_2.pipeline.current_equity
+
+    def test_save_portfolio_value_snapshot_opposite_pipeline_positions(
+        self,
+        mocker,
+        test_mock_setup,
+        create_pipeline,
+        create_open_position,
+    ):
+        Position.objects.create(position=1, pipeline_id=1, buying_price=38000, amount=0.3)
+        Pipeline.objects.filter(id=2).update(units=-0.3)
+        Position.objects.filter(pipeline_id=2).update(position=-1, buying_price=41000, amount=0.3)
+
+        # the two legs net the account position to flat
+        mocker.patch.object(
+            execution.service.blueprints.market_data.BinanceHandler,
+            "futures_account",
+            lambda self: {
+                "totalWalletBalance": "1000",
+                "totalUnrealizedProfit": "0",
+                "positions": [
+                    {"symbol": "BTCUSDT", "positionAmt": "0", "notional": "0", "unrealizedProfit": "0"}
+                ],
+            },
+        )
+
+        save_portfolio_value_snapshot()
+
+        pipeline_1 = PortfolioTimeSeries.objects.get(pipeline_id=1)
+        pipeline_2 = PortfolioTimeSeries.objects.get(pipeline_id=2)
+
+        # each leg is valued at the ticker price of 40000
+        assert pipeline_1.value == pytest.approx(pipeline_1.pipeline.current_equity + 600)
+        assert pipeline_2.value == pytest.approx(pipeline_2.pipeline.current_equity + 300)
+
+    def test_save_portfolio_value_snapshot_updates_rollups(
+        self,
+        test_mock_setup,
+        create_open_position,
+        create_open_position_paper_trading_pipeline,
+    ):
+        save_portfolio_value_snapshot()
+        save_portfolio_value_snapshot()
+
+        value = PortfolioTimeSeries.objects.filter(pipeline_id=2).last().value
+
+        # one bucket per resolution for each of the 2 pipelines and 2 accounts
+        assert PortfolioTimeSeriesRollup.objects.count() == 4 * len(RESOLUTIONS)
+
+        for rollup in PortfolioTimeSeriesRollup.objects.filter(pipeline_id=2):
+            assert rollup.count == 2
+            assert rollup.mean == value
+            assert rollup.last == value
+
+    def test_save_pipeline_snapshot_adds_to_a_concurrently_inserted_bucket(
+        self,
+        mocker,
+        test_mock_setup,
+        create_open_position,
+    ):
+        increment = shared.utils.equity_rollups._increment
+
+        def insert_concurrently(key, bucket):
+            # another writer inserts the bucket after it was found missing
+            if not increment(key, bucket):
+                PortfolioTimeSeriesRollup.objects.create(
+                    pipeline_id=key[0], type=key[1], resolution=key[2], time=key[3],
+                    count=1, total=50, last=50, last_time=bucket.last_time,
+                )
+            return False
+
+        mocker.patch.object(shared.utils.equity_rollups, "_increment", side_effect=insert_concurrently)
+
+        save_pipeline_snapshot(2)
+
+        assert PortfolioTimeSeriesRollup.objects.count() == len(RESOLUTIONS)
+
+        for rollup in PortfolioTimeSeriesRollup.objects.all():
+            assert rollup.count == 2
+            assert rollup.total == 50 + rollup.pipeline.current_equity
+
+    def test_rollup_buckets_are_unique(self, create_pipeline):
+        bucket = dict(resolution="5m", time=datetime.datetime(2023, 10, 1, tzinfo=pytz.utc), count=1, total=1, last=1)
+
+        for pipeline_id, type_ in [(1, None), (None, "live")]:
+            PortfolioTimeSeriesRollup.objects.create(
+                pipeline_id=pipeline_id, type=type_, last_time=bucket["time"], **bucket
+            )
+
+            with pytest.raises(IntegrityError), transaction.atomic():
+                PortfolioTimeSeriesRollup.objects.create(
+                    pipeline_id=pipeline_id, type=type_, last_time=bucket["time"], **bucket
+                )
+
     @pytest.mark.parametrize(
         "pipeline,unrealized_profit",
         [
@@ -55,7 +55,7 @@ class TestExecutionService:
 
     @pytest.mark.parametrize(
         "route",
-        ["start_symbol_trading", "stop_symbol_trading", "execute_order"],
+        ["start_symbol_trading", "stop_symbol_trading", "execute_order", "execute_orders"],
     )
     @pytest.mark.parametrize("method", ["get", "put", "delete"])
     def test_routes_disallowed_methods(self, route, method, client):
@@ -374,6 +374,56 @@ class TestExecutionService:
 
         assert res.json == expected_value
 
+    def test_execute_orders_nets_pipelines_of_a_symbol(
+        self,
+        mocker,
+        mock_binance_futures_trader_success,
+        client,
+        exchange_data,
+        create_pipeline,
+        create_pipeline_2,
+        create_inactive_pipeline,
+    ):
+        spy_trade_pipelines = mocker.spy(mock_binance_futures_trader_success, "trade_pipelines")
+
+        orders = [
+            {"pipeline_id": 1, "signal": 1},
+            {"pipeline_id": 2, "signal": -1},
+            {"pipeline_id": 3, "signal": 1},
+        ]
+
+        res = client.post("/execute_orders", json={"orders": orders})
+
+        assert res.json == Responses.ORDERS_EXECUTED({
+            "1": Responses.ORDER_EXECUTION_SUCCESS("BTCUSDT"),
+            "2": Responses.ORDER_EXECUTION_SUCCESS("BTCUSDT"),
+            "3": Responses.PIPELINE_NOT_ACTIVE("Pipeline 3 is not active."),
+        })
+
+        spy_trade_pipelines.assert_called_once()
+        assert spy_trade_pipelines.call_args.args[1] == {1: 1, 2: -1}
+
+    def test_execute_orders_negative_equity(
+        self,
+        mocker,
+        mock_binance_futures_trader_raise_negative_equity_error,
+        client,
+        exchange_data,
+        create_pipeline,
+        create_pipeline_2,
+    ):
+        mocker.patch.object(mock_binance_futures_trader_raise_negative_equity_error, "stop_symbol_trading")
+
+        orders = [{"pipeline_id": 1, "signal": 1}, {"pipeline_id": 2, "signal": 1}]
+
+        res = client.post("/execute_orders", json={"orders": orders})
+
+        assert res.json["responses"]["1"] == Responses.NEGATIVE_EQUITY('Pipeline 1 has reached negative equity.')
+        assert res.json["responses"]["2"] == Responses.NEGATIVE_EQUITY('Pipeline 2 has reached negative equity.')
+
+        # each pipeline that reached negative equity is deactivated on its own
+        assert Pipeline.objects.filter(id__in=[1, 2], active=True).count() == 0
+
     @pytest.mark.parametrize(
         "params,expected_value",
         [
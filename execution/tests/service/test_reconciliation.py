@@ -20,8 +20,8 @@ MARK_PRICE = 120.0
 def make_trader(position_amt, quantity_precision=3):
     trader = MagicMock()
     trader._get_position_amt.return_value = position_amt
-    trader.validate_symbol.return_value = MagicMock(quantity_precision=quantity_precision)
-    trader.futures_symbol_ticker.return_value = {"price": str(MARK_PRICE)}
+    trader.market_cache.get_symbol_info.return_value = {"quantity_precision": quantity_precision}
+    trader.market_cache.get_mark_price.return_value = MARK_PRICE
     trader.futures_account_balance.return_value = [
         {"asset": "USDT", "balance": "1000", "availableBalance": "800"}
     ]
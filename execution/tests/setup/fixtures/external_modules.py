@@ -42,7 +42,7 @@ class MockBinanceHandler(BinanceFuturesTrader):
         if symbol in tickers:
             return {'symbol': symbol, 'price': tickers.get(symbol)}
 
-    def futures_position_information(self):
+    def futures_position_information(self, **kwargs):
         return positions_info
 
     def futures_account(self):
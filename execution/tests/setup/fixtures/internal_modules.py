@@ -25,6 +25,9 @@ class MockBinanceTrader:
         self.raise_leverage_setting_failure = raise_leverage_setting_failure
         self.raise_negative_equity_error = raise_negative_equity_error
 
+    def flush_bookkeeping(self):
+        return True
+
     def start_symbol_trading(self, pipeline_id, header='', **kwargs):
 
         if self.raise_error_start_stop:
@@ -60,6 +63,19 @@ class MockBinanceTrader:
         elif self.raise_negative_equity_error:
             raise NegativeEquity(1)
 
+    def trade_pipelines(self, symbol, signals, headers=None):
+        if self.raise_error_trade:
+            raise BinanceAPIException(
+                '',
+                400,
+                '{"msg": "Precision is over the maximum defined for this asset.", "code": -1111}'
+            )
+
+        return {
+            pipeline_id: NegativeEquity(pipeline_id) if self.raise_negative_equity_error else None
+            for pipeline_id in signals
+        }
+
 
 @pytest.fixture
 def mock_binance_futures_trader_success(mocker):
@@ -0,0 +1 @@
+from model.backtesting._backtest import backtest_pipeline, run_backtest, load_candles
@@ -0,0 +1,41 @@
+import argparse
+import logging
+
+import pandas as pd
+from stratestic.backtesting.helpers.evaluation import log_results
+
+from model.backtesting import backtest_pipeline
+
+
+def parse_date(value):
+    return pd.Timestamp(value, tz="UTC")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m model.backtesting",
+        description="Backtests the strategies of a pipeline over the stored candle history."
+    )
+    parser.add_argument("pipeline_id", type=int)
+    parser.add_argument("--start", type=parse_date, default=None, help="First candle (UTC), e.g. 2021-01-01")
+    parser.add_argument("--end", type=parse_date, default=None, help="Last candle (UTC)")
+    parser.add_argument("--trading-costs", type=float, default=0, help="Per trade, in percent")
+    parser.add_argument("--amount", type=float, default=None, help="Defaults to the pipeline's initial equity")
+
+    args = parser.parse_args()
+
+    backtest = backtest_pipeline(
+        args.pipeline_id, args.start, args.end, trading_costs=args.trading_costs, amount=args.amount
+    )
+
+    if backtest is None:
+        logging.info("No results.")
+        return
+
+    results, _, _ = backtest
+
+    log_results(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+import logging
+
+import numpy as np
+import pandas as pd
+from stratestic.backtesting.helpers import Trade
+from stratestic.backtesting.helpers._equity import calculate_static_equity
+from stratestic.backtesting.helpers.evaluation import (
+    get_returns_results,
+    get_trades_results,
+    get_ratios_results,
+    exposure_time,
+    max_drawdown_pct,
+    avg_drawdown_pct,
+    BUY_AND_HOLD,
+    CUM_SUM_STRATEGY,
+    CUM_SUM_STRATEGY_TC,
+    STRATEGY_RETURNS,
+    STRATEGY_RETURNS_TC,
+    SIDE,
+    CLOSE_DATE,
+)
+
+# initializing the service package first breaks the app <-> strategies import cycle
+import model.service  # noqa: F401  isort: skip
+from model.signal_generation._signal_generation import strategy_combiner
+from shared.data.queries import get_candles
+from shared.utils.helpers import get_pipeline_data
+
+from database.model.models import StructuredData
+
+
+TRADING_DAYS = 365
+
+# the market data used by the strategies: the quote volumes, trade counts and
+# taker volumes are not read
+BACKTEST_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+def load_candles(symbol, interval, exchange='binance', start_date=None, end_date=None):
+    """
+    Reads the stored candle history of a symbol with the columnar candle reader.
+
+    Parameters
+    ----------
+    symbol : str
+    interval : str
+    exchange : str, optional
+    start_date : datetime, optional
+        The earliest open_time to read. If None, the whole history is read.
+    end_date : datetime, optional
+        The latest open_time to read. If None, up to the last stored candle.
+
+    Returns
+    -------
+    pd.DataFrame
+        The OHLCV candles indexed by open_time.
+    """
+    data = get_candles(StructuredData, start_date, symbol, interval, exchange, columns=BACKTEST_COLUMNS)
+
+    if end_date is not None:
+        data = data[data.index <= end_date]
+
+    return data
+
+
+def run_backtest(strategies, strategy_combination, data, amount=1000, leverage=1, trading_costs=0):
+    """
+    Backtests a combination of strategies over a candle history.
+
+    The combination is built with `strategy_combiner`, exactly as for a
+    pipeline's signal, and its positions are computed once over the whole
+    history. Trades, equity and returns are then derived with array
+    operations, following stratestic's vectorized backtester with static
+    shorts, and the results are the metrics reported for the trading bot
+    (get_overview_results, get_returns_results, ...).
+
+    stratestic's own backtester builds its trades and drawdown durations bar
+    by bar in Python, which takes minutes over years of 5m candles; those (and
+    the overview, which converts every close date to an object) are computed
+    here with NumPy instead. Margin calls are not simulated: the equity of a
+    leveraged backtest is only floored at zero.
+
+    Parameters
+    ----------
+    strategies : list of dict
+        The 'name' and 'params' of each strategy.
+    strategy_combination : str
+        "Unanimous" or "Majority".
+    data : pd.DataFrame
+        The candles, indexed by open_time.
+    amount : float, optional
+        The initial equity.
+    leverage : float, optional
+    trading_costs : float, optional
+        The trading costs of each trade, in percent of the traded amount.
+
+    Returns
+    -------
+    tuple
+        The results (pd.Series), the processed data and the list of trades,
+        or None if there are not enough candles to backtest.
+    """
+    combined_strategy = strategy_combiner(strategies, strategy_combination, data)
+
+    data = combined_strategy.data.dropna()
+
+    if len(data) < 2:
+        logging.info("Not enough candles to backtest.")
+        return None
+
+    data = combined_strategy.calculate_positions(data.copy())
+
+    tc = trading_costs / 100
+
+    processed_data, trades = get_processed_data(
+        data,
+        combined_strategy._price_col,
+        combined_strategy._returns_col,
+        combined_strategy._trade_on_close,
+        amount,
+        leverage,
+        tc
+    )
+
+    results = {}
+
+    results = get_overview_results(results, processed_data, leverage, tc, amount)
+
+    results = get_returns_results(results, processed_data, amount, TRADING_DAYS)
+
+    results = get_drawdown_results(results, processed_data)
+
+    results = get_trades_results(results, trades)
+
+    results = get_ratios_results(results, processed_data, trades, TRADING_DAYS)
+
+    return pd.Series(results), processed_data, trades
+
+
+def backtest_pipeline(pipeline_id, start_date=None, end_date=None, trading_costs=0, amount=None):
+    """
+    Backtests the strategies of a pipeline over its stored candle history.
+
+    Parameters
+    ----------
+    pipeline_id : int
+    start_date : datetime, optional
+    end_date : datetime, optional
+    trading_costs : float, optional
+        In percent of the traded amount.
+    amount : float, optional
+        The initial equity. Defaults to the pipeline's initial equity.
+
+    Returns
+    -------
+    tuple or None
+        As returned by `run_backtest`.
+    """
+    pipeline = get_pipeline_data(pipeline_id)
+
+    data = load_candles(pipeline.symbol, pipeline.candle_size, pipeline.exchange, start_date, end_date)
+
+    return run_backtest(
+        pipeline.strategy,
+        pipeline.strategy_combination,
+        data,
+        amount=amount if amount is not None else pipeline.initial_equity,
+        leverage=pipeline.leverage,
+        trading_costs=trading_costs,
+    )
+
+
+def get_processed_data(data, price_col, returns_col, trade_on_close, amount, leverage, tc):
+    """
+    Computes the trades, equity and returns of the positions in `data` (its
+    `side` column, effective from the close of each candle).
+    """
+    side = data[SIDE].to_numpy(dtype=np.int64).copy()
+
+    # a position is opened on the first candle and closed on the last
+    nr_trades = np.abs(np.diff(side, prepend=0))
+    nr_trades[-1] = np.abs(side[-2])
+    side[-1] = 0
+
+    returns = np.nan_to_num(data[returns_col].to_numpy(dtype=np.float64), nan=0.0)
+    returns[0] = 0
+
+    equity = calculate_static_equity(side.astype(np.float64), returns, tc, float(amount), float(leverage))
+
+    price = data[price_col].to_numpy(dtype=np.float64)
+    if not trade_on_close:
+        price = np.append(price[1:], np.nan)
+
+    trades = get_trades(data.index, price, side, nr_trades, amount, leverage, tc)
+
+    # equity is wiped out from the exit of a trade that lost it all
+    wiped_out = trades["equity"] <= 0
+    if wiped_out.any():
+        equity[trades["exit_position"][np.argmax(wiped_out)]:] = 0
+
+    strategy_returns_tc = get_log_returns(equity)
+
+    if tc == 0:
+        strategy_returns = strategy_returns_tc
+    else:
+        strategy_returns = get_log_returns(
+            calculate_static_equity(side.astype(np.float64), returns, 0.0, float(amount), float(leverage))
+        )
+
+    processed_data = data.assign(**{
+        "trades": nr_trades,
+        SIDE: side,
+        returns_col: returns,
+        "equity": equity,
+        STRATEGY_RETURNS_TC: strategy_returns_tc,
+        STRATEGY_RETURNS: strategy_returns,
+        BUY_AND_HOLD: np.exp(np.cumsum(returns)),
+        CUM_SUM_STRATEGY_TC: np.exp(np.cumsum(strategy_returns_tc)),
+        CUM_SUM_STRATEGY: np.exp(np.cumsum(strategy_returns)),
+    })
+
+    processed_data[CLOSE_DATE] = processed_data.index.shift(1, freq=get_index_frequency(processed_data.index))
+
+    # trades entered after the equity is wiped out are not taken
+    no_equity = processed_data.index[processed_data[CUM_SUM_STRATEGY_TC].to_numpy() <= 0]
+    if len(no_equity) > 0:
+        trades = {key: values[trades["entry_date"] < no_equity[0]] for key, values in trades.items()}
+
+    trades_list = [
+        Trade(
+            entry_date=entry_date,
+            exit_date=exit_date,
+            entry_price=float(entry_price),
+            exit_price=float(exit_price),
+            units=float(units),
+            side=int(trade_side),
+            equity=float(trade_equity),
+            amount=float(trade_amount),
+            profit=float(profit),
+            pnl=float(pnl),
+        )
+        for entry_date, exit_date, entry_price, exit_price, units, trade_side, trade_equity, trade_amount, profit, pnl
+        in zip(
+            trades["entry_date"], trades["exit_date"], trades["entry_price"], trades["exit_price"], trades["units"],
+            trades["side"], trades["equity"], trades["amount"], trades["profit"], trades["pnl"],
+        )
+    ]
+
+    return processed_data, trades_list
+
+
+def get_trades(index, price, side, nr_trades, amount, leverage, tc):
+    """
+    The trades of a series of positions, as columns: each trade is entered on
+    a candle where the position changes to a non-flat side, and exited on the
+    next change of position.
+    """
+    positions = np.flatnonzero(nr_trades)
+
+    entry_price_raw = price[positions]
+    exit_price_raw = np.append(entry_price_raw[1:], np.nan)
+    exit_position = np.append(positions[1:], -1)
+
+    entered = side[positions] != 0
+
+    positions, entry_price_raw, exit_price_raw, exit_position = (
+        positions[entered], entry_price_raw[entered], exit_price_raw[entered], exit_position[entered]
+    )
+    trade_side = side[positions]
+
+    # a still-open last trade is force-closed on the final close price
+    exit_price_raw = np.where(np.isnan(exit_price_raw), price[-1], exit_price_raw)
+
+    complete = (exit_position >= 0) & ~np.isnan(entry_price_raw) & ~np.isnan(exit_price_raw)
+
+    positions, entry_price_raw, exit_price_raw, exit_position, trade_side = (
+        positions[complete], entry_price_raw[complete], exit_price_raw[complete],
+        exit_position[complete], trade_side[complete]
+    )
+
+    # fixed-units pnl, with the trading costs charged on each leg
+    ratio = exit_price_raw / entry_price_raw
+    pnl = leverage * (trade_side * (ratio - 1) - tc * (1 + ratio)) / (1 + tc * trade_side)
+    pnl = np.maximum(pnl, -1.0)
+
+    equity = amount * np.cumprod(1 + pnl)
+
+    wiped_out = np.flatnonzero(equity <= 0)
+    if len(wiped_out) > 0:
+        equity[wiped_out[0]:] = 0
+        pnl[wiped_out[0] + 1:] = 0
+
+    trade_amount = equity * leverage
+
+    entry_price = entry_price_raw * (1 + tc * trade_side)
+
+    return dict(
+        entry_date=index[positions],
+        exit_date=index[exit_position],
+        exit_position=exit_position,
+        entry_price=entry_price,
+        exit_price=exit_price_raw * (1 - tc * trade_side),
+        units=np.append(amount * leverage, trade_amount[:-1]) / entry_price,
+        side=trade_side,
+        equity=equity,
+        amount=trade_amount,
+        profit=np.diff(equity, prepend=amount),
+        pnl=pnl,
+    )
+
+
+def get_overview_results(results, data, leverage, trading_costs, amount):
+    """
+    Same metrics as stratestic's get_overview_results, reading the first and
+    last dates directly.
+    """
+    end_date = data[CLOSE_DATE].iloc[-1]
+
+    results["total_duration"] = end_date - data.index[0]
+    results["start_date"] = data.index[0]
+    results["end_date"] = end_date
+
+    results["leverage"] = leverage
+    results["trading_costs"] = trading_costs * 100
+
+    results["equity_initial"] = amount
+    results["traded_amount"] = amount * leverage
+
+    results["exposure_time"] = exposure_time(data[SIDE])
+
+    return results
+
+
+def get_drawdown_results(results, data):
+    """
+    Same metrics as stratestic's get_drawdown_results, with the drawdown
+    durations computed on arrays.
+    """
+    cum_returns = data[CUM_SUM_STRATEGY_TC]
+
+    results["max_drawdown"] = max_drawdown_pct(cum_returns)
+    results["avg_drawdown"] = avg_drawdown_pct(cum_returns)
+
+    values = cum_returns.to_numpy()
+    start_dates = data.index
+    end_dates = pd.DatetimeIndex(data[CLOSE_DATE])
+
+    # a candle is a new peak if it is above every candle before it
+    is_peak = np.empty(len(values), dtype=bool)
+    is_peak[0] = True
+    is_peak[1:] = values[1:] > np.fmax.accumulate(values)[:-1]
+
+    positions = np.arange(len(values))
+    peak_position = np.maximum.accumulate(np.where(is_peak, positions, 0))
+
+    # longest stretch below a peak, counted in candles
+    lengths = np.where(is_peak, 0, positions - peak_position)
+    longest = np.argmax(lengths)
+
+    if lengths[longest] > 0:
+        results["max_drawdown_duration"] = end_dates[longest] - start_dates[peak_position[longest]]
+    else:
+        results["max_drawdown_duration"] = start_dates[-1] - start_dates[0]
+
+    # each run of candles below a peak is a drawdown, which lasts until the
+    # close of its last candle
+    drawdown_ends = np.flatnonzero(~is_peak & np.append(is_peak[1:], True))
+
+    if len(drawdown_ends) > 0:
+        durations = end_dates[drawdown_ends] - start_dates[peak_position[drawdown_ends]]
+        results["avg_drawdown_duration"] = np.mean(durations.total_seconds().to_numpy())
+    else:
+        results["avg_drawdown_duration"] = 0
+
+    return results
+
+
+def get_log_returns(equity):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_returns = np.log(equity[1:] / equity[:-1])
+
+    return np.concatenate(([0.0], np.where(np.isnan(log_returns), 0.0, log_returns)))
+
+
+def get_index_frequency(index):
+    frequency = index.inferred_freq
+
+    if frequency is None:
+        frequency = pd.Series(index).diff().dropna().mode().iloc[0]
+
+    return frequency
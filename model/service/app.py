@@ -16,7 +16,7 @@ from rq.job import Job
 from model.service.cloud_storage import cloud_storage_startup
 from model.service.helpers.decorators.handle_app_errors import handle_app_errors
 from model.service.helpers.responses import Responses
-from model.strategies.properties import compile_strategies
+from model.strategies import strategy_catalog
 from model.worker import conn
 import shared.exchanges.binance.constants as const
 from shared.utils.settings import settings
@@ -47,6 +47,7 @@ q = Queue(connection=conn)
 JOB_FAILURE_TTL = int(timedelta(days=7).total_seconds())
 
 SIGNAL_FAILURE_CALLBACK = "model.signal_generation._signal_generation.signal_failure_handler"
+SIGNAL_SUCCESS_CALLBACK = "model.signal_generation._signal_generation.signal_success_handler"
 
 
 def warn_if_no_workers():
@@ -72,6 +73,33 @@ def warn_if_no_workers():
     return False
 
 
+def get_signal_job_args(pipeline_id):
+    """Returns the pipeline dict, logging header and ttl of a pipeline's signal job."""
+
+    pipeline = get_pipeline_data(pipeline_id)
+
+    header = json.loads(get_item_from_cache(cache, pipeline_id))
+
+    pipeline_dict = dict(
+        id=pipeline.id,
+        strategies=pipeline.strategy,
+        strategy_combination=pipeline.strategy_combination,
+        symbol=pipeline.symbol,
+        exchange=pipeline.exchange,
+        interval=pipeline.candle_size
+    )
+
+    # the job computes its own staleness deadline from this timestamp -
+    # a late-starting job must discard the signal, not fire a stale order
+    pipeline_dict["enqueued_at"] = datetime.now(tz=pytz.utc).isoformat()
+
+    # a job that hasn't started within one candle period is superseded by
+    # the next candle's job - discard it instead of firing a stale order
+    ttl = int(timedelta(**const.CANDLE_SIZE_TIMEDELTA[pipeline.candle_size]).total_seconds())
+
+    return pipeline_dict, header, ttl
+
+
 def create_app():
 
     app = Flask(__name__)
@@ -81,6 +109,9 @@ def create_app():
 
     cloud_storage_startup()
 
+    # compiled at startup rather than by the first request
+    strategy_catalog.refresh()
+
     @app.route('/')
     @jwt_required()
     def hello_world():
@@ -100,26 +131,7 @@ def create_app():
 
         pipeline_id = request_data.get("pipeline_id", None)
 
-        pipeline = get_pipeline_data(pipeline_id)
-
-        header = json.loads(get_item_from_cache(cache, pipeline_id))
-
-        pipeline_dict = dict(
-            id=pipeline.id,
-            strategies=pipeline.strategy,
-            strategy_combination=pipeline.strategy_combination,
-            symbol=pipeline.symbol,
-            exchange=pipeline.exchange,
-            interval=pipeline.candle_size
-        )
-
-        # the job computes its own staleness deadline from this timestamp -
-        # a late-starting job must discard the signal, not fire a stale order
-        pipeline_dict["enqueued_at"] = datetime.now(tz=pytz.utc).isoformat()
-
-        # a job that hasn't started within one candle period is superseded by
-        # the next candle's job - discard it instead of firing a stale order
-        ttl = int(timedelta(**const.CANDLE_SIZE_TIMEDELTA[pipeline.candle_size]).total_seconds())
+        pipeline_dict, header, ttl = get_signal_job_args(pipeline_id)
 
         warn_if_no_workers()
 
@@ -131,6 +143,7 @@ def create_app():
             ),
             ttl=ttl,
             failure_ttl=JOB_FAILURE_TTL,
+            on_success=Callback(SIGNAL_SUCCESS_CALLBACK),
             on_failure=Callback(SIGNAL_FAILURE_CALLBACK),
         )
 
@@ -138,6 +151,56 @@ def create_app():
 
         return jsonify(Responses.SIGNAL_GENERATION_INPROGRESS(job_id))
 
+    @app.route('/generate_signals', methods=['POST'])
+    @handle_app_errors
+    @jwt_required()
+    @handle_db_connection_error
+    def generate_signals():
+        """
+        Batch version of /generate_signal: the pipelines that share a symbol, exchange
+        and interval are evaluated by a single job, which reads the candles once.
+        Responds with the job of each pipeline.
+        """
+
+        bearer_token = request.headers.get('Authorization')
+
+        request_data = request.get_json(force=True)
+
+        logging.debug(request_data)
+
+        batches = {}
+
+        for pipeline_id in request_data.get("pipeline_ids", []):
+            pipeline_dict, header, ttl = get_signal_job_args(pipeline_id)
+
+            key = (pipeline_dict["symbol"], pipeline_dict["exchange"], pipeline_dict["interval"])
+
+            pipelines, headers, _ = batches.setdefault(key, ([], {}, ttl))
+
+            pipelines.append(pipeline_dict)
+            headers[str(pipeline_id)] = header
+
+        warn_if_no_workers()
+
+        job_ids = {}
+
+        for pipelines, headers, ttl in batches.values():
+            job = q.enqueue_call(
+                "model.signal_generation._signal_generation.batch_signal_generator", (
+                    pipelines,
+                    bearer_token,
+                    headers
+                ),
+                ttl=ttl,
+                failure_ttl=JOB_FAILURE_TTL,
+                on_success=Callback(SIGNAL_SUCCESS_CALLBACK),
+                on_failure=Callback(SIGNAL_FAILURE_CALLBACK),
+            )
+
+            job_ids.update({str(pipeline["id"]): job.get_id() for pipeline in pipelines})
+
+        return jsonify(Responses.SIGNALS_GENERATION_INPROGRESS(job_ids))
+
     @app.route('/check_job/<job_id>', methods=['GET'])
     @jwt_required()
     @handle_db_connection_error
@@ -171,8 +234,13 @@ def create_app():
     @jwt_required()
     @handle_db_connection_error
     def get_strategies():
-        strategies = compile_strategies()
-        return jsonify(strategies)
+        strategies, version = strategy_catalog.get()
+
+        response = jsonify(strategies)
+        response.set_etag(version)
+
+        # 304 Not Modified if the client already has this version
+        return response.make_conditional(request)
 
     return app
 
@@ -1,3 +1,4 @@
 from model.service.cloud_storage._cloud_storage import (
     upload_models, download_models, check_aws_config, get_saved_models, cloud_storage_startup
 )
+from model.service.cloud_storage._model_sync import ModelSync, start_model_sync
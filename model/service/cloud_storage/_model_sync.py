@@ -0,0 +1,187 @@
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import time
+
+import model.service.cloud_storage._cloud_storage as cloud_storage
+from model.service.cloud_storage._download import list_files
+from model.service.cloud_storage._upload import upload_file
+
+# synced state of the models directory: content hash, size and mtime of each
+# model file, as of its last upload or download
+MANIFEST_FILENAME = ".manifest.json"
+
+# a model file modified more recently than this may still be being written:
+# it is picked up by a later pass
+SETTLE_SECONDS = 5
+
+
+def hash_file(path):
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+class ModelSync:
+    """
+    Keeps the local models directory and the S3 bucket in sync in the
+    background, so that signal jobs never wait on S3.
+
+    Every `interval` seconds, the directory is scanned (an mtime index: only
+    files whose size or mtime changed since the last pass are hashed). New
+    model files, and files whose content changed since they were last synced,
+    are uploaded; models that are in the bucket but not in the directory are
+    downloaded, to a temporary file renamed into place once complete. The
+    content hash of each synced file is kept in a manifest in the directory.
+
+    Parameters
+    ----------
+    local_models_dir : str
+    interval : int
+        Seconds between two passes.
+    """
+
+    def __init__(self, local_models_dir, interval):
+        self.local_models_dir = local_models_dir
+        self.interval = interval
+
+        self._process = None
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.local_models_dir, MANIFEST_FILENAME)
+
+    def start(self):
+        """Runs the sync in a background process."""
+        if self._process is not None and self._process.is_alive():
+            return
+
+        # spawned, not forked: the callers run threads (and the RQ worker forks)
+        self._process = multiprocessing.get_context("spawn").Process(
+            target=run_model_sync, args=(self.local_models_dir, self.interval), name="model-sync", daemon=True
+        )
+        self._process.start()
+
+    def stop(self):
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._process = None
+
+    def run(self):
+        while True:
+            try:
+                self.sync()
+            except Exception as e:
+                logging.warning(f"Model sync failed: {e!r}. Retrying in {self.interval}s.")
+
+            time.sleep(self.interval)
+
+    def sync(self):
+        """
+        One pass of the sync.
+
+        Returns
+        -------
+        tuple
+            The names of the uploaded and downloaded files.
+        """
+        manifest = self._load_manifest()
+
+        local_files = {
+            entry.name: entry.stat()
+            for entry in os.scandir(self.local_models_dir)
+            if entry.is_file() and '.pkl' in entry.name and not entry.name.endswith(".part")
+        }
+
+        cloud_files = {
+            filename for filename in list_files(cloud_storage.s3, cloud_storage.bucket)
+            if '.pkl' in filename
+        }
+
+        now = time.time()
+
+        uploaded = []
+
+        for filename, stat in local_files.items():
+            record = manifest.get(filename)
+
+            if record is not None and (record["size"], record["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+                continue
+
+            if now - stat.st_mtime < SETTLE_SECONDS:
+                continue
+
+            sha256 = hash_file(os.path.join(self.local_models_dir, filename))
+
+            if filename not in cloud_files or (record is not None and record["sha256"] != sha256):
+                logging.info(f"Uploading model {filename}")
+                upload_file(cloud_storage.s3, cloud_storage.bucket, self.local_models_dir, filename)
+                uploaded.append(filename)
+
+            manifest[filename] = dict(sha256=sha256, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+
+        downloaded = []
+
+        for filename in cloud_files.difference(local_files):
+            path = os.path.join(self.local_models_dir, filename)
+
+            logging.info(f"Downloading model {filename}")
+
+            cloud_storage.s3.download_file(cloud_storage.bucket, filename, path + ".part")
+            os.replace(path + ".part", path)
+
+            stat = os.stat(path)
+            manifest[filename] = dict(sha256=hash_file(path), size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+            downloaded.append(filename)
+
+        for filename in set(manifest).difference(local_files, downloaded):
+            del manifest[filename]
+
+        self._save_manifest(manifest)
+
+        return uploaded, downloaded
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self, manifest):
+        with open(self.manifest_path + ".tmp", "w") as f:
+            json.dump(manifest, f)
+
+        os.replace(self.manifest_path + ".tmp", self.manifest_path)
+
+
+def run_model_sync(local_models_dir, interval):
+    """Entrypoint of the model sync process."""
+    ModelSync(local_models_dir, interval).run()
+
+
+model_sync = None
+
+
+def start_model_sync(local_models_dir, interval):
+    """Starts the background model sync of this process, if cloud storage is enabled."""
+    global model_sync
+
+    cloud_storage.cloud_storage_startup()
+
+    if os.getenv("USE_CLOUD_STORAGE") != "True":
+        return None
+
+    if model_sync is None:
+        model_sync = ModelSync(local_models_dir, interval)
+
+    model_sync.start()
+
+    return model_sync
@@ -1,11 +1,13 @@
 import logging
 import os
 
-import requests
-
 from model.service.helpers import EXECUTION_APP_ENDPOINTS
 from shared.utils.decorators import json_error_handler
 from shared.utils.decorators import retry_failed_connection
+from shared.utils.http_client import get_session
+
+
+execution_app = get_session("execution")
 
 
 @json_error_handler
@@ -23,7 +25,28 @@ def execute_order(pipeline_id, signal, bearer_token, header=''):
 
     logging.info(header + f"Sending {side} order with signal {signal}.")
 
-    r = requests.post(url, json=payload, headers={"Authorization": bearer_token}, timeout=(5, 60))
+    r = execution_app.post("EXECUTE_ORDER", url, json=payload, headers={"Authorization": bearer_token}, timeout=(5, 60))
+    logging.debug(r.text)
+
+    response = r.json()
+    logging.debug(response["message"])
+
+    return response
+
+
+@json_error_handler
+@retry_failed_connection(num_times=3)
+def execute_orders(signals, bearer_token, header=''):
+
+    url = EXECUTION_APP_ENDPOINTS["EXECUTE_ORDERS"](os.getenv("EXECUTION_APP_URL"))
+
+    payload = {
+        "orders": [{"pipeline_id": pipeline_id, "signal": signal} for pipeline_id, signal in signals.items()],
+    }
+
+    logging.info(header + f"Sending the orders of pipelines {', '.join(str(pipeline_id) for pipeline_id in signals)}.")
+
+    r = execution_app.post("EXECUTE_ORDERS", url, json=payload, headers={"Authorization": bearer_token}, timeout=(5, 60))
     logging.debug(r.text)
 
     response = r.json()
@@ -6,6 +6,7 @@ APP_NAME = os.getenv("APP_NAME")
 
 EXECUTION_APP_ENDPOINTS = {
     "EXECUTE_ORDER": lambda host_url: f"{host_url}/execute_order",
+    "EXECUTE_ORDERS": lambda host_url: f"{host_url}/execute_orders",
 }
 STRATESTIC_STRATEGIES_LOCATION = "stratestic.strategies"
 LOCAL_STRATEGIES_LOCATION = "model.strategies"
@@ -6,6 +6,7 @@ RESPONSES = namedtuple(
     [
         "STRATEGY_INVALID",
         "SIGNAL_GENERATION_INPROGRESS",
+        "SIGNALS_GENERATION_INPROGRESS",
         "NO_SUCH_PIPELINE",
         "JOB_NOT_FOUND",
         "FINISHED",
@@ -19,6 +20,7 @@ RESPONSES = namedtuple(
 ReturnCodes = RESPONSES(
     STRATEGY_INVALID="STRATEGY_INVALID",
     SIGNAL_GENERATION_INPROGRESS="SIGNAL_GENERATION_INPROGRESS",
+    SIGNALS_GENERATION_INPROGRESS="SIGNALS_GENERATION_INPROGRESS",
     NO_SUCH_PIPELINE="NO_SUCH_PIPELINE",
     JOB_NOT_FOUND="JOB_NOT_FOUND",
     FINISHED="FINISHED",
@@ -40,6 +42,12 @@ Responses = RESPONSES(
         "message": f"Signal generation process started.",
         "job_id": job_id
     },
+    SIGNALS_GENERATION_INPROGRESS=lambda job_ids: {
+        "code": ReturnCodes.SIGNALS_GENERATION_INPROGRESS,
+        "success": True,
+        "message": f"Signal generation process started.",
+        "job_ids": job_ids
+    },
     NO_SUCH_PIPELINE=lambda message: {
         "code": ReturnCodes.NO_SUCH_PIPELINE,
         "success": False,
@@ -1,2 +1,5 @@
-from model.signal_generation._signal_generation import signal_generator, trigger_order
+from model.signal_generation._signal_generation import signal_generator, batch_signal_generator, trigger_order, trigger_orders
 from model.signal_generation._helpers import convert_signal_to_text, strategies_defaults
+from model.signal_generation._candle_cache import CandleCache, candle_cache
+from model.signal_generation._strategy_cache import StrategyCache, strategy_cache
+from model.signal_generation._model_store import ModelStore, MappedMachineLearning, model_store
@@ -0,0 +1,121 @@
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+import shared.exchanges.binance.constants as const
+from shared.data.queries import get_candles
+from shared.utils.settings import settings
+
+
+class _Entry:
+
+    __slots__ = ("data", "max_rows", "nbytes")
+
+    def __init__(self, data, max_rows):
+        self.data = data
+        self.max_rows = max_rows
+        self.nbytes = int(data.memory_usage(index=True).sum())
+
+
+class CandleCache:
+    """
+    In-process LRU cache of the candles read by the signal generation jobs.
+
+    Entries are keyed by (exchange, symbol, interval). Between two jobs of a
+    pipeline only the latest candle changes, so a cached entry is refreshed by
+    reading the rows from its last cached candle onwards (the last candle is
+    re-read because it may have been updated since) instead of the whole
+    lookback window. An entry whose span is missing candles is read again as
+    a whole if the database has since got more candles over that span (a
+    backfill): the holes that are never filled do not cost a full read. Least recently
+    used entries are evicted once the cached frames exceed the memory budget.
+    """
+
+    def __init__(self, max_bytes=None):
+        self.max_bytes = max_bytes if max_bytes is not None else settings.candle_cache_max_mb * 1024 ** 2
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size(self):
+        """Memory used by the cached frames, in bytes."""
+        return sum(entry.nbytes for entry in self._entries.values())
+
+    def get_candles(self, model_class, start_date, symbol, interval, exchange='binance'):
+        """
+        Same as shared.data.queries.get_candles, served from the cache.
+
+        Returns
+        -------
+        pd.DataFrame
+            A copy of the cached candles from start_date onwards, so the
+            caller may modify it freely.
+        """
+        key = (model_class.__name__, exchange, symbol, interval)
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+        if (
+            entry is not None
+            and len(entry.data) > 0
+            and (start_date is None or entry.data.index[0] <= start_date)
+            and not self._is_backfilled(entry.data, model_class, symbol, interval, exchange)
+        ):
+            cached = entry.data
+
+            tail = get_candles(model_class, cached.index[-1], symbol, interval, exchange)
+
+            data = pd.concat([cached[cached.index < cached.index[-1]], tail])
+            max_rows = entry.max_rows
+        else:
+            data = get_candles(model_class, start_date, symbol, interval, exchange)
+            max_rows = 0
+
+        requested = data[data.index >= start_date] if start_date is not None else data
+
+        # keep as many candles as the longest lookback requested for this key
+        max_rows = max(max_rows, len(requested))
+
+        self._store(key, _Entry(data.iloc[-max_rows:] if max_rows > 0 else data, max_rows))
+
+        return requested.copy()
+
+    @staticmethod
+    def _is_backfilled(data, model_class, symbol, interval, exchange):
+        # the tail read only covers the candles after the last cached one:
+        # candles missing in between may have been inserted since
+        frequency = pd.Timedelta(const.CANDLE_SIZES_MAPPER.get(interval, interval))
+
+        if len(data) < 2 or (data.index[-1] - data.index[0]) // frequency + 1 <= len(data):
+            return False
+
+        # the cached span has holes: only the ones filled since cost a full read
+        return model_class.objects.filter(
+            exchange=exchange,
+            symbol=symbol,
+            interval=interval,
+            open_time__gte=data.index[0],
+            open_time__lte=data.index[-1],
+        ).count() > len(data)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _store(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+
+            # the entry just stored is kept even if it alone exceeds the budget
+            while len(self._entries) > 1 and self.size > self.max_bytes:
+                self._entries.popitem(last=False)
+
+
+candle_cache = CandleCache()
@@ -0,0 +1,143 @@
+import logging
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+import dill
+import joblib
+from stratestic.strategies import MachineLearning
+
+from shared.utils.settings import settings
+
+# converted models are kept in a subdirectory, which the model sync and the
+# saved models listing (top-level *.pkl files) do not see
+MAPPED_MODELS_DIR = ".mmap"
+
+# rebuilt by MachineLearning.__init__ (and holds lambdas, which joblib cannot pickle)
+EXCLUDED_ATTRIBUTES = {"params"}
+
+
+class ModelStore:
+    """
+    Loads the models saved by MachineLearning strategies (dill pickles of the
+    whole strategy) for the worker processes.
+
+    The first time a model is loaded, its attributes are converted to a joblib
+    file next to it, which is loaded with mmap_mode="r": its NumPy arrays
+    (training / test sets, linear coefficients, ...) are memory-mapped
+    read-only, so the workers of a host share their pages instead of holding
+    a copy each. The loaded models are kept in a per-process LRU, so that
+    repeated jobs skip deserialization altogether. A model that is saved
+    again (a newer mtime) is converted and loaded again.
+
+    Models that joblib cannot pickle are loaded from the dill file, and still
+    kept in the LRU.
+
+    Parameters
+    ----------
+    max_models : int
+        Number of loaded models kept per process.
+    """
+
+    def __init__(self, max_models):
+        self.max_models = max_models
+
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._models)
+
+    def get(self, models_dir, filename):
+        """
+        The attributes of a saved MachineLearning strategy.
+
+        Returns
+        -------
+        dict
+            Shared between the callers: must not be modified in place.
+        """
+        path = os.path.abspath(os.path.join(models_dir, filename))
+
+        key = (path, os.stat(path).st_mtime_ns)
+
+        with self._lock:
+            attributes = self._models.get(key)
+
+            if attributes is not None:
+                self._models.move_to_end(key)
+                return attributes
+
+        attributes = self._load(path)
+
+        with self._lock:
+            # drop the entry of a previous version of the file
+            for stale_key in [k for k in self._models if k[0] == path]:
+                del self._models[stale_key]
+
+            self._models[key] = attributes
+
+            while len(self._models) > self.max_models:
+                self._models.popitem(last=False)
+
+        return attributes
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+
+    @staticmethod
+    def get_mapped_path(path):
+        directory, filename = os.path.split(path)
+        return os.path.join(directory, MAPPED_MODELS_DIR, os.path.splitext(filename)[0] + ".joblib")
+
+    def _load(self, path):
+        mapped_path = self.get_mapped_path(path)
+
+        if not os.path.exists(mapped_path) or os.stat(mapped_path).st_mtime_ns < os.stat(path).st_mtime_ns:
+            try:
+                self._convert(path, mapped_path)
+            except (pickle.PicklingError, TypeError, AttributeError) as e:
+                logging.warning(f"Model {os.path.basename(path)} cannot be memory-mapped ({e!r}).")
+                return self._read_attributes(path)
+
+        return joblib.load(mapped_path, mmap_mode="r")
+
+    def _convert(self, path, mapped_path):
+        attributes = self._read_attributes(path)
+
+        os.makedirs(os.path.dirname(mapped_path), exist_ok=True)
+
+        # the workers may convert the same model at once: write to a file of
+        # their own and rename it into place
+        tmp_path = f"{mapped_path}.{os.getpid()}.tmp"
+
+        try:
+            joblib.dump(attributes, tmp_path)
+            os.replace(tmp_path, mapped_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @staticmethod
+    def _read_attributes(path):
+        with open(path, "rb") as f:
+            strategy = dill.load(f)
+
+        return {key: value for key, value in strategy.__dict__.items() if key not in EXCLUDED_ATTRIBUTES}
+
+
+model_store = ModelStore(settings.model_store_max_models)
+
+
+class MappedMachineLearning(MachineLearning):
+    """MachineLearning strategy whose saved model is loaded through the model store."""
+
+    def load_model(self):
+        original_file_name = self._load_model
+
+        self.__dict__.update(model_store.get(self._models_dir, self._load_model))
+        self._load_model = original_file_name
+
+        return self._get_data()
@@ -13,18 +13,20 @@ from stratestic.strategies import *
 from stratestic.strategies._mixin import StrategyMixin
 
 from model.strategies import *
-from model.service.helpers import LOCAL_MODELS_LOCATION
-from model.service.cloud_storage import upload_models
-from model.service.external_requests import execute_order
+from model.service.helpers.responses import Responses
+from model.service.external_requests import execute_order, execute_orders
+from model.signal_generation._candle_cache import candle_cache
+from model.signal_generation import _model_store
+from model.signal_generation._strategy_cache import strategy_cache
 from model.signal_generation._exceptions import OrderDeliveryError, StaleSignal
 from model.signal_generation._helpers import convert_signal_to_text, strategies_defaults
 import shared.exchanges.binance.constants as const
+from shared.utils.job_results import publish_job_result
 from shared.utils.notifier import send_alert
 from shared.utils.settings import settings
 from shared.utils.exceptions import StrategyInvalid
 from shared.utils.helpers import get_pipeline_max_window, get_minimum_lookback_date
 from shared.utils.logger import configure_logger
-from shared.data.queries import get_data
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "database.settings")
 django.setup()
@@ -48,6 +50,8 @@ def get_strategy_class(name):
             cls_name: obj for cls_name, obj in globals().items()
             if isinstance(obj, type) and issubclass(obj, StrategyMixin) and obj is not StrategyMixin
         }
+        # saved models are loaded through the (memory-mapped, cached) model store
+        _strategy_registry["MachineLearning"] = _model_store.MappedMachineLearning
 
     try:
         return _strategy_registry[name]
@@ -133,21 +137,121 @@ def signal_generator(pipeline, bearer_token, header=''):
     """
     deadline = compute_delivery_deadline(pipeline)
 
-    max_window = get_pipeline_max_window(pipeline["id"], settings.default_min_rows)
-
-    start_date = get_minimum_lookback_date(max_window, pipeline["interval"])
+    start_date = get_lookback_start_date(pipeline)
 
-    data = get_data(StructuredData, start_date, pipeline["symbol"], pipeline["interval"], pipeline["exchange"])
+    data = candle_cache.get_candles(
+        StructuredData, start_date, pipeline["symbol"], pipeline["interval"], pipeline["exchange"]
+    )
 
     if len(data) == 0:
         logging.debug(header + f"Empty DataFrame, aborting.")
         return False
 
-    combined_strategy = strategy_combiner(pipeline["strategies"], pipeline["strategy_combination"], data)
+    combined_strategy = strategy_cache.get(pipeline, data, strategy_combiner)
+
+    return deliver_signal(pipeline, combined_strategy, bearer_token, deadline, header=header)
+
+
+def batch_signal_generator(pipelines, bearer_token, headers=None):
+    """
+    Generates and delivers the signals of several pipelines that trade the same
+    symbol at the same interval, for the same closed candle.
+
+    The candles are read once for the longest lookback among the pipelines and
+    every pipeline's strategy combination is evaluated on its own lookback
+    window of that data, exactly as `signal_generator` would.
+
+    Parameters
+    ----------
+    pipelines : list of dict
+        The pipeline configurations, as passed to `signal_generator`. All must
+        share the same symbol, exchange and interval.
+    bearer_token : str
+        The authentication token required for executing orders through the external trading service.
+    headers : dict, optional
+        Logging prefix of each pipeline, keyed by the pipeline id as a string.
+
+    Returns
+    -------
+    dict
+        The result of each pipeline, keyed by the pipeline id as a string: True if the
+        order was executed successfully, False otherwise. A pipeline that fails
+        is alerted on and reported as False without affecting the others.
+    """
+    headers = headers or {}
+
+    if len(pipelines) == 0:
+        return {}
+
+    # all pipelines of a batch are enqueued together
+    deadline = compute_delivery_deadline(pipelines[0])
+
+    start_dates = {pipeline["id"]: get_lookback_start_date(pipeline) for pipeline in pipelines}
+
+    reference = pipelines[0]
+
+    data = candle_cache.get_candles(
+        StructuredData, min(start_dates.values()), reference["symbol"], reference["interval"], reference["exchange"]
+    )
+
+    results = {str(pipeline["id"]): False for pipeline in pipelines}
+    strategies = {}
+
+    for pipeline in pipelines:
+        header = headers.get(str(pipeline["id"]), '')
+
+        pipeline_data = data[data.index >= start_dates[pipeline["id"]]]
+
+        if len(pipeline_data) == 0:
+            logging.debug(header + f"Empty DataFrame, aborting.")
+            continue
+
+        try:
+            strategies[pipeline["id"]] = strategy_cache.get(pipeline, pipeline_data, strategy_combiner)
+        except Exception as e:
+            logging.exception(header + f"Could not evaluate the strategies: {e!r}")
+            alert_signal_failure(pipeline["id"], type(e), e, job_failed=False)
+
+    if len(strategies) == 1:
+        pipeline = next(pipeline for pipeline in pipelines if pipeline["id"] in strategies)
+        header = headers.get(str(pipeline["id"]), '')
+
+        try:
+            results[str(pipeline["id"])] = deliver_signal(
+                pipeline, strategies[pipeline["id"]], bearer_token, deadline, header=header
+            )
+        except Exception as e:
+            logging.exception(header + f"Could not deliver the signal: {e!r}")
+            alert_signal_failure(pipeline["id"], type(e), e, job_failed=False)
+
+    elif len(strategies) > 1:
+        # one request for the whole batch, so that the execution service can net
+        # the orders of the pipelines into a single exchange order
+        signals = {}
+        for pipeline_id, strategy in strategies.items():
+            signals[pipeline_id] = strategy.get_signal()
+
+            logging.debug(
+                headers.get(str(pipeline_id), '') + f"{convert_signal_to_text(signals[pipeline_id])} signal generated."
+            )
+
+        try:
+            for pipeline_id, result in trigger_orders(signals, bearer_token, deadline=deadline).items():
+                results[str(pipeline_id)] = result
+        except Exception as e:
+            logging.exception(f"Could not deliver the signals of pipelines {list(signals)}: {e!r}")
+            alert_signal_failure(", ".join(str(pipeline_id) for pipeline_id in signals), type(e), e, job_failed=False)
+
+    return results
+
+
+def get_lookback_start_date(pipeline):
+    max_window = get_pipeline_max_window(pipeline["id"], settings.default_min_rows)
+
+    return get_minimum_lookback_date(max_window, pipeline["interval"])
+
 
-    # Upload new models to the cloud
-    if os.getenv('USE_CLOUD_STORAGE'):
-        upload_models(LOCAL_MODELS_LOCATION)
+def deliver_signal(pipeline, combined_strategy, bearer_token, deadline, header=''):
 
     logging.info(header + "Generating signal.")
 
@@ -229,55 +333,129 @@ def trigger_order(pipeline_id, signal, bearer_token, deadline=None, header=''):
         RQ job fails, keeping the loss visible (FailedJobRegistry + alert)
         instead of silently dropping the order.
     """
+    response = deliver_with_retries(
+        lambda: execute_order(pipeline_id, signal, bearer_token, header=header),
+        deadline,
+        OrderDeliveryError(pipeline_id, signal),
+        header=header
+    )
+
+    if response.get("success"):
+        logging.debug(header + "Order was executed successfully.")
+        return True
+
+    # delivered and declined: a structured business failure that retrying
+    # with the same arguments cannot fix
+    logging.warning(response)
+    return False
+
+
+def trigger_orders(signals, bearer_token, deadline=None, header=''):
+    """
+    Delivers the signals of several pipelines to the execution service in one
+    request, which nets the orders of the pipelines that trade the same symbol.
+    Retried as `trigger_order` is.
+
+    Returns
+    -------
+    dict
+        True or False for each pipeline, keyed by the pipeline id, as `trigger_order` would return.
+    """
+    response = deliver_with_retries(
+        lambda: execute_orders(signals, bearer_token, header=header),
+        deadline,
+        OrderDeliveryError(", ".join(str(pipeline_id) for pipeline_id in signals), list(signals.values())),
+        header=header
+    )
+
+    responses = response.get("responses", {}) if response.get("success") else {}
+
+    results = {}
+    for pipeline_id in signals:
+        pipeline_response = responses.get(str(pipeline_id), response)
+
+        results[pipeline_id] = bool(pipeline_response.get("success"))
+
+        if not results[pipeline_id]:
+            logging.warning(pipeline_response)
+
+    return results
+
+
+def deliver_with_retries(send, deadline, delivery_error, header=''):
+    """
+    Calls send until the execution service responds with anything but a
+    transport error, backing off between attempts.
+
+    Raises
+    ------
+    OrderDeliveryError
+        delivery_error, when the next attempt would start past the deadline.
+    """
     attempt = 0
 
     while True:
         response = None
 
         try:
-            response = execute_order(pipeline_id, signal, bearer_token, header=header)
+            response = send()
         except (ConnectionError, ReadTimeout) as e:
             logging.warning(header + f"Could not reach the execution service: {e!r}")
 
         if response is not None:
-            if response.get("success"):
-                logging.debug(header + "Order was executed successfully.")
-                return True
-
-            if response.get("code") != TRANSPORT_ERROR_CODE:
-                # delivered and declined: a structured business failure that
-                # retrying with the same arguments cannot fix
-                logging.warning(response)
-                return False
+            if response.get("success") or response.get("code") != TRANSPORT_ERROR_CODE:
+                return response
 
             logging.warning(header + f"Transport error from the execution service: {response}")
 
         backoff = DELIVERY_BACKOFFS[min(attempt, len(DELIVERY_BACKOFFS) - 1)]
 
         if deadline is None or datetime.now(tz=pytz.utc) + timedelta(seconds=backoff) >= deadline:
-            raise OrderDeliveryError(pipeline_id, signal)
+            raise delivery_error
 
         logging.info(header + f"Retrying order delivery in {backoff}s.")
         time.sleep(backoff)
         attempt += 1
 
 
+def signal_success_handler(job, connection, result, *args, **kwargs):
+    """
+    RQ success callback: notifies the data service of the job's result right
+    away, instead of leaving it to find out on its next /check_job poll.
+    """
+    publish_job_result(connection, job.id, Responses.FINISHED(result))
+
+
 def signal_failure_handler(job, connection, exc_type, exc_value, tb):
     """
     RQ failure callback: makes failed signal jobs loud. Runs on the worker
     when a job raises; the job itself stays inspectable in the
     FailedJobRegistry for the configured failure_ttl.
     """
+    publish_job_result(connection, job.id, Responses.FAILED)
+
     pipeline = job.args[0] if job.args else {}
-    pipeline_id = pipeline.get("id") if isinstance(pipeline, dict) else None
+
+    if isinstance(pipeline, list):
+        # batch job: pipelines that failed individually were already alerted on
+        pipeline_id = ", ".join(str(p.get("id")) for p in pipeline if isinstance(p, dict))
+    else:
+        pipeline_id = pipeline.get("id") if isinstance(pipeline, dict) else None
+
+    alert_signal_failure(pipeline_id, exc_type, exc_value)
+
+
+def alert_signal_failure(pipeline_id, exc_type, exc_value, job_failed=True):
 
     is_lost_order = isinstance(exc_value, OrderDeliveryError)
 
     send_alert(
         title="Signal job failed" if not is_lost_order else "Order NOT placed - delivery failed",
         body=(
-            f"Pipeline {pipeline_id}: {exc_type.__name__}: {exc_value}. "
-            f"The job is kept in the failed-job registry for inspection."
+            f"Pipeline {pipeline_id}: {exc_type.__name__}: {exc_value}. " + (
+                "The job is kept in the failed-job registry for inspection." if job_failed
+                else "The other pipelines of its batch job were not affected."
+            )
         ),
         severity="critical" if is_lost_order else "warning",
         dedup_key=f"signal-job-{pipeline_id}",
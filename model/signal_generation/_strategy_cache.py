@@ -0,0 +1,143 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+# maximum number of pipelines whose strategies are kept warm per process
+MAX_WARM_PIPELINES = 256
+
+
+def get_params_hash(pipeline):
+    """Hashes everything the pipeline's strategy objects are built from."""
+    params = {
+        "symbol": pipeline["symbol"],
+        "interval": pipeline["interval"],
+        "strategies": pipeline["strategies"],
+        "strategy_combination": pipeline["strategy_combination"],
+    }
+
+    return hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class _WarmStrategy:
+
+    __slots__ = ("params_hash", "strategy", "last_candle")
+
+    def __init__(self, params_hash, strategy):
+        self.params_hash = params_hash
+        self.strategy = strategy
+        self.last_candle = None
+
+
+class StrategyCache:
+    """
+    Keeps the strategy objects of each pipeline warm in the worker process,
+    keyed by pipeline id and a hash of the pipeline's strategy parameters.
+
+    Instantiating strategies on every job (which for the MachineLearning
+    strategy means loading the fitted model from disk) is avoided, and the
+    indicators are only re-evaluated when a new candle has closed since the
+    last job. A change of parameters discards the warm objects and rebuilds
+    them from scratch.
+
+    The strategies come from stratestic, which recomputes indicators over
+    the whole frame it is given (update_data) - there is no per-indicator
+    state that could be advanced one candle at a time. The frame evaluated
+    is the pipeline's lookback window, which is already bounded by its
+    longest strategy window.
+    """
+
+    def __init__(self, max_entries=MAX_WARM_PIPELINES):
+        self.max_entries = max_entries
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, pipeline, data, build):
+        """
+        Returns the pipeline's combined strategy, evaluated on data.
+
+        Parameters
+        ----------
+        pipeline : dict
+            The pipeline configuration, as passed to signal_generator.
+        data : pd.DataFrame
+            The candles to evaluate the strategies on.
+        build : callable
+            Called as build(strategies, strategy_combination, None) to create the
+            strategy objects when the pipeline has none warm.
+
+        Returns
+        -------
+        StrategyCombiner
+        """
+        params_hash = get_params_hash(pipeline)
+
+        with self._lock:
+            entry = self._entries.get(pipeline["id"])
+
+        if entry is None or entry.params_hash != params_hash:
+            entry = _WarmStrategy(
+                params_hash,
+                build(pipeline["strategies"], pipeline["strategy_combination"], None)
+            )
+
+        last_candle = (len(data), data.index[-1], tuple(data.iloc[-1]))
+
+        if entry.last_candle != last_candle:
+            try:
+                entry.strategy.set_data(data)
+            except Exception:
+                # a failed evaluation may leave the objects half updated
+                self.discard(pipeline["id"])
+                raise
+
+            entry.last_candle = last_candle
+
+        with self._lock:
+            self._entries[pipeline["id"]] = entry
+            self._entries.move_to_end(pipeline["id"])
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return entry.strategy
+
+    def warm(self, pipeline, build):
+        """
+        Builds the pipeline's strategy objects ahead of its first job (e.g.
+        loading the fitted model of a MachineLearning strategy). They are
+        evaluated by the first `get`.
+        """
+        params_hash = get_params_hash(pipeline)
+
+        with self._lock:
+            entry = self._entries.get(pipeline["id"])
+
+        if entry is not None and entry.params_hash == params_hash:
+            return
+
+        entry = _WarmStrategy(
+            params_hash,
+            build(pipeline["strategies"], pipeline["strategy_combination"], None)
+        )
+
+        with self._lock:
+            self._entries[pipeline["id"]] = entry
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, pipeline_id):
+        with self._lock:
+            self._entries.pop(pipeline_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+strategy_cache = StrategyCache()
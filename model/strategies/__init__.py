@@ -1 +1,2 @@
 from model.strategies.properties import compile_strategies
+from model.strategies._catalog import StrategyCatalog, strategy_catalog
@@ -0,0 +1,83 @@
+import hashlib
+import json
+import os
+import threading
+
+from model.service.helpers import LOCAL_MODELS_LOCATION
+from model.strategies.properties import compile_strategies
+
+
+class StrategyCatalog:
+    """
+    The strategies served by /strategies, compiled once and kept until the
+    models directory changes (the MachineLearning (Load) options list its
+    saved models).
+
+    Compiling inspects every strategy class and, with cloud storage, syncs
+    the models from S3: a request is served from the cached catalog, and
+    only checks the directory's mtime index. The strategy modules themselves
+    are imported once per process, so a change to them takes effect on
+    restart, when the catalog is compiled again.
+
+    Each compiled catalog gets a version, the hash of its content, which is
+    used as its ETag: clients that send it back in If-None-Match get a 304.
+
+    Parameters
+    ----------
+    build : callable
+        Compiles the catalog (compile_strategies).
+    models_dir : str
+    """
+
+    def __init__(self, build, models_dir):
+        self.build = build
+        self.models_dir = models_dir
+
+        self._strategies = None
+        self._version = None
+        self._fingerprint = None
+        self._lock = threading.RLock()
+
+    def get(self):
+        """
+        Returns
+        -------
+        tuple
+            The catalog and its version.
+        """
+        fingerprint = self._get_fingerprint()
+
+        with self._lock:
+            if self._strategies is None or fingerprint != self._fingerprint:
+                self.refresh()
+
+            return self._strategies, self._version
+
+    def refresh(self):
+        """Compiles the catalog again."""
+        with self._lock:
+            strategies = self.build()
+
+            # the build may have downloaded models: fingerprint the directory after it
+            self._fingerprint = self._get_fingerprint()
+            self._strategies = strategies
+            self._version = hashlib.sha1(json.dumps(strategies, sort_keys=True).encode()).hexdigest()
+
+    def clear(self):
+        with self._lock:
+            self._strategies = None
+            self._version = None
+            self._fingerprint = None
+
+    def _get_fingerprint(self):
+        try:
+            return frozenset(
+                (entry.name, entry.stat().st_mtime_ns)
+                for entry in os.scandir(self.models_dir)
+                if entry.is_file() and '.pkl' in entry.name
+            )
+        except FileNotFoundError:
+            return frozenset()
+
+
+strategy_catalog = StrategyCatalog(compile_strategies, LOCAL_MODELS_LOCATION)
@@ -0,0 +1,99 @@
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+import pytz
+
+# initializing the service package first breaks the app <-> strategies
+# import cycle (same entry order as the service tests)
+import model.service  # noqa: F401  isort: skip
+from model.backtesting import backtest_pipeline, run_backtest
+from model.signal_generation._signal_generation import strategy_combiner
+from shared.utils.tests.fixtures.models import *
+from stratestic.backtesting import VectorizedBacktester
+
+START_DATE = datetime.datetime(2023, 9, 1, tzinfo=pytz.utc)
+
+STRATEGIES = [
+    {"name": "MovingAverageCrossover", "params": {"sma_s": 5, "sma_l": 20}},
+    {"name": "Momentum", "params": {"window": 10}},
+]
+
+
+@pytest.fixture
+def candles():
+    np.random.seed(0)
+
+    close = 30000 * np.exp(np.cumsum(np.random.normal(0, 0.005, 2000)))
+
+    return pd.DataFrame(
+        dict(open=close, high=close * 1.001, low=close * 0.999, close=close, volume=np.ones(len(close))),
+        index=pd.date_range(START_DATE, periods=len(close), freq="5min", name="open_time"),
+    )
+
+
+def add_candles(start, n):
+    for i in range(n):
+        close = 100 + 10 * np.sin(i / 5)
+
+        StructuredData.objects.create(
+            exchange_id="binance", symbol_id="BTCUSDT", interval="1h",
+            open_time=start + timedelta(hours=i), close_time=start + timedelta(hours=i + 1),
+            open=close, high=close, low=close, close=close, volume=1,
+        )
+
+
+class TestBacktest:
+
+    @pytest.mark.parametrize("combination", ["Majority", "Unanimous"])
+    def test_results_match_the_stratestic_backtester(self, candles, combination):
+        results, _, trades = run_backtest(STRATEGIES, combination, candles, amount=1000, trading_costs=0.1)
+
+        backtester = VectorizedBacktester(
+            strategy_combiner(STRATEGIES, combination, None), amount=1000, trading_costs=0.1
+        )
+        backtester.load_data(candles)
+        backtester.run(print_results=False, plot_results=False)
+
+        assert list(results.index) == list(backtester.results.index)
+
+        for metric, value in backtester.results.items():
+            if isinstance(value, float):
+                assert results[metric] == pytest.approx(value, nan_ok=True), metric
+            else:
+                assert results[metric] == value, metric
+
+        assert len(trades) == len(backtester.trades)
+
+        for trade, expected in zip(trades, backtester.trades):
+            assert (trade.entry_date, trade.exit_date, trade.side) == (
+                expected.entry_date, expected.exit_date, expected.side
+            )
+            assert trade.pnl == pytest.approx(expected.pnl)
+            assert trade.equity == pytest.approx(expected.equity)
+            assert trade.units == pytest.approx(expected.units)
+
+    def test_leveraged_equity_is_floored_at_zero(self, candles):
+        results, processed_data, trades = run_backtest(STRATEGIES, "Majority", candles, leverage=100)
+
+        assert processed_data["equity"].min() >= 0
+        assert results["equity_final"] == 0
+        assert all(trade.entry_date < processed_data.index[processed_data["equity"] <= 0][0] for trade in trades)
+
+    def test_not_enough_candles(self, candles):
+        assert run_backtest(STRATEGIES, "Majority", candles.iloc[:10]) is None
+
+    def test_pipeline_is_backtested_over_the_stored_candles(self, create_pipeline):
+        add_candles(START_DATE, 200)
+
+        results, processed_data, _ = backtest_pipeline(
+            create_pipeline.id, end_date=START_DATE + timedelta(hours=149), trading_costs=0.05
+        )
+
+        assert results["equity_initial"] == 5000
+        assert results["trading_costs"] == pytest.approx(0.05)
+        assert results["nr_trades"] > 0
+        assert processed_data.index[-1] == START_DATE + timedelta(hours=149)
+        assert results["end_date"] == START_DATE + timedelta(hours=150)
+
@@ -184,6 +184,27 @@ class TestModelService:
 
         assert res.json == STRATEGIES
 
+    def test_get_strategies_conditional_get(
+        self,
+        app_client,
+        mock_settings_env_vars,
+        mock_redis_connection,
+        mock_compile_strategies,
+    ):
+        res = app_client.get("/strategies")
+
+        etag = res.headers["ETag"]
+
+        res = app_client.get("/strategies", headers={"If-None-Match": etag})
+
+        assert res.status_code == 304
+        assert res.data == b""
+
+        res = app_client.get("/strategies", headers={"If-None-Match": '"outdated"'})
+
+        assert res.status_code == 200
+        assert res.json == STRATEGIES
+
 
 class TestSignalJobEnqueueSemantics:
 
@@ -210,6 +231,7 @@ class TestSignalJobEnqueueSemantics:
         kwargs = enqueue.call_args.kwargs
         assert kwargs["failure_ttl"] == app_module.JOB_FAILURE_TTL
         assert kwargs["on_failure"].name == app_module.SIGNAL_FAILURE_CALLBACK
+        assert kwargs["on_success"].name == app_module.SIGNAL_SUCCESS_CALLBACK
 
         pipeline_dict = enqueue.call_args.args[1][0]
         assert "enqueued_at" in pipeline_dict
@@ -237,3 +259,37 @@ class TestSignalJobEnqueueSemantics:
         enqueue.assert_called_once()
         alert.assert_called_once()
         assert alert.call_args.kwargs["severity"] == "critical"
+
+
+class TestBatchSignalJobs:
+
+    def test_pipelines_sharing_a_symbol_share_a_job(
+        self,
+        mocker,
+        app_client,
+        mock_settings_env_vars,
+        mock_redis_connection,
+        create_exchange,
+        create_pipeline,
+        create_pipeline_2,
+        create_pipeline_BNBBTC,
+    ):
+        import model.service.app as app_module
+
+        jobs = [mocker.Mock(**{"get_id.return_value": job_id}) for job_id in ["job-1", "job-2"]]
+        enqueue = mocker.patch.object(app_module.q, "enqueue_call", side_effect=jobs)
+        mocker.patch.object(app_module, "warn_if_no_workers", return_value=False)
+
+        res = app_client.post("/generate_signals", json={"pipeline_ids": [1, 2, 10]})
+
+        assert res.json == Responses.SIGNALS_GENERATION_INPROGRESS({"1": "job-1", "2": "job-1", "10": "job-2"})
+
+        assert enqueue.call_count == 2
+
+        func, (pipelines, bearer_token, headers) = enqueue.call_args_list[0].args
+        assert func == "model.signal_generation._signal_generation.batch_signal_generator"
+        assert [pipeline["id"] for pipeline in pipelines] == [1, 2]
+        assert set(headers) == {"1", "2"}
+
+        kwargs = enqueue.call_args_list[0].kwargs
+        assert kwargs["on_failure"].name == app_module.SIGNAL_FAILURE_CALLBACK
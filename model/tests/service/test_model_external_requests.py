@@ -1,4 +1,4 @@
-from model.service.external_requests import execute_order
+from model.service.external_requests import execute_order, execute_orders
 from model.service.helpers import EXECUTION_APP_ENDPOINTS
 from model.tests.setup.fixtures.internal_modules import *
 from shared.utils.tests.fixtures.external_modules import *
@@ -37,3 +37,31 @@ class TestModelExternalRequests:
             headers={"Authorization": bearer_token},
             timeout=(5, 60)
         )
+
+    def test_execute_orders(
+        self,
+        mock_settings_env_vars,
+        mock_requests_post,
+        mock_redis_connection,
+        requests_post_spy
+    ):
+        """
+        GIVEN the signals of several pipelines
+        WHEN the method execute_orders is called
+        THEN they are sent in a single request
+
+        """
+
+        bearer_token = "abc"
+
+        res = execute_orders({1: 1, 2: -1}, bearer_token=bearer_token)
+
+        assert res == response
+        requests_post_spy.assert_called_with(
+            EXECUTION_APP_ENDPOINTS["EXECUTE_ORDERS"](
+                os.getenv("EXECUTION_APP_URL")
+            ),
+            json={"orders": [{"pipeline_id": 1, "signal": 1}, {"pipeline_id": 2, "signal": -1}]},
+            headers={"Authorization": bearer_token},
+            timeout=(5, 60)
+        )
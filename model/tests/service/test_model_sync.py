@@ -0,0 +1,99 @@
+import json
+import os
+
+import pytest
+
+import model.service  # noqa: F401  isort: skip
+import model.service.cloud_storage._model_sync as model_sync_module
+from model.service.cloud_storage import ModelSync
+
+
+class FakeS3Client:
+    def __init__(self, files=None):
+        self.files = dict(files or {})
+        self.uploads = []
+
+    def list_objects(self, Bucket):
+        return {"Contents": [{"Key": key} for key in self.files]}
+
+    def upload_fileobj(self, file_obj, bucket, filename):
+        self.files[filename] = file_obj.read()
+        self.uploads.append(filename)
+
+    def download_file(self, bucket, filename, filepath):
+        with open(filepath, "wb") as f:
+            f.write(self.files[filename])
+
+
+@pytest.fixture
+def s3(mocker):
+    client = FakeS3Client({"remote.pkl": b"remote", "notes.txt": b"not a model"})
+    mocker.patch("model.service.cloud_storage._cloud_storage.s3", client)
+    return client
+
+
+@pytest.fixture
+def no_settle_time(mocker):
+    mocker.patch.object(model_sync_module, "SETTLE_SECONDS", 0)
+
+
+def write_model(directory, filename, content):
+    with open(os.path.join(directory, filename), "wb") as f:
+        f.write(content)
+
+
+class TestModelSync:
+
+    def test_new_models_are_synced_both_ways(self, tmp_path, s3, no_settle_time):
+        write_model(tmp_path, "local.pkl", b"local")
+
+        uploaded, downloaded = ModelSync(str(tmp_path), 60).sync()
+
+        assert uploaded == ["local.pkl"]
+        assert downloaded == ["remote.pkl"]
+        assert s3.files["local.pkl"] == b"local"
+        assert (tmp_path / "remote.pkl").read_bytes() == b"remote"
+        assert not (tmp_path / "remote.pkl.part").exists()
+
+        manifest = json.loads((tmp_path / ".manifest.json").read_text())
+        assert set(manifest) == {"local.pkl", "remote.pkl"}
+
+    def test_unchanged_models_are_not_hashed_again(self, tmp_path, s3, no_settle_time, mocker):
+        write_model(tmp_path, "local.pkl", b"local")
+
+        sync = ModelSync(str(tmp_path), 60)
+        sync.sync()
+
+        spy_hash = mocker.spy(model_sync_module, "hash_file")
+
+        assert sync.sync() == ([], [])
+        assert spy_hash.call_count == 0
+
+    def test_changed_model_is_uploaded_again(self, tmp_path, s3, no_settle_time):
+        write_model(tmp_path, "local.pkl", b"local")
+
+        sync = ModelSync(str(tmp_path), 60)
+        sync.sync()
+
+        write_model(tmp_path, "local.pkl", b"retrained")
+        os.utime(tmp_path / "local.pkl", ns=(0, 0))
+
+        uploaded, _ = sync.sync()
+
+        assert uploaded == ["local.pkl"]
+        assert s3.files["local.pkl"] == b"retrained"
+
+    def test_model_being_written_is_left_for_the_next_pass(self, tmp_path, s3):
+        write_model(tmp_path, "local.pkl", b"local")
+
+        uploaded, _ = ModelSync(str(tmp_path), 60).sync()
+
+        assert uploaded == []
+        assert "local.pkl" not in s3.files
+
+    def test_sync_is_not_started_without_cloud_storage(self, tmp_path, mocker, monkeypatch):
+        monkeypatch.setenv("USE_CLOUD_STORAGE", "false")
+        mock_start = mocker.patch.object(ModelSync, "start")
+
+        assert model_sync_module.start_model_sync(str(tmp_path), 60) is None
+        assert mock_start.call_count == 0
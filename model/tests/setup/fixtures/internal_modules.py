@@ -21,8 +21,8 @@ def mock_settings_env_vars(mocker):
 
 
 @pytest.fixture()
-def mock_get_data(mocker):
-    return mocker.patch("model.signal_generation._signal_generation.get_data")
+def mock_get_candles(mocker):
+    return mocker.patch("model.signal_generation._signal_generation.candle_cache.get_candles")
 
 
 @pytest.fixture()
@@ -30,6 +30,11 @@ def mock_trigger_order(mocker):
     return mocker.patch("model.signal_generation._signal_generation.trigger_order")
 
 
+@pytest.fixture()
+def mock_trigger_orders(mocker):
+    return mocker.patch("model.signal_generation._signal_generation.trigger_orders")
+
+
 @pytest.fixture()
 def mock_execute_order(mocker):
     return mocker.patch("model.signal_generation._signal_generation.execute_order")
@@ -84,7 +89,10 @@ def mock_redis_connection(mocker):
 
 @pytest.fixture
 def mock_compile_strategies(mocker):
-    mocker.patch.object(model.service.app, 'compile_strategies', lambda: STRATEGIES)
+    mocker.patch.object(model.service.app.strategy_catalog, 'build', lambda: STRATEGIES)
+    model.service.app.strategy_catalog.clear()
+    yield
+    model.service.app.strategy_catalog.clear()
 
 
 @pytest.fixture
@@ -97,14 +105,6 @@ def spy_download_file(mocker):
     return mocker.spy(model.service.cloud_storage._cloud_storage, "download_file")
 
 
-@pytest.fixture
-def mock_local_models_storage(mocker, tmp_path):
-    return mocker.patch(
-        "model.signal_generation._signal_generation.LOCAL_MODELS_LOCATION",
-        tmp_path
-    )
-
-
 @pytest.fixture
 def create_mock_file(tmp_path):
     with open(os.path.join(tmp_path, 'mock-file.pkl'), 'w') as f:
@@ -0,0 +1,118 @@
+from datetime import timedelta
+
+import pytest
+import pytz
+
+# initializing the service package first breaks the app <-> strategies
+# import cycle (same entry order as the service tests)
+import model.service  # noqa: F401  isort: skip
+import model.signal_generation._candle_cache as cache_module
+from model.signal_generation import CandleCache
+from shared.utils.tests.fixtures.models import *
+
+START_DATE = datetime.datetime(2023, 9, 1, tzinfo=pytz.utc)
+
+
+def add_candles(start, n, close=1, symbol="BTCUSDT"):
+    for i in range(n):
+        StructuredData.objects.create(
+            exchange_id="binance", symbol_id=symbol, interval="1h",
+            open_time=start + timedelta(hours=i), close_time=start + timedelta(hours=i + 1),
+            open=1, high=1, low=1, close=close, volume=1,
+        )
+
+
+@pytest.fixture
+def spy_get_candles(mocker):
+    return mocker.spy(cache_module, "get_candles")
+
+
+class TestCandleCache:
+
+    def test_only_the_tail_is_read_after_the_first_job(self, create_exchange, create_symbol, spy_get_candles):
+        cache = CandleCache()
+
+        add_candles(START_DATE, 10)
+
+        data = cache.get_candles(StructuredData, START_DATE, "BTCUSDT", "1h")
+        assert len(data) == 10
+
+        # the last candle is updated and a new one is added
+        StructuredData.objects.filter(open_time=START_DATE + timedelta(hours=9)).update(close=5)
+        add_candles(START_DATE + timedelta(hours=10), 1, close=7)
+
+        data = cache.get_candles(StructuredData, START_DATE + timedelta(hours=1), "BTCUSDT", "1h")
+
+        assert len(data) == 10
+        assert data.index[0] == START_DATE + timedelta(hours=1)
+        assert data["close"].tolist()[-2:] == [5, 7]
+
+        assert spy_get_candles.call_args_list[-1].args[1] == START_DATE + timedelta(hours=9)
+
+    def test_longer_lookback_reloads(self, create_exchange, create_symbol, spy_get_candles):
+        cache = CandleCache()
+
+        add_candles(START_DATE, 10)
+
+        cache.get_candles(StructuredData, START_DATE + timedelta(hours=5), "BTCUSDT", "1h")
+        data = cache.get_candles(StructuredData, START_DATE, "BTCUSDT", "1h")
+
+        assert len(data) == 10
+        assert spy_get_candles.call_args_list[-1].args[1] == START_DATE
+
+    def test_backfilled_candles_are_read(self, create_exchange, create_symbol, spy_get_candles):
+        cache = CandleCache()
+
+        add_candles(START_DATE, 3)
+        add_candles(START_DATE + timedelta(hours=5), 3)
+
+        assert len(cache.get_candles(StructuredData, START_DATE, "BTCUSDT", "1h")) == 6
+
+        # the missing range is backfilled
+        add_candles(START_DATE + timedelta(hours=3), 2)
+
+        data = cache.get_candles(StructuredData, START_DATE, "BTCUSDT", "1h")
+
+        assert len(data) == 8
+        assert spy_get_candles.call_args_list[-1].args[1] == START_DATE
+
+    def test_unfilled_gap_does_not_reload(self, create_exchange, create_symbol, spy_get_candles):
+        cache = CandleCache()
+
+        add_candles(START_DATE, 3)
+        add_candles(START_DATE + timedelta(hours=5), 3)
+
+        cache.get_candles(StructuredData, START_DATE, "BTCUSDT", "1h")
+
+        # a new candle is closed, the missing range stays missing
+        add_candles(START_DATE + timedelta(hours=8), 1)
+
+        data = cache.get_candles(StructuredData, START_DATE, "BTCUSDT", "1h")
+
+        assert len(data) == 7
+        assert spy_get_candles.call_args_list[-1].args[1] == START_DATE + timedelta(hours=7)
+
+    def test_returned_frame_does_not_alter_the_cache(self, create_exchange, create_symbol):
+        cache = CandleCache()
+
+        add_candles(START_DATE, 3)
+
+        data = cache.get_candles(StructuredData, START_DATE, "BTCUSDT", "1h")
+        data["signal"] = 1
+
+        assert "signal" not in cache.get_candles(StructuredData, START_DATE, "BTCUSDT", "1h").columns
+
+    def test_least_recently_used_entry_is_evicted(self, create_exchange, create_symbol):
+        add_candles(START_DATE, 10)
+        add_candles(START_DATE, 10, symbol="ETHUSDT")
+
+        cache = CandleCache()
+        cache.get_candles(StructuredData, START_DATE, "BTCUSDT", "1h")
+
+        cache = CandleCache(max_bytes=cache.size)
+
+        cache.get_candles(StructuredData, START_DATE, "BTCUSDT", "1h")
+        cache.get_candles(StructuredData, START_DATE, "ETHUSDT", "1h")
+
+        assert len(cache) == 1
+        assert cache.get_candles(StructuredData, START_DATE, "ETHUSDT", "1h")["close"].sum() == 10
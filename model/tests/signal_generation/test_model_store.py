@@ -0,0 +1,70 @@
+import os
+
+import numpy as np
+import pytest
+
+# initializing the service package first breaks the app <-> strategies
+# import cycle (same entry order as the service tests)
+import model.service  # noqa: F401  isort: skip
+import model.signal_generation._model_store as model_store_module
+from model.signal_generation import MappedMachineLearning, ModelStore
+from model.signal_generation._signal_generation import get_strategy_class
+from model.tests.setup.test_data.sample_data import data
+from stratestic.strategies import MachineLearning
+
+
+@pytest.fixture
+def candles():
+    return data.set_index("open_time")
+
+
+@pytest.fixture
+def saved_model(tmp_path, candles):
+    MachineLearning(estimator="Linear", save_model=True, models_dir=str(tmp_path), data=candles)
+
+    return next(filename for filename in os.listdir(tmp_path) if filename.endswith(".pkl"))
+
+
+@pytest.fixture
+def store(mocker):
+    store = ModelStore(max_models=2)
+    mocker.patch.object(model_store_module, "model_store", store)
+    return store
+
+
+class TestModelStore:
+
+    def test_loaded_model_gives_the_same_signal(self, tmp_path, candles, saved_model, store):
+        mapped = MappedMachineLearning(load_model=saved_model, models_dir=str(tmp_path), data=candles)
+        loaded = MachineLearning(load_model=saved_model, models_dir=str(tmp_path), data=candles)
+
+        assert mapped.get_signal() == loaded.get_signal()
+
+    def test_arrays_are_memory_mapped(self, tmp_path, saved_model, store):
+        attributes = store.get(str(tmp_path), saved_model)
+
+        assert os.path.exists(ModelStore.get_mapped_path(os.path.join(tmp_path, saved_model)))
+        assert isinstance(attributes["model"].steps[-1][1].coef_, np.memmap)
+
+    def test_repeated_loads_skip_deserialization(self, tmp_path, candles, saved_model, store, mocker):
+        spy_load = mocker.spy(model_store_module.joblib, "load")
+
+        MappedMachineLearning(load_model=saved_model, models_dir=str(tmp_path), data=candles)
+        MappedMachineLearning(load_model=saved_model, models_dir=str(tmp_path), data=candles)
+
+        assert spy_load.call_count == 1
+        assert len(store) == 1
+
+    def test_saved_again_model_is_reloaded(self, tmp_path, saved_model, store):
+        path = os.path.join(tmp_path, saved_model)
+
+        first = store.get(str(tmp_path), saved_model)
+
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        assert store.get(str(tmp_path), saved_model) is not first
+        assert len(store) == 1
+
+    def test_machine_learning_strategies_use_the_store(self):
+        assert get_strategy_class("MachineLearning") is MappedMachineLearning
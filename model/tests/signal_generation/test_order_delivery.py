@@ -13,7 +13,9 @@ from model.signal_generation._exceptions import OrderDeliveryError, StaleSignal
 from model.signal_generation._signal_generation import (
     compute_delivery_deadline,
     signal_failure_handler,
+    signal_success_handler,
     trigger_order,
+    trigger_orders,
     MAX_DELIVERY_SECONDS,
 )
 
@@ -129,6 +131,52 @@ class TestTriggerOrder:
         mock_sleep.assert_not_called()
 
 
+class TestTriggerOrders:
+
+    @pytest.fixture
+    def mock_execute_orders(self, mocker):
+        return mocker.patch.object(signal_module, "execute_orders")
+
+    def test_results_per_pipeline(self, mock_execute_orders, mock_sleep):
+        mock_execute_orders.return_value = {
+            "success": True,
+            "responses": {
+                "1": {"success": True},
+                "2": {"success": False, "code": "NEGATIVE_EQUITY"},
+            },
+        }
+
+        result = trigger_orders({1: 1, 2: -1}, "token", deadline=now_utc() + timedelta(seconds=60))
+
+        assert result == {1: True, 2: False}
+        mock_execute_orders.assert_called_once_with({1: 1, 2: -1}, "token", header='')
+
+    def test_declined_request_fails_every_pipeline(self, mock_execute_orders, mock_sleep):
+        mock_execute_orders.return_value = {"success": False, "code": "BOOKKEEPING_FAILED"}
+
+        result = trigger_orders({1: 1, 2: -1}, "token", deadline=now_utc() + timedelta(seconds=600))
+
+        assert result == {1: False, 2: False}
+        mock_sleep.assert_not_called()
+
+    def test_transport_failure_is_retried(self, mock_execute_orders, mock_sleep):
+        mock_execute_orders.side_effect = [
+            RequestsConnectionError("down"),
+            {"success": True, "responses": {"1": {"success": True}, "2": {"success": True}}},
+        ]
+
+        result = trigger_orders({1: 1, 2: 1}, "token", deadline=now_utc() + timedelta(seconds=600))
+
+        assert result == {1: True, 2: True}
+        assert mock_execute_orders.call_count == 2
+
+    def test_exhausted_deadline_raises_order_delivery_error(self, mock_execute_orders, mock_sleep):
+        mock_execute_orders.side_effect = RequestsConnectionError("down")
+
+        with pytest.raises(OrderDeliveryError):
+            trigger_orders({1: 1, 2: 1}, "token", deadline=None)
+
+
 class TestSignalFailureHandler:
 
     def make_job(self, exc):
@@ -154,3 +202,25 @@ class TestSignalFailureHandler:
 
         alert.assert_called_once()
         assert alert.call_args.kwargs["severity"] == "warning"
+
+    def test_job_failure_is_published(self, mocker):
+        mocker.patch.object(signal_module, "send_alert")
+        mock_publish = mocker.patch.object(signal_module, "publish_job_result")
+        job, exc_type, exc = self.make_job(ValueError("boom"))
+
+        signal_failure_handler(job, None, exc_type, exc, None)
+
+        assert mock_publish.call_args.args[1:] == (job.id, {"code": "FAILED", "status": "Job failed."})
+
+
+class TestSignalSuccessHandler:
+
+    def test_job_result_is_published(self, mocker):
+        mock_publish = mocker.patch.object(signal_module, "publish_job_result")
+        job = MagicMock()
+
+        signal_success_handler(job, "connection", {"7": True})
+
+        mock_publish.assert_called_once_with(
+            "connection", job.id, {"code": "FINISHED", "success": {"7": True}, "status": "Job finished."}
+        )
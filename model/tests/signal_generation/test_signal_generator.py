@@ -1,12 +1,14 @@
-from model.signal_generation import signal_generator, trigger_order
+import pandas as pd
+
+from model.signal_generation import batch_signal_generator, signal_generator, trigger_order
 from model.tests.setup.fixtures.internal_modules import (
     mock_execute_order,
     mock_trigger_order,
+    mock_trigger_orders,
     mock_redis_connection,
     mock_settings_env_vars,
-    mock_get_data,
+    mock_get_candles,
     spy_upload_file,
-    mock_local_models_storage,
     create_mock_file
 )
 from model.tests.setup.fixtures.external_modules import mock_boto3_client
@@ -23,7 +25,7 @@ class TestSignalGeneration:
                 1,
                 data,
                 True,
-                1,
+                0,
                 id="ValidInput",
             ),
             pytest.param(
@@ -45,12 +47,11 @@ class TestSignalGeneration:
         mock_redis_connection,
         mock_boto3_client,
         create_mock_file,
-        mock_local_models_storage,
         spy_upload_file,
         create_pipeline,
         create_pipeline_2,
         create_pipeline_with_invalid_strategy,
-        mock_get_data,
+        mock_get_candles,
         mock_trigger_order,
     ):
         """
@@ -59,7 +60,7 @@ class TestSignalGeneration:
         THEN the return value is equal to the expected response
 
         """
-        mock_get_data.return_value = side_effect
+        mock_get_candles.return_value = side_effect
         mock_trigger_order.return_value = True
 
         pipeline = Pipeline.objects.get(id=pipeline_id)
@@ -102,7 +103,7 @@ class TestSignalGeneration:
         mock_boto3_client,
         mock_redis_connection,
         create_pipeline_with_invalid_strategy,
-        mock_get_data,
+        mock_get_candles,
         mock_trigger_order,
     ):
         """
@@ -111,7 +112,7 @@ class TestSignalGeneration:
         THEN the return value is equal to the expected response
 
         """
-        mock_get_data.return_value = data
+        mock_get_candles.return_value = data
 
         pipeline = Pipeline.objects.get(id=pipeline_id)
 
@@ -134,6 +135,60 @@ class TestSignalGeneration:
 
         assert excinfo.type == exception
 
+    def test_batch_signal_generator(
+        self,
+        mocker,
+        mock_settings_env_vars,
+        mock_redis_connection,
+        mock_boto3_client,
+        create_mock_file,
+        spy_upload_file,
+        create_pipeline,
+        create_pipeline_2,
+        create_pipeline_with_invalid_strategy,
+        mock_get_candles,
+        mock_trigger_orders,
+    ):
+        """
+        GIVEN several pipelines of the same symbol and interval, one of them invalid
+        WHEN the method batch_signal_generator is called
+        THEN the candles are read once, the signals are delivered in one request
+            and only the invalid pipeline fails
+
+        """
+        import model.signal_generation._signal_generation as signal_generation
+
+        candles = data.set_index("open_time")
+        # shift the sample candles so they fall inside the pipelines' lookback window
+        candles.index = candles.index + (pd.Timestamp.now(tz="utc").floor("h") - candles.index[-1])
+
+        mock_get_candles.return_value = candles
+        mock_trigger_orders.return_value = {1: True, 2: True}
+        mock_alert = mocker.patch.object(signal_generation, "send_alert")
+
+        pipelines = [
+            dict(
+                id=pipeline.id,
+                strategies=[obj.as_json() for obj in pipeline.strategy.all()],
+                strategy_combination=pipeline.strategy_combination,
+                symbol=pipeline.symbol.name,
+                exchange=pipeline.exchange.name,
+                interval=pipeline.interval
+            )
+            for pipeline in Pipeline.objects.filter(id__in=[1, 2, 7]).order_by("id")
+        ]
+
+        res = batch_signal_generator(pipelines, "abc")
+
+        assert res == {"1": True, "2": True, "7": False}
+
+        assert mock_get_candles.call_count == 1
+        assert mock_trigger_orders.call_count == 1
+        assert list(mock_trigger_orders.call_args.args[0]) == [1, 2]
+        assert mock_alert.call_count == 1
+        # models are uploaded by the background sync, not by the jobs
+        assert spy_upload_file.call_count == 0
+
     @pytest.mark.parametrize(
         "side_effect,expected_value",
         [
@@ -0,0 +1,99 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+# initializing the service package first breaks the app <-> strategies
+# import cycle (same entry order as the service tests)
+import model.service  # noqa: F401  isort: skip
+from model.signal_generation import StrategyCache
+from model.signal_generation._signal_generation import strategy_combiner
+from model.tests.setup.test_data.sample_data import data
+
+STRATEGIES = [{"name": "Momentum", "params": {"window": 2}}]
+
+
+def get_pipeline(pipeline_id=1, strategies=None):
+    return dict(
+        id=pipeline_id,
+        symbol="BTCUSDT",
+        interval="1h",
+        strategies=strategies or STRATEGIES,
+        strategy_combination="Majority",
+    )
+
+
+@pytest.fixture
+def build():
+    return MagicMock(side_effect=strategy_combiner)
+
+
+@pytest.fixture
+def candles():
+    return data.set_index("open_time")
+
+
+class TestStrategyCache:
+
+    def test_strategies_are_kept_warm(self, build, candles):
+        cache = StrategyCache()
+
+        strategy = cache.get(get_pipeline(), candles, build)
+
+        assert cache.get(get_pipeline(), candles, build) is strategy
+        assert build.call_count == 1
+
+    def test_evaluation_is_skipped_without_a_new_candle(self, build, candles, mocker):
+        cache = StrategyCache()
+
+        strategy = cache.get(get_pipeline(), candles.iloc[:-1], build)
+        spy_set_data = mocker.spy(strategy, "set_data")
+
+        cache.get(get_pipeline(), candles.iloc[:-1], build)
+        assert spy_set_data.call_count == 0
+
+        cache.get(get_pipeline(), candles, build)
+        assert spy_set_data.call_count == 1
+        assert strategy.data.index[-1] == candles.index[-1]
+
+    def test_params_change_rebuilds_the_strategies(self, build, candles):
+        cache = StrategyCache()
+
+        strategy = cache.get(get_pipeline(), candles, build)
+        new_strategy = cache.get(
+            get_pipeline(strategies=[{"name": "Momentum", "params": {"window": 3}}]), candles, build
+        )
+
+        assert new_strategy is not strategy
+        assert build.call_count == 2
+
+    def test_signal_matches_a_cold_evaluation(self, build, candles):
+        cache = StrategyCache()
+
+        cache.get(get_pipeline(), candles.iloc[:-2], build)
+        warm_signal = cache.get(get_pipeline(), candles, build).get_signal()
+
+        cold_signal = strategy_combiner(STRATEGIES, "Majority", candles).get_signal()
+
+        assert warm_signal == cold_signal
+
+    def test_least_recently_used_pipeline_is_evicted(self, build, candles):
+        cache = StrategyCache(max_entries=1)
+
+        cache.get(get_pipeline(1), candles, build)
+        cache.get(get_pipeline(2), candles, build)
+
+        assert len(cache) == 1
+
+        cache.get(get_pipeline(1), candles, build)
+        assert build.call_count == 3
+
+    def test_warmed_strategies_are_used_by_the_first_job(self, build, candles):
+        cache = StrategyCache()
+
+        cache.warm(get_pipeline(), build)
+        cache.warm(get_pipeline(), build)
+
+        strategy = cache.get(get_pipeline(), candles, build)
+
+        assert build.call_count == 1
+        assert strategy.data.index[-1] == candles.index[-1]
@@ -0,0 +1,45 @@
+import os
+from unittest.mock import MagicMock
+
+import model.service  # noqa: F401  isort: skip
+from model.strategies import StrategyCatalog
+from model.tests.setup.test_data.sample_data import STRATEGIES
+
+
+def make_catalog(tmp_path):
+    return StrategyCatalog(MagicMock(return_value=STRATEGIES), str(tmp_path))
+
+
+class TestStrategyCatalog:
+
+    def test_catalog_is_compiled_once(self, tmp_path):
+        catalog = make_catalog(tmp_path)
+
+        strategies, version = catalog.get()
+
+        assert strategies == STRATEGIES
+        assert catalog.get() == (strategies, version)
+        assert catalog.build.call_count == 1
+
+    def test_new_model_invalidates_the_catalog(self, tmp_path):
+        catalog = make_catalog(tmp_path)
+
+        catalog.get()
+
+        with open(os.path.join(tmp_path, "model.pkl"), "w") as f:
+            f.write("model")
+
+        catalog.get()
+        catalog.get()
+
+        assert catalog.build.call_count == 2
+
+    def test_version_changes_with_the_content(self, tmp_path):
+        catalog = make_catalog(tmp_path)
+
+        _, version = catalog.get()
+
+        catalog.build.return_value = {**STRATEGIES, "New": {}}
+        catalog.refresh()
+
+        assert catalog.get()[1] != version
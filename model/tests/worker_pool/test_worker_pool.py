@@ -0,0 +1,158 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+# initializing the service package first breaks the app <-> strategies
+# import cycle (same entry order as the service tests)
+import model.service  # noqa: F401  isort: skip
+import model.worker_pool._worker_pool as pool_module
+from model.signal_generation import strategy_cache
+from model.worker_pool import WarmWorker, WorkerPool, warm_up
+from shared.utils.tests.fixtures.models import *
+
+
+@pytest.fixture
+def worker(mocker):
+    worker = WarmWorker(["default"], connection=MagicMock(), max_memory_mb=512)
+
+    mocker.patch.object(WarmWorker, "set_state")
+    mocker.patch.object(WarmWorker, "perform_job")
+
+    return worker
+
+
+@pytest.fixture
+def processes(mocker):
+    processes = []
+
+    def new_process(**kwargs):
+        process = MagicMock(pid=100 + len(processes), exitcode=0)
+        process.is_alive.return_value = True
+        processes.append(process)
+        return process
+
+    return processes, new_process
+
+
+@pytest.fixture
+def clear_strategy_cache():
+    strategy_cache.clear()
+    yield
+    strategy_cache.clear()
+
+
+class TestWarmWorker:
+
+    def test_jobs_run_in_the_worker_process(self, worker, mocker):
+        spy_fork = mocker.spy(pool_module.os, "fork")
+
+        worker.execute_job("job", "queue")
+
+        worker.perform_job.assert_called_once_with("job", "queue")
+        assert spy_fork.call_count == 0
+        assert worker._stop_requested is False
+
+    def test_db_connections_are_recycled_around_each_job(self, worker, mocker):
+        close_old_connections = mocker.patch.object(pool_module, "close_old_connections")
+        worker.perform_job.side_effect = lambda *args: close_old_connections.assert_called_once()
+
+        worker.execute_job("job", "queue")
+
+        assert close_old_connections.call_count == 2
+
+    def test_worker_stops_when_over_the_memory_limit(self, worker, mocker):
+        mocker.patch.object(pool_module, "get_memory_mb", return_value=600)
+
+        worker.execute_job("job", "queue")
+
+        assert worker._stop_requested is True
+
+
+class TestWarmUp:
+
+    def test_strategies_of_active_pipelines_are_built(self, create_pipeline, clear_strategy_cache):
+        warm_up()
+
+        assert len(strategy_cache) == 1
+
+    def test_failing_pipeline_is_skipped(self, create_pipeline, clear_strategy_cache, mocker):
+        mocker.patch(
+            "model.signal_generation._signal_generation.strategy_combiner",
+            side_effect=Exception("missing model file")
+        )
+
+        warm_up()
+
+        assert len(strategy_cache) == 0
+
+
+class TestWorkerPool:
+
+    def test_workers_are_started(self, processes, mocker):
+        processes, new_process = processes
+
+        pool = WorkerPool(["default"], 2, max_jobs=10)
+        mocker.patch.object(pool._context, "Process", side_effect=new_process)
+
+        pool.check_workers()
+
+        assert len(processes) == 2
+        for process in processes:
+            process.start.assert_called_once()
+
+        # running workers are left alone
+        pool.check_workers()
+        assert len(processes) == 2
+
+    def test_exited_worker_is_replaced(self, processes, mocker):
+        processes, new_process = processes
+
+        pool = WorkerPool(["default"], 2, max_jobs=10)
+        mocker.patch.object(pool._context, "Process", side_effect=new_process)
+
+        pool.check_workers()
+
+        # the first worker exits after a long life (e.g. after max_jobs jobs)
+        processes[0].is_alive.return_value = False
+        pool._started_at[0] -= pool_module.MIN_WORKER_LIFETIME
+
+        pool.check_workers()
+
+        processes[0].join.assert_called_once()
+        assert len(processes) == 3
+        assert pool._workers == [processes[2], processes[1]]
+
+    def test_crashing_worker_is_restarted_with_back_off(self, processes, mocker):
+        processes, new_process = processes
+
+        pool = WorkerPool(["default"], 1)
+        mocker.patch.object(pool._context, "Process", side_effect=new_process)
+
+        pool.check_workers()
+
+        processes[0].is_alive.return_value = False
+
+        pool.check_workers()
+
+        assert len(processes) == 1
+        assert pool._restart_delay[0] == 1
+
+    def test_stop_asks_the_workers_to_finish(self, processes, mocker):
+        processes, new_process = processes
+        mock_kill = mocker.patch.object(pool_module.os, "kill")
+
+        pool = WorkerPool(["default"], 2)
+        mocker.patch.object(pool._context, "Process", side_effect=new_process)
+
+        pool.check_workers()
+
+        for process in processes:
+            process.join.side_effect = lambda timeout, process=process: process.is_alive.configure_mock(
+                return_value=False
+            )
+
+        pool.stop()
+
+        assert mock_kill.call_count == 2
+        for process in processes:
+            process.kill.assert_not_called()
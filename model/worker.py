@@ -5,7 +5,9 @@ from dotenv import find_dotenv, load_dotenv
 from rq import Worker, Queue, Connection
 import django
 
-from model.service.cloud_storage import cloud_storage_startup
+from model.service.cloud_storage import cloud_storage_startup, start_model_sync
+from model.service.helpers import LOCAL_MODELS_LOCATION
+from model.worker_pool import WorkerPool
 from shared.utils.settings import settings
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "database.settings")
@@ -25,6 +27,18 @@ redis_url = settings.redis_url
 conn = redis.from_url(redis_url)
 
 if __name__ == '__main__':
-    with Connection(conn):
-        worker = Worker(list(map(Queue, listen)))
-        worker.work()
+    # models are synced with the bucket in the background, not by the jobs
+    start_model_sync(LOCAL_MODELS_LOCATION, settings.model_sync_interval)
+
+    if settings.worker_mode == "pool":
+        WorkerPool(
+            listen,
+            settings.worker_pool_size,
+            max_jobs=settings.worker_max_jobs or None,
+            max_memory_mb=settings.worker_max_memory_mb or None,
+        ).run()
+    else:
+        # stock worker: forks a child per job
+        with Connection(conn):
+            worker = Worker(list(map(Queue, listen)))
+            worker.work()
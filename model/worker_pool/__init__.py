@@ -0,0 +1 @@
+from model.worker_pool._worker_pool import WarmWorker, WorkerPool, warm_up
@@ -0,0 +1,247 @@
+import logging
+import multiprocessing
+import os
+import resource
+import signal
+import time
+
+import django
+import redis
+from rq import Queue, SimpleWorker
+
+from shared.utils.settings import settings
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "database.settings")
+django.setup()
+
+from django.db import close_old_connections, connection
+
+from database.model.models import Pipeline
+
+
+# seconds between two checks of the worker processes by the supervisor
+SUPERVISOR_INTERVAL = 1
+
+# a worker that exits sooner than this after starting is restarted with
+# back-off (e.g. redis is unreachable), instead of in a tight loop
+MIN_WORKER_LIFETIME = 10
+MAX_RESTART_DELAY = 60
+
+# seconds the workers get to finish their current job on shutdown
+SHUTDOWN_TIMEOUT = 60
+
+
+def get_memory_mb():
+    """Peak resident memory of the current process, in MB."""
+    # ru_maxrss is in KB on linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class WarmWorker(SimpleWorker):
+    """
+    RQ worker that performs the jobs in its own process instead of forking a
+    child per job, so that what a job loads (Django connections, strategy
+    objects, fitted models, candles) stays in memory for the next ones.
+
+    Since memory is not handed back between jobs, the worker stops after the
+    job that takes it over `max_memory_mb`: the supervisor (`WorkerPool`)
+    replaces it with a fresh process.
+
+    Parameters
+    ----------
+    max_memory_mb : int, optional
+        Peak resident memory after which the worker stops.
+    """
+
+    def __init__(self, *args, max_memory_mb=None, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.max_memory_mb = max_memory_mb
+
+    def execute_job(self, job, queue):
+        # no request cycle recycles the connections of a long-lived worker:
+        # drop the ones past CONN_MAX_AGE or left unusable around every job
+        close_old_connections()
+
+        try:
+            super().execute_job(job, queue)
+        finally:
+            close_old_connections()
+
+        if self.max_memory_mb and get_memory_mb() > self.max_memory_mb:
+            self.log.info(
+                f"Worker {self.key}: memory over {self.max_memory_mb} MB, stopping to be recycled."
+            )
+            # the work loop exits before dequeuing the next job
+            self._stop_requested = True
+
+
+def warm_up():
+    """
+    Loads what the signal jobs need before the worker takes its first one:
+    the signal generation stack and strategy registry, a database
+    connection, and the strategy objects of the active pipelines (for a
+    MachineLearning strategy, its fitted model).
+    """
+    from model.signal_generation import strategy_cache
+    from model.signal_generation._signal_generation import get_strategy_class, strategy_combiner
+    from shared.utils.helpers import get_pipeline_data
+
+    connection.ensure_connection()
+
+    warmed = 0
+
+    for pipeline_id in Pipeline.objects.filter(active=True).values_list("id", flat=True):
+        try:
+            pipeline = get_pipeline_data(pipeline_id)
+
+            for strategy in pipeline.strategy:
+                get_strategy_class(strategy["name"])
+
+            strategy_cache.warm(
+                dict(
+                    id=pipeline.id,
+                    strategies=pipeline.strategy,
+                    strategy_combination=pipeline.strategy_combination,
+                    symbol=pipeline.symbol,
+                    exchange=pipeline.exchange,
+                    interval=pipeline.candle_size,
+                ),
+                strategy_combiner
+            )
+            warmed += 1
+
+        except Exception as e:
+            # the pipeline's job builds its strategies itself, and reports the error
+            logging.warning(f"Pipeline {pipeline_id}: could not warm up the strategies: {e!r}")
+
+    logging.info(f"Worker {os.getpid()}: warmed up the strategies of {warmed} pipelines.")
+
+
+def run_worker(queue_names, max_jobs, max_memory_mb):
+    """Entrypoint of a worker process of the pool."""
+    from model.service.cloud_storage import cloud_storage_startup
+
+    cloud_storage_startup()
+
+    warm_up()
+
+    conn = redis.from_url(settings.redis_url)
+
+    worker = WarmWorker(
+        [Queue(name, connection=conn) for name in queue_names],
+        connection=conn,
+        max_memory_mb=max_memory_mb,
+    )
+    worker.work(max_jobs=max_jobs)
+
+
+class WorkerPool:
+    """
+    Keeps `size` long-lived, pre-warmed `WarmWorker` processes pulling jobs
+    from the queues (WORKER_MODE=pool), and recycles them: a worker exits
+    after `max_jobs` jobs or once over `max_memory_mb`, and is replaced by a
+    new process, which warms up before it takes jobs.
+
+    The workers are spawned rather than forked from the supervisor, so that
+    they do not share its connections.
+
+    Parameters
+    ----------
+    queue_names : list of str
+    size : int
+        Number of worker processes.
+    max_jobs : int, optional
+        Jobs a worker performs before it is recycled.
+    max_memory_mb : int, optional
+        Peak resident memory after which a worker is recycled.
+    """
+
+    def __init__(self, queue_names, size, max_jobs=None, max_memory_mb=None):
+        self.queue_names = queue_names
+        self.size = size
+        self.max_jobs = max_jobs
+        self.max_memory_mb = max_memory_mb
+
+        self._context = multiprocessing.get_context("spawn")
+        self._workers = [None] * size
+        self._started_at = [0.0] * size
+        self._restart_delay = [0] * size
+        self._stopping = False
+
+    def run(self):
+        """Starts the workers and supervises them until SIGTERM / SIGINT."""
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+
+        logging.info(f"Starting a pool of {self.size} workers on {', '.join(self.queue_names)}.")
+
+        while not self._stopping:
+            self.check_workers()
+            time.sleep(SUPERVISOR_INTERVAL)
+
+        self.stop()
+
+    def check_workers(self):
+        """Starts a worker in every slot whose worker is not running."""
+        now = time.monotonic()
+
+        for slot, worker in enumerate(self._workers):
+            if worker is not None and worker.is_alive():
+                continue
+
+            if worker is not None:
+                worker.join()
+
+                lifetime = now - self._started_at[slot]
+
+                logging.info(
+                    f"Worker {worker.pid} exited with code {worker.exitcode} after {lifetime:.0f}s. Recycling."
+                )
+
+                if lifetime < MIN_WORKER_LIFETIME:
+                    self._restart_delay[slot] = min(max(2 * self._restart_delay[slot], 1), MAX_RESTART_DELAY)
+                else:
+                    self._restart_delay[slot] = 0
+
+                self._workers[slot] = None
+                self._started_at[slot] = now + self._restart_delay[slot]
+
+            if now >= self._started_at[slot]:
+                self._start_worker(slot)
+
+    def stop(self, timeout=SHUTDOWN_TIMEOUT):
+        """Asks the workers to finish their current job and exit (warm shutdown)."""
+        self._stopping = True
+
+        workers = [worker for worker in self._workers if worker is not None]
+
+        for worker in workers:
+            if worker.is_alive():
+                os.kill(worker.pid, signal.SIGTERM)
+
+        deadline = time.monotonic() + timeout
+
+        for worker in workers:
+            worker.join(max(deadline - time.monotonic(), 0))
+
+            if worker.is_alive():
+                logging.warning(f"Worker {worker.pid} did not stop in time. Killing it.")
+                worker.kill()
+                worker.join()
+
+        self._workers = [None] * self.size
+
+    def _start_worker(self, slot):
+        worker = self._context.Process(
+            target=run_worker,
+            args=(self.queue_names, self.max_jobs, self.max_memory_mb),
+            name=f"rq-worker-{slot}",
+        )
+        worker.start()
+
+        self._workers[slot] = worker
+        self._started_at[slot] = time.monotonic()
+
+    def _request_stop(self, signum, frame):
+        self._stopping = True
@@ -0,0 +1,47 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from data.tests.setup.test_data.sample_data import exchange_data_1, exchange_data_2, exchange_data_3
+from shared.data.queries import get_candles, get_data
+from shared.utils.tests.fixtures.models import *
+
+
+@pytest.fixture
+def candles(create_exchange, create_symbol):
+    for entry in [exchange_data_3, exchange_data_1, exchange_data_2]:
+        StructuredData.objects.create(**entry)
+
+
+class TestGetCandles:
+
+    def test_get_candles_matches_get_data(self, candles):
+        data = get_candles(StructuredData, None, "BTCUSDT", "1h")
+
+        expected = get_data(StructuredData, None, "BTCUSDT", "1h")
+
+        assert list(data.columns) == ["open", "high", "low", "close", "volume", "quote_volume", "trades",
+                                      "taker_buy_asset_volume", "taker_buy_quote_volume"]
+        assert data.index.name == "open_time"
+        assert data.index.is_monotonic_increasing
+        assert (data.dtypes == np.float64).all()
+
+        pd.testing.assert_frame_equal(data, expected[data.columns].astype(np.float64), check_index_type=False)
+
+    def test_get_candles_selected_columns(self, candles):
+        start_date = datetime.datetime(2023, 9, 1, 11, tzinfo=pytz.utc)
+
+        data = get_candles(StructuredData, start_date, "BTCUSDT", "1h", columns=["close", "close_time"])
+
+        assert list(data.columns) == ["close", "close_time"]
+        assert data.index.min() >= start_date
+        assert str(data["close_time"].dtype) == "datetime64[ns, UTC]"
+
+    def test_get_candles_empty(self, create_exchange, create_symbol):
+        data = get_candles(StructuredData, None, "BTCUSDT", "1h")
+
+        assert len(data) == 0
+        assert isinstance(data.index, pd.DatetimeIndex)
+        assert "close" in data.columns
@@ -52,7 +52,9 @@ class BinanceHandler(Client):
 
     @staticmethod
     def validate_symbol(symbol):
-        if not Symbol.objects.filter(name=symbol).exists():
+        symbol_obj = Symbol.objects.filter(name=symbol).first()
+
+        if symbol_obj is None:
             raise SymbolInvalid(symbol)
-        else:
-            return Symbol.objects.get(name=symbol)
+
+        return symbol_obj
@@ -125,3 +125,19 @@ BINANCE_KEY = {
     "taker_buy_asset_volume": lambda x: float(x[9]),
     "taker_buy_quote_volume": lambda x: float(x[10]),
 }
+
+# position of each field in the klines returned by the REST api, for the
+# columnar decoding of kline batches (same columns as BINANCE_KEY)
+BINANCE_KLINE_INDEX = {
+    "open_time": 0,
+    "close_time": 6,
+    "open": 1,
+    "high": 2,
+    "low": 3,
+    "close": 4,
+    "volume": 5,
+    "quote_volume": 7,
+    "trades": 8,
+    "taker_buy_asset_volume": 9,
+    "taker_buy_quote_volume": 10,
+}
@@ -0,0 +1,123 @@
+"""
+Rollups of the equity snapshots (PortfolioTimeSeries) into time buckets.
+
+Every snapshot is added to one bucket per resolution of its pipeline (or
+account), which keeps the number of readings, their sum and the last one. The
+equity chart reads the buckets of a single resolution instead of resampling
+every snapshot a pipeline has ever taken.
+"""
+
+import os
+from datetime import datetime, timedelta
+
+import django
+import pytz
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, FloatField, Value, When
+from django.utils import timezone
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "database.settings")
+django.setup()
+
+from database.model.models import PortfolioTimeSeriesRollup
+
+
+EPOCH = datetime(1970, 1, 1, tzinfo=pytz.utc)
+
+# bucket size in seconds, from the finest resolution to the coarsest
+RESOLUTIONS = {
+    "5m": 300,
+    "1h": 3600,
+    "4h": 14400,
+    "1d": 86400,
+}
+
+
+def bucket_start(time, resolution):
+    """Start of the bucket of a resolution `time` falls in (buckets are aligned to UTC midnight)."""
+    if timezone.is_naive(time):
+        # as the database stores it
+        time = timezone.make_aware(time)
+
+    time = time.astimezone(pytz.utc)
+
+    seconds = int((time - EPOCH).total_seconds())
+
+    return time - timedelta(seconds=seconds % RESOLUTIONS[resolution], microseconds=time.microsecond)
+
+
+def update_rollups(snapshots):
+    """
+    Adds saved PortfolioTimeSeries entries to the rollups of every resolution.
+    Should run in the transaction that saves the entries.
+
+    Parameters
+    ----------
+    snapshots : iterable of PortfolioTimeSeries
+    """
+    buckets = {}
+
+    for snapshot in snapshots:
+        for resolution in RESOLUTIONS:
+            key = (snapshot.pipeline_id, snapshot.type, resolution, bucket_start(snapshot.time, resolution))
+
+            bucket = buckets.get(key)
+
+            if bucket is None:
+                buckets[key] = PortfolioTimeSeriesRollup(
+                    pipeline_id=snapshot.pipeline_id,
+                    type=snapshot.type,
+                    resolution=resolution,
+                    time=key[3],
+                    count=1,
+                    total=snapshot.value,
+                    last=snapshot.value,
+                    last_time=snapshot.time,
+                )
+            else:
+                _add_reading(bucket, 1, snapshot.value, snapshot.value, snapshot.time)
+
+    # buckets are added to with F() increments, which the database applies
+    # atomically, so concurrent writers (the snapshot cron and a pipeline
+    # snapshot) can't lose each other's readings. A bucket is inserted when
+    # missing: if another writer inserted it first, the unique constraint
+    # rejects the insert and the reading is added to the existing row
+    for key, bucket in buckets.items():
+        if _increment(key, bucket):
+            continue
+
+        try:
+            with transaction.atomic():
+                bucket.save()
+        except IntegrityError:
+            _increment(key, bucket)
+
+
+def _increment(key, bucket):
+    pipeline_id, type_, resolution, time = key
+
+    rollups = PortfolioTimeSeriesRollup.objects.filter(resolution=resolution, time=time)
+
+    if pipeline_id is not None:
+        rollups = rollups.filter(pipeline_id=pipeline_id)
+    else:
+        rollups = rollups.filter(pipeline__isnull=True, type=type_)
+
+    return rollups.update(
+        count=F("count") + bucket.count,
+        total=F("total") + bucket.total,
+        last=Case(
+            When(last_time__lte=bucket.last_time, then=Value(bucket.last, output_field=FloatField())),
+            default=F("last"),
+        ),
+        last_time=Case(When(last_time__lte=bucket.last_time, then=Value(bucket.last_time)), default=F("last_time")),
+    ) > 0
+
+
+def _add_reading(rollup, count, total, last, last_time):
+    rollup.count += count
+    rollup.total += total
+
+    if last_time >= rollup.last_time:
+        rollup.last = last
+        rollup.last_time = last_time
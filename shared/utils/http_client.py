@@ -0,0 +1,112 @@
+"""
+Pooled HTTP sessions for the requests between the services.
+
+Each target service gets one requests.Session with a keep-alive connection
+pool, shared by every thread of the calling process, so consecutive requests
+to a service reuse an open TCP (and TLS) connection instead of setting up a
+new one per call. The latency of every request is timed per endpoint.
+"""
+
+import http.cookiejar
+import logging
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from shared.utils.settings import settings
+
+
+class _Timing:
+
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+
+class ServiceSession:
+    """
+    Keep-alive session to one service, with per-endpoint latency timing.
+
+    Parameters
+    ----------
+    service : str
+        Name of the target service, used in the logs.
+    pool_size : int
+        Number of connections kept open to the service. Requests beyond it
+        still go through, on connections that are closed afterwards.
+    """
+
+    def __init__(self, service, pool_size):
+        self.service = service
+
+        self.session = requests.Session()
+
+        # the services authenticate with the Authorization header: keep the
+        # session stateless like the one-off requests it replaces
+        self.session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._timings = {}
+        self._lock = threading.Lock()
+
+    def get(self, endpoint, url, **kwargs):
+        return self._request("get", endpoint, url, **kwargs)
+
+    def post(self, endpoint, url, **kwargs):
+        return self._request("post", endpoint, url, **kwargs)
+
+    def stats(self):
+        """Number of requests, mean and max latency (ms) of each endpoint."""
+        with self._lock:
+            return {
+                endpoint: {
+                    "count": timing.count,
+                    "mean_ms": round(timing.total / timing.count * 1000, 1),
+                    "max_ms": round(timing.max * 1000, 1),
+                }
+                for endpoint, timing in self._timings.items()
+            }
+
+    def _request(self, method, endpoint, url, **kwargs):
+        start = time.perf_counter()
+
+        try:
+            return getattr(self.session, method)(url, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+
+            with self._lock:
+                timing = self._timings.setdefault(endpoint, _Timing())
+                timing.count += 1
+                timing.total += elapsed
+                timing.max = max(timing.max, elapsed)
+
+            logging.debug(f"{self.service} {endpoint}: {elapsed * 1000:.1f}ms")
+
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(service):
+    """
+    Returns the process-wide session to a service: "model" or "execution".
+    """
+    with _sessions_lock:
+        if service not in _sessions:
+            pool_size = {
+                "model": settings.model_app_pool_size,
+                "execution": settings.execution_app_pool_size,
+            }[service]
+
+            _sessions[service] = ServiceSession(service, pool_size)
+
+        return _sessions[service]
@@ -0,0 +1,105 @@
+"""
+Signal job completion notifications over redis.
+
+The model service's RQ worker pushes the outcome of each signal job onto a
+per-job redis list as soon as the job concludes, and the data service blocks
+on that list (BLPOP) instead of polling /check_job at a fixed interval. A list
+is used rather than pub/sub so a result pushed before the waiter starts
+listening is not lost.
+
+Both sides are best effort: publishing must NEVER raise into the job, and a
+waiter that gets no notification falls back to polling /check_job.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+import redis
+
+from shared.utils.settings import settings
+
+JOB_RESULT_KEY = "signal-job-result:{}"
+
+# results nobody waited for are dropped after the data service's job polling
+# budget has elapsed
+JOB_RESULT_TTL = 120
+
+_connection = None
+_connection_lock = threading.Lock()
+
+
+def _reset_state():
+    """Test hook: drop the cached connection."""
+    global _connection
+    _connection = None
+
+
+def _get_connection():
+    global _connection
+    if _connection is None:
+        with _connection_lock:
+            if _connection is None:
+                _connection = redis.from_url(settings.redis_url)
+    return _connection
+
+
+def publish_job_result(connection, job_id, response):
+    """
+    Pushes the conclusion of a job for the waiter on the data service.
+    Returns True if the result was published, False otherwise.
+
+    Parameters
+    ----------
+    connection : redis.Redis
+        The connection of the RQ worker running the job.
+    job_id : str
+    response : dict
+        The same payload /check_job would respond with for the concluded job.
+    """
+    try:
+        key = JOB_RESULT_KEY.format(job_id)
+
+        pipe = connection.pipeline()
+        pipe.rpush(key, json.dumps(response))
+        pipe.expire(key, JOB_RESULT_TTL)
+        pipe.execute()
+
+        return True
+
+    except Exception as e:
+        logging.warning(f"Failed to publish the result of job {job_id}: {e}")
+        return False
+
+
+def wait_for_job_result(job_id, timeout):
+    """
+    Blocks until the result of a job is published, for at most timeout seconds.
+
+    Returns the published payload, or None if no result arrived in time, redis
+    is unavailable or under TEST. On redis errors the timeout is still waited
+    out, so that callers falling back to polling keep their polling cadence.
+    """
+    global _connection
+
+    if os.getenv("TEST"):
+        return None
+
+    try:
+        item = _get_connection().blpop(JOB_RESULT_KEY.format(job_id), timeout=timeout)
+    except Exception as e:
+        logging.warning(f"Failed to wait for the result of job {job_id}: {e}")
+        _connection = None
+        time.sleep(timeout)
+        return None
+
+    if item is None:
+        return None
+
+    try:
+        return json.loads(item[1])
+    except (TypeError, ValueError):
+        logging.warning(f"Malformed result for job {job_id}: {item[1]!r}")
+        return None
@@ -36,6 +36,9 @@ class Settings:
         self.check_inconsistencies = _get_bool("CHECK_INCONSISTENCIES", True)
         self.restart_failed_pipelines = _get_bool("RESTART_FAILED_PIPELINES", True)
         self.restart_retries = _get_int("RESTART_RETRIES", 2)
+        # keep-alive connections each process keeps open to the other services
+        self.model_app_pool_size = _get_int("MODEL_APP_POOL_SIZE", 16)
+        self.execution_app_pool_size = _get_int("EXECUTION_APP_POOL_SIZE", 16)
 
         # logging (per-service, but always overridable via LOGGER_LEVEL)
         self.logger_level = _get_str("LOGGER_LEVEL", "INFO")
@@ -44,9 +47,45 @@ class Settings:
         self.token_expires_days = _get_int("TOKEN_EXPIRES_DAYS", 3)
         self.app_check_interval_seconds = _get_int("CHECKS_INTERVAL", 300)
         self.base_candle_size = _get_str("BASE_CANDLE_SIZE", "5m")
+        self.backfill_workers = _get_int("BACKFILL_WORKERS", 4)
+        # binance allows 6000 request weight per minute and IP; leave headroom
+        # for the other services sharing the IP
+        self.backfill_max_weight = _get_int("BACKFILL_MAX_WEIGHT", 4800)
+        self.signal_workers = _get_int("SIGNAL_WORKERS", 16)
+        self.signal_max_pending = _get_int("SIGNAL_MAX_PENDING", 256)
+        # "queue": signals are generated by the model service's RQ workers
+        # "local": in a pool of local processes (data and model on the same host)
+        self.signal_mode = _get_str("SIGNAL_MODE", "queue")
+        self.local_signal_workers = _get_int("LOCAL_SIGNAL_WORKERS", 2)
+
+        # [model]
+        self.candle_cache_max_mb = _get_int("CANDLE_CACHE_MAX_MB", 64)
+        # saved ML models kept loaded per worker process
+        self.model_store_max_models = _get_int("MODEL_STORE_MAX_MODELS", 8)
+        # seconds between two syncs of the models directory with the bucket
+        self.model_sync_interval = _get_int("MODEL_SYNC_INTERVAL", 60)
+        # "fork": stock RQ worker, a forked child per job
+        # "pool": WORKER_POOL_SIZE warm processes that run the jobs themselves,
+        # recycled after WORKER_MAX_JOBS jobs or WORKER_MAX_MEMORY_MB (0: no limit)
+        self.worker_mode = _get_str("WORKER_MODE", "fork")
+        self.worker_pool_size = _get_int("WORKER_POOL_SIZE", 2)
+        self.worker_max_jobs = _get_int("WORKER_MAX_JOBS", 1000)
+        self.worker_max_memory_mb = _get_int("WORKER_MAX_MEMORY_MB", 1024)
 
         # [execution]
         self.app_snapshot_interval_seconds = _get_int("SNAPSHOTS_INTERVAL", 300)
+        # seconds a streamed mark price / position is used before falling back to REST
+        self.mark_price_ttl = _get_int("MARK_PRICE_TTL", 5)
+        self.position_ttl = _get_int("POSITION_TTL", 30)
+        # seconds an order waits for its fill on the user data stream before it is looked up over REST
+        self.order_stream_timeout = _get_int("ORDER_STREAM_TIMEOUT", 5)
+        # seconds without events or keepalives after which the user data stream is considered down
+        self.user_stream_timeout = _get_int("USER_STREAM_TIMEOUT", 180)
+        # "sync": bookkeeping is written before the order request returns
+        # "async": it is journaled and written by a background writer
+        self.bookkeeping_mode = _get_str("BOOKKEEPING_MODE", "sync")
+        self.bookkeeping_journal_dir = _get_str("BOOKKEEPING_JOURNAL_DIR", "journal")
+        self.bookkeeping_flush_timeout = _get_int("BOOKKEEPING_FLUSH_TIMEOUT", 10)
 
 
 settings = Settings()
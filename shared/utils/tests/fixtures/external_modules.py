@@ -14,6 +14,7 @@ def mock_response(*args, **kwargs):
             self.json_data = json_data
             self.status_code = status_code
             self.ok = True
+            self.headers = {}
 
         def json(self):
             return self.json_data
@@ -25,24 +26,28 @@ def mock_response(*args, **kwargs):
     return MockResponse(response, 200)
 
 
+# the services talk to each other through pooled requests.Session objects
+# (shared/utils/http_client.py); a plain MagicMock isn't bound to the session,
+# so calls are recorded without it
+
 @pytest.fixture
 def mock_requests_post(mocker):
-    return mocker.patch.object(requests, "post", mock_response)
+    return mocker.patch.object(requests.Session, "post", mocker.MagicMock(side_effect=mock_response))
 
 
 @pytest.fixture
-def requests_post_spy(mocker):
-    return mocker.spy(requests, "post")
+def requests_post_spy(mock_requests_post):
+    return mock_requests_post
 
 
 @pytest.fixture
 def mock_requests_get(mocker):
-    return mocker.patch.object(requests, "get", mock_response)
+    return mocker.patch.object(requests.Session, "get", mocker.MagicMock(side_effect=mock_response))
 
 
 @pytest.fixture
-def requests_get_spy(mocker):
-    return mocker.spy(requests, "get")
+def requests_get_spy(mock_requests_get):
+    return mock_requests_get
 
 
 @pytest.fixture
@@ -13,6 +13,7 @@ django.setup()
 from data.tests.setup.test_data.sample_data import exchange_data_1, exchange_data_2, exchange_data_3
 from database.model.models import Exchange, Symbol, ExchangeData, Asset, Jobs, StructuredData, Pipeline, Orders, Trade, \
     Position, Strategy, PortfolioTimeSeries, User
+from shared.utils.equity_rollups import update_rollups
 
 TEST_APP_NAME = 'test_app'
 
@@ -615,6 +616,8 @@ def create_pipeline_timeseries(db, create_exchange, create_symbol, create_pipeli
         value=1025
     ).save()
 
+    update_rollups(PortfolioTimeSeries.objects.filter(pipeline_id=1))
+
     return entry_1, entry_2, entry_3, entry_4, entry_5, entry_6, entry_7
 
 
@@ -663,6 +666,8 @@ def create_live_portfolio_timeseries(db, create_exchange, create_symbol, create_
         value=1025
     ).save()
 
+    update_rollups(PortfolioTimeSeries.objects.filter(type='live'))
+
     return entry_1, entry_2, entry_3, entry_4, entry_5, entry_6, entry_7
 
 
@@ -711,6 +716,8 @@ def create_testnet_portfolio_timeseries(db, create_pipeline):
         value=1025
     ).save()
 
+    update_rollups(PortfolioTimeSeries.objects.filter(type='testnet'))
+
     return entry_1, entry_2, entry_3, entry_4, entry_5, entry_6, entry_7
 
 
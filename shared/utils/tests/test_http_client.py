@@ -0,0 +1,56 @@
+import http.client
+from types import SimpleNamespace
+
+import pytest
+import requests
+from requests.cookies import extract_cookies_to_jar
+
+from shared.utils.http_client import ServiceSession, get_session
+
+
+class TestServiceSession:
+
+    def test_sessions_are_shared_per_service(self):
+        assert get_session("model") is get_session("model")
+        assert get_session("model") is not get_session("execution")
+
+    def test_connection_pool_size(self):
+        session = ServiceSession("execution", pool_size=3)
+
+        adapter = session.session.get_adapter("http://execution-service:5000")
+
+        assert adapter._pool_maxsize == 3
+
+    def test_latency_is_timed_per_endpoint(self, mocker):
+        mock_post = mocker.patch.object(requests.Session, "post", mocker.MagicMock())
+        mocker.patch.object(requests.Session, "get", mocker.MagicMock(side_effect=requests.ConnectionError))
+
+        session = ServiceSession("model", pool_size=1)
+
+        session.post("GENERATE_SIGNAL", "http://model/generate_signal", json={}, timeout=(5, 30))
+        session.post("GENERATE_SIGNAL", "http://model/generate_signal", json={}, timeout=(5, 30))
+
+        # failed requests are timed too
+        with pytest.raises(requests.ConnectionError):
+            session.get("CHECK_JOB", "http://model/check_job/abc")
+
+        mock_post.assert_called_with("http://model/generate_signal", json={}, timeout=(5, 30))
+
+        stats = session.stats()
+
+        assert stats["GENERATE_SIGNAL"]["count"] == 2
+        assert stats["CHECK_JOB"]["count"] == 1
+        assert stats["GENERATE_SIGNAL"]["max_ms"] >= stats["GENERATE_SIGNAL"]["mean_ms"] >= 0
+
+    def test_response_cookies_are_not_kept(self):
+        session = ServiceSession("model", pool_size=1)
+
+        headers = http.client.HTTPMessage()
+        headers["Set-Cookie"] = "session=abc; Path=/"
+        response = SimpleNamespace(_original_response=SimpleNamespace(msg=headers))
+
+        request = requests.Request("GET", "http://model-service:5000/check_job/abc").prepare()
+
+        extract_cookies_to_jar(session.session.cookies, request, response)
+
+        assert len(session.session.cookies) == 0
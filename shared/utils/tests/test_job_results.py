@@ -0,0 +1,73 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from shared.utils import job_results
+from shared.utils.job_results import JOB_RESULT_KEY, JOB_RESULT_TTL, publish_job_result, wait_for_job_result
+
+
+@pytest.fixture(autouse=True)
+def reset_job_results_state():
+    job_results._reset_state()
+    yield
+    job_results._reset_state()
+
+
+@pytest.fixture
+def live_mode(monkeypatch):
+    monkeypatch.delenv("TEST", raising=False)
+
+
+@pytest.fixture
+def mock_redis(mocker):
+    return mocker.patch("shared.utils.job_results.redis.from_url")
+
+
+class TestPublishJobResult:
+
+    def test_result_is_pushed_with_a_ttl(self):
+        connection = MagicMock()
+
+        assert publish_job_result(connection, "abc", {"code": "FINISHED", "success": True}) is True
+
+        pipe = connection.pipeline.return_value
+        key, raw = pipe.rpush.call_args.args
+
+        assert key == JOB_RESULT_KEY.format("abc")
+        assert json.loads(raw) == {"code": "FINISHED", "success": True}
+        pipe.expire.assert_called_once_with(key, JOB_RESULT_TTL)
+
+    def test_never_raises(self):
+        connection = MagicMock()
+        connection.pipeline.side_effect = ConnectionError("down")
+
+        assert publish_job_result(connection, "abc", {}) is False
+
+
+class TestWaitForJobResult:
+
+    def test_noop_when_test_env_set(self, mock_redis):
+        assert wait_for_job_result("abc", timeout=5) is None
+        mock_redis.assert_not_called()
+
+    def test_returns_the_published_result(self, live_mode, mock_redis):
+        mock_redis.return_value.blpop.return_value = (
+            JOB_RESULT_KEY.format("abc").encode(), json.dumps({"code": "FAILED"}).encode()
+        )
+
+        assert wait_for_job_result("abc", timeout=5) == {"code": "FAILED"}
+        mock_redis.return_value.blpop.assert_called_once_with(JOB_RESULT_KEY.format("abc"), timeout=5)
+
+    def test_timeout(self, live_mode, mock_redis):
+        mock_redis.return_value.blpop.return_value = None
+
+        assert wait_for_job_result("abc", timeout=5) is None
+
+    def test_redis_error_waits_out_the_timeout(self, live_mode, mock_redis, mocker):
+        mock_redis.return_value.blpop.side_effect = ConnectionError("down")
+        mock_sleep = mocker.patch.object(job_results.time, "sleep")
+
+        assert wait_for_job_result("abc", timeout=5) is None
+        mock_sleep.assert_called_once_with(5)
+        assert job_results._connection is None